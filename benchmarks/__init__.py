@@ -0,0 +1,21 @@
+################################################################################
+# Copyright 2020 University of Georgia Bio-Sensing and Instrumentation Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+
+# Benchmarks for the dynamixel sdk and dynio that run without hardware, against dynio.virtual_bus or an in-memory
+# byte stream.
+#
+# usage: python -m benchmarks [--duration SECONDS] [--json FILE] [suite ...]
@@ -0,0 +1,80 @@
+################################################################################
+# Copyright 2020 University of Georgia Bio-Sensing and Instrumentation Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+
+import argparse
+import json
+import platform
+import sys
+import time
+
+import dynamixel_sdk.protocol2_packet_handler as protocol2
+from benchmarks import accessors, codec, groups, parse
+
+SUITES = {
+    "codec": (codec, "packets/s"),
+    "parse": (parse, "packets/s"),
+    "accessors": (accessors, "us/call"),
+    "groups": (groups, "us/cycle"),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Runs the dynio benchmark suites")
+    parser.add_argument("suites", nargs="*", metavar="suite",
+                        help="suites to run, all of them by default: %s" % ", ".join(sorted(SUITES)))
+    parser.add_argument("--duration", type=float, default=0.5, help="seconds spent measuring each case")
+    parser.add_argument("--wire", action="store_true", help="hold group replies for their transfer time at 1 Mbps")
+    parser.add_argument("--json", metavar="FILE", help="also write the results to FILE as JSON ('-' for stdout)")
+    args = parser.parse_args(argv)
+    for name in args.suites:
+        if name not in SUITES:
+            parser.error("unknown suite %r" % name)
+
+    report = {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "crcmod": protocol2.crc16_ext is not None,
+        "duration": args.duration,
+        "wire": args.wire,
+        "suites": {},
+    }
+
+    for name in args.suites or sorted(SUITES):
+        module, unit = SUITES[name]
+        if module is groups:
+            results = module.run(args.duration, realtime=args.wire)
+        else:
+            results = module.run(args.duration)
+        report["suites"][name] = {"unit": unit, "results": results}
+
+        if args.json != "-":
+            print("%s (%s)" % (name, unit))
+            for case, value in results.items():
+                print("  %-28s %14.2f" % (case, value))
+
+    if args.json == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    elif args.json:
+        with open(args.json, "w") as fd:
+            json.dump(report, fd, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+################################################################################
+# Copyright 2020 University of Georgia Bio-Sensing and Instrumentation Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+
+# Measures the per-call time of DynamixelMotor and ThreeMxlMotor accessors in microseconds against a virtual bus
+# that answers instantly, so the numbers are the Python overhead of dynio and the sdk for one transaction.
+#
+# usage: python -m benchmarks.accessors
+
+import contextlib
+import io
+
+from dynio.dynamixel_controller import DynamixelIO
+from dynio.virtual_bus import VirtualMotor, VirtualPortHandler
+from dynio.DynamixelJSON import model_path
+from benchmarks.common import measure_us
+
+
+def run(duration=0.5):
+    """Returns a dictionary of {case: microseconds per call}"""
+    port = VirtualPortHandler([VirtualMotor(1, model_path("3mxl.json")),
+                               VirtualMotor(2, model_path("MX64.json"), 2)], realtime=False)
+    dxl_io = DynamixelIO(port_handler=port, baud_rate=1000000)
+    three_mxl = dxl_io.new_three_mxl_motor(1)
+    mx64 = dxl_io.new_mx64(2, protocol=2)
+    desired_speed = three_mxl.regs.M3XL_DESIRED_SPEED
+    goal_position = mx64.regs.Goal_Position
+
+    cases = {
+        "3mxl_write_control_table": lambda: three_mxl.write_control_table("M3XL_DESIRED_SPEED", 100),
+        "3mxl_read_control_table": lambda: three_mxl.read_control_table("M3XL_ANGLE"),
+        "3mxl_write_register": lambda: three_mxl.write_register(desired_speed, 100),
+        "3mxl_set_speed": lambda: three_mxl.set_speed(1),
+        "3mxl_get_pos": three_mxl.get_pos,
+        "mx64_write_control_table": lambda: mx64.write_control_table("Goal_Position", 2048),
+        "mx64_write_register": lambda: mx64.write_register(goal_position, 2048),
+        "mx64_set_velocity": lambda: mx64.set_velocity(10),
+        "mx64_get_position": mx64.get_position,
+    }
+
+    results = {}
+    # failed transactions print, keep that out of the measurement.
+    with contextlib.redirect_stdout(io.StringIO()):
+        for case, function in cases.items():
+            results[case] = measure_us(function, duration)
+    return results
+
+
+if __name__ == "__main__":
+    for case, us in run().items():
+        print("%-26s %10.2f us/call" % (case, us))
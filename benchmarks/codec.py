@@ -0,0 +1,154 @@
+################################################################################
+# Copyright 2020 University of Georgia Bio-Sensing and Instrumentation Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+# Measures packet encoding (protocol 1 checksum, protocol 2 stuffing + CRC16), byte stuffing of packets that need it
+# and status packet CRC verification in packets/second, comparing the protocol 2 codec in dynamixel_sdk against the
+# implementation it replaced.
+#
+# usage: python -m benchmarks.codec
+
+import dynamixel_sdk.protocol2_packet_handler as protocol2
+from dynamixel_sdk import Protocol1PacketHandler, Protocol2PacketHandler, DXL_MAKEWORD, DXL_LOBYTE, DXL_HIBYTE
+from benchmarks.common import measure, StreamPort
+
+PKT_LENGTH_L = protocol2.PKT_LENGTH_L
+PKT_LENGTH_H = protocol2.PKT_LENGTH_H
+PKT_INSTRUCTION = protocol2.PKT_INSTRUCTION
+
+
+def legacy_update_crc(crc_accum, data_blk_ptr, data_blk_size):
+    """The previous updateCRC, which rebuilt its lookup table on every call"""
+    crc_table = list(protocol2.CRC_TABLE)
+
+    for j in range(0, data_blk_size):
+        i = ((crc_accum >> 8) ^ data_blk_ptr[j]) & 0xFF
+        crc_accum = ((crc_accum << 8) ^ crc_table[i]) & 0xFFFF
+
+    return crc_accum
+
+
+def legacy_add_stuffing(packet):
+    """The previous addStuffing, which copied every packet through a 1 KiB temporary list"""
+    packet_length_in = DXL_MAKEWORD(packet[PKT_LENGTH_L], packet[PKT_LENGTH_H])
+    packet_length_out = packet_length_in
+
+    temp = [0] * protocol2.TXPACKET_MAX_LEN
+    temp[0: PKT_LENGTH_H + 1] = packet[0: PKT_LENGTH_H + 1]
+
+    index = PKT_INSTRUCTION
+    for i in range(0, packet_length_in - 2):
+        temp[index] = packet[i + PKT_INSTRUCTION]
+        index = index + 1
+        if packet[i + PKT_INSTRUCTION] == 0xFD \
+                and packet[i + PKT_INSTRUCTION - 1] == 0xFF \
+                and packet[i + PKT_INSTRUCTION - 2] == 0xFF:
+            temp[index] = 0xFD
+            index = index + 1
+            packet_length_out = packet_length_out + 1
+
+    temp[index] = packet[PKT_INSTRUCTION + packet_length_in - 2]
+    temp[index + 1] = packet[PKT_INSTRUCTION + packet_length_in - 1]
+    index = index + 2
+
+    if packet_length_in != packet_length_out:
+        packet = [0] * index
+
+    packet[0: index] = temp[0: index]
+    packet[PKT_LENGTH_L] = DXL_LOBYTE(packet_length_out)
+    packet[PKT_LENGTH_H] = DXL_HIBYTE(packet_length_out)
+
+    return packet
+
+
+def sync_write_packet(motor_count, data_length):
+    """Returns an unstuffed protocol 2 sync write packet writing data_length bytes to motor_count motors"""
+    param_length = motor_count * (1 + data_length)
+    packet = [0xFF, 0xFF, 0xFD, 0x00, 0xFE, DXL_LOBYTE(param_length + 7), DXL_HIBYTE(param_length + 7), 0x83,
+              116, 0, data_length, 0]
+    for dxl_id in range(1, motor_count + 1):
+        packet.append(dxl_id)
+        packet.extend((dxl_id * 37 + i) & 0xFF for i in range(data_length))
+    return packet + [0, 0]
+
+
+def run(duration=0.5):
+    """Returns a dictionary of {case: packets per second}"""
+    ph = Protocol2PacketHandler()
+    packet = sync_write_packet(20, 4)
+    length = len(packet) - 2
+    status = bytes(packet)
+
+    def legacy_encode():
+        legacy_update_crc(0, legacy_add_stuffing(list(packet)), length)
+
+    def encode():
+        ph.updateCRC(0, ph.addStuffing(list(packet)), length)
+
+    def legacy_verify():
+        legacy_update_crc(0, status, length)
+
+    def verify():
+        ph.updateCRC(0, status, length)
+
+    ph1 = Protocol1PacketHandler()
+    port = StreamPort(b'')
+    packet1 = bytearray([0xFF, 0xFF, 0xFE, 4 + 20 * 5, 0x83, 30, 4])
+    for dxl_id in range(1, 21):
+        packet1 += bytes([dxl_id]) + bytes((dxl_id * 37 + i) & 0xFF for i in range(4))
+    packet1.append(0)
+
+    def encode_protocol1():
+        ph1.txPacket(port, packet1)
+        port.is_using = False
+
+    # a payload made of header patterns, so every third byte needs stuffing.
+    stuffed_packet = sync_write_packet(20, 4)
+    stuffed_packet[12: -2] = [0xFF, 0xFF, 0xFD] * ((len(stuffed_packet) - 14) // 3) + \
+        [0] * ((len(stuffed_packet) - 14) % 3)
+    stuffed = ph.addStuffing(bytearray(stuffed_packet))
+
+    def stuff():
+        ph.addStuffing(bytearray(stuffed_packet))
+
+    def unstuff():
+        ph.removeStuffing(bytearray(stuffed))
+
+    results = {
+        "encode_protocol1": measure(encode_protocol1, duration),
+        "stuff": measure(stuff, duration),
+        "unstuff": measure(unstuff, duration),
+        "encode_legacy": measure(legacy_encode, duration),
+        "verify_legacy": measure(legacy_verify, duration),
+    }
+
+    crc16_ext = protocol2.crc16_ext
+    protocol2.crc16_ext = None
+    try:
+        results["encode_python"] = measure(encode, duration)
+        results["verify_python"] = measure(verify, duration)
+    finally:
+        protocol2.crc16_ext = crc16_ext
+
+    if crc16_ext is not None:
+        results["encode_crcmod"] = measure(encode, duration)
+        results["verify_crcmod"] = measure(verify, duration)
+
+    return results
+
+
+if __name__ == "__main__":
+    for case, rate in run().items():
+        print("%-16s %12.0f packets/s" % (case, rate))
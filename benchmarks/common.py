@@ -0,0 +1,68 @@
+################################################################################
+# Copyright 2020 University of Georgia Bio-Sensing and Instrumentation Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+
+import time
+
+from dynamixel_sdk import PortHandler
+
+
+def measure(function, duration=0.5):
+    """Returns how many times per second function can be called"""
+    count = 0
+    start = time.perf_counter()
+    end = start + duration
+    while True:
+        for _ in range(100):
+            function()
+        count += 100
+        now = time.perf_counter()
+        if now >= end:
+            return count / (now - start)
+
+
+def measure_us(function, duration=0.5):
+    """Returns the average time of a call to function in microseconds"""
+    return 1000000.0 / measure(function, duration)
+
+
+class StreamPort(PortHandler):
+    """A PortHandler that serves a fixed byte stream over and over instead of reading a serial device"""
+
+    def __init__(self, stream):
+        PortHandler.__init__(self, "stream")
+        self.stream = bytes(stream)
+        self.position = 0
+        self.is_open = True
+
+    def clearPort(self):
+        pass
+
+    def writePort(self, packet):
+        return len(packet)
+
+    def getBytesAvailable(self):
+        return len(self.stream) - self.position
+
+    def readPort(self, length):
+        if self.position >= len(self.stream):
+            self.position = 0
+        data = self.stream[self.position: self.position + length]
+        self.position += len(data)
+        return data
+
+    def isPacketTimeout(self):
+        return False
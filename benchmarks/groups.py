@@ -0,0 +1,73 @@
+################################################################################
+# Copyright 2020 University of Georgia Bio-Sensing and Instrumentation Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+
+# Measures the cycle time of GroupSyncRead, GroupBulkRead and GroupSyncWrite against motor count in microseconds, on
+# a virtual bus that answers instantly (Python cost only) or, with --wire, on one that holds every reply for its
+# transfer time at 1 Mbps.
+#
+# usage: python -m benchmarks groups [--wire]
+
+from dynamixel_sdk import *
+from dynio.virtual_bus import VirtualMotor, VirtualPortHandler
+from dynio.DynamixelJSON import model_path
+from benchmarks.common import measure_us
+
+MOTOR_COUNTS = (1, 2, 4, 8, 16, 32)
+PRESENT_POSITION = 132
+GOAL_POSITION = 116
+
+
+def run(duration=0.5, realtime=False):
+    """Returns a dictionary of {case: microseconds per cycle}"""
+    results = {}
+    for count in MOTOR_COUNTS:
+        port = VirtualPortHandler([VirtualMotor(dxl_id, model_path("MX64.json"), 2) for dxl_id in range(1, count + 1)],
+                                  realtime=realtime)
+        port.setBaudRate(1000000)
+        ph = PacketHandler(2)
+
+        sync_read = GroupSyncRead(port, ph, PRESENT_POSITION, 4)
+        bulk_read = GroupBulkRead(port, ph)
+        sync_write = GroupSyncWrite(port, ph, GOAL_POSITION, 4)
+        for dxl_id in range(1, count + 1):
+            sync_read.addParam(dxl_id)
+            bulk_read.addParam(dxl_id, PRESENT_POSITION, 4)
+            sync_write.addParam(dxl_id, [0, 8, 0, 0])
+
+        def sync_read_cycle():
+            sync_read.txRxPacket()
+            for dxl_id in range(1, count + 1):
+                sync_read.getData(dxl_id, PRESENT_POSITION, 4)
+
+        def bulk_read_cycle():
+            bulk_read.txRxPacket()
+            for dxl_id in range(1, count + 1):
+                bulk_read.getData(dxl_id, PRESENT_POSITION, 4)
+
+        def sync_write_cycle():
+            sync_write.changeParam(1, [0, 8, 0, 0])
+            sync_write.txPacket()
+
+        results["sync_read_%d" % count] = measure_us(sync_read_cycle, duration)
+        results["bulk_read_%d" % count] = measure_us(bulk_read_cycle, duration)
+        results["sync_write_%d" % count] = measure_us(sync_write_cycle, duration)
+    return results
+
+
+if __name__ == "__main__":
+    for case, us in run().items():
+        print("%-16s %10.2f us/cycle" % (case, us))
@@ -0,0 +1,81 @@
+################################################################################
+# Copyright 2020 University of Georgia Bio-Sensing and Instrumentation Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+
+# Measures how many status packets per second rxPacket and the sync/bulk read burst parser recover from a byte stream,
+# clean and with random noise bytes in front of every packet.
+#
+# usage: python -m benchmarks.parse
+
+import random
+
+from dynamixel_sdk import *
+from benchmarks.common import measure, StreamPort
+
+
+def status_packet(protocol, dxl_id, data):
+    """Returns a status packet carrying data from a given ID"""
+    if protocol == 1:
+        body = bytes([dxl_id, len(data) + 2, 0]) + bytes(data)
+        return b'\xFF\xFF' + body + bytes([~sum(body) & 0xFF])
+
+    length = len(data) + 4
+    packet = bytearray(b'\xFF\xFF\xFD\x00' + bytes([dxl_id, DXL_LOBYTE(length), DXL_HIBYTE(length), 0x55, 0]) +
+                       bytes(data) + b'\x00\x00')
+    crc = Protocol2PacketHandler().updateCRC(0, packet, len(packet) - 2)
+    packet[-2:] = bytes([DXL_LOBYTE(crc), DXL_HIBYTE(crc)])
+    return bytes(packet)
+
+
+def stream(protocol, packet_count, data_length, noise, seed=0):
+    """Returns packet_count status packets, each preceded by up to noise random bytes"""
+    generator = random.Random(seed)
+    data = bytearray()
+    for i in range(packet_count):
+        if noise:
+            data += bytes(generator.randrange(256) for _ in range(generator.randrange(noise + 1)))
+        data += status_packet(protocol, 1 + i % 20, bytes(generator.randrange(256) for _ in range(data_length)))
+    return data
+
+
+def run(duration=0.5):
+    """Returns a dictionary of {case: packets per second}"""
+    results = {}
+    for protocol in (1, 2):
+        ph = PacketHandler(protocol)
+        for noise in (0, 16):
+            port = StreamPort(stream(protocol, 200, 4, noise))
+
+            def parse():
+                ph.rxPacket(port)
+
+            results["rx_protocol%d_noise%d" % (protocol, noise)] = measure(parse, duration)
+
+            # the burst parser sees the same bytes as one sync/bulk read reply of 20 motors.
+            lengths = dict((dxl_id, 4) for dxl_id in range(1, 21))
+            port = StreamPort(stream(protocol, 20, 4, noise))
+
+            def parse_burst():
+                port.position = 0
+                readStatusBurst(port, ph, lengths)
+
+            results["burst_protocol%d_noise%d" % (protocol, noise)] = measure(parse_burst, duration) * 20
+    return results
+
+
+if __name__ == "__main__":
+    for case, rate in run().items():
+        print("%-24s %12.0f packets/s" % (case, rate))
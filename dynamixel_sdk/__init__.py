@@ -19,9 +19,14 @@
 
 # Author: Ryu Woon Jung (Leon)
 
+from .bus_arbiter import *
 from .port_handler import *
+from .instrumentation import *
 from .packet_handler import *
+from .status_packet_parser import *
 from .group_sync_read import *
 from .group_sync_write import *
 from .group_bulk_read import *
 from .group_bulk_write import *
+from .group_sequential_read import *
+from .group_indexed_read import *
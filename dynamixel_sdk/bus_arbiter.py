@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2020 University of Georgia Bio-Sensing and Instrumentation Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+import heapq
+import itertools
+import threading
+
+# Bus priorities, lower values are served first
+BUS_PRIORITY_SAFETY = 0  # e.g. emergency stop, torque disable
+BUS_PRIORITY_SETPOINT = 1  # control loop reads and writes (default)
+BUS_PRIORITY_TELEMETRY = 2  # logging, monitoring, UI
+
+
+class BusArbiter:
+    """Hands out a port to one thread at a time.
+
+    A thread holds the bus for a whole transaction (instruction packet and its status packets) with
+    `with arbiter:`. Holding is reentrant for the owning thread. When several threads are waiting, the one with the
+    lowest priority value goes next, and equal priorities are served in arrival order. The priority used by a thread
+    is set with `with arbiter.priority(level):`.
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition(threading.Lock())
+        self.owner = None
+        self.depth = 0
+        self.waiting = []
+        self.sequence = itertools.count()
+        self.local = threading.local()
+
+    def acquire(self, priority=None):
+        if priority is None:
+            priority = getattr(self.local, 'priority', BUS_PRIORITY_SETPOINT)
+        thread = threading.current_thread()
+
+        with self.condition:
+            if self.owner is thread:
+                self.depth += 1
+                return
+
+            if self.owner is None and not self.waiting:
+                self.owner = thread
+                self.depth = 1
+                return
+
+            entry = (priority, next(self.sequence), thread)
+            heapq.heappush(self.waiting, entry)
+            while self.owner is not None or self.waiting[0] is not entry:
+                self.condition.wait()
+            heapq.heappop(self.waiting)
+
+            self.owner = thread
+            self.depth = 1
+
+    def release(self):
+        with self.condition:
+            self.depth -= 1
+            if self.depth == 0:
+                self.owner = None
+                if self.waiting:
+                    self.condition.notify_all()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+    def priority(self, level):
+        return BusPriority(self, level)
+
+
+class BusPriority:
+    """Sets the bus priority of the current thread for the duration of a with block"""
+
+    def __init__(self, arbiter, level):
+        self.arbiter = arbiter
+        self.level = level
+        self.previous = None
+
+    def __enter__(self):
+        self.previous = getattr(self.arbiter.local, 'priority', BUS_PRIORITY_SETPOINT)
+        self.arbiter.local.priority = self.level
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.arbiter.local.priority = self.previous
@@ -20,6 +20,7 @@
 # Author: Ryu Woon Jung (Leon)
 
 from .robotis_def import *
+from .status_packet_parser import readStatusBurst
 
 PARAM_NUM_DATA = 0
 PARAM_NUM_ADDRESS = 1
@@ -33,8 +34,9 @@ class GroupBulkRead:
 
         self.last_result = False
         self.is_param_changed = False
-        self.param = []
+        self.param = bytearray()
         self.data_dict = {}
+        self.rx_result = {}
 
         self.clearParam()
 
@@ -42,7 +44,7 @@ class GroupBulkRead:
         if not self.data_dict:
             return
 
-        self.param = []
+        self.param = bytearray()
 
         for dxl_id in self.data_dict:
             if self.ph.getProtocolVersion() == 1.0:
@@ -60,7 +62,7 @@ class GroupBulkRead:
         if dxl_id in self.data_dict:  # dxl_id already exist
             return False
 
-        data = []  # [0] * data_length
+        data = bytearray(data_length)
         self.data_dict[dxl_id] = [data, start_address, data_length]
 
         self.is_param_changed = True
@@ -93,16 +95,21 @@ class GroupBulkRead:
     def rxPacket(self):
         self.last_result = False
 
-        result = COMM_RX_FAIL
-
         if len(self.data_dict.keys()) == 0:
             return COMM_NOT_AVAILABLE
 
+        # every ID gets its own result, so a silent device does not discard the data of the others.
+        self.rx_result = {}
+        rx_dict = readStatusBurst(self.port, self.ph,
+                                  dict((dxl_id, self.data_dict[dxl_id][PARAM_NUM_LENGTH]) for dxl_id in self.data_dict))
+
+        result = COMM_SUCCESS
         for dxl_id in self.data_dict:
-            self.data_dict[dxl_id][PARAM_NUM_DATA], result, _ = self.ph.readRx(self.port, dxl_id,
-                                                                               self.data_dict[dxl_id][PARAM_NUM_LENGTH])
-            if result != COMM_SUCCESS:
-                return result
+            data, self.rx_result[dxl_id], _ = rx_dict[dxl_id]
+            if self.rx_result[dxl_id] == COMM_SUCCESS:
+                self.data_dict[dxl_id][PARAM_NUM_DATA][:] = data
+            elif result == COMM_SUCCESS:
+                result = self.rx_result[dxl_id]
 
         if result == COMM_SUCCESS:
             self.last_result = True
@@ -110,14 +117,16 @@ class GroupBulkRead:
         return result
 
     def txRxPacket(self):
-        result = self.txPacket()
-        if result != COMM_SUCCESS:
-            return result
+        # the whole transaction holds the bus, so other threads queue instead of getting COMM_PORT_BUSY
+        with self.port.arbiter:
+            result = self.txPacket()
+            if result != COMM_SUCCESS:
+                return result
 
-        return self.rxPacket()
+            return self.rxPacket()
 
     def isAvailable(self, dxl_id, address, data_length):
-        if self.last_result is False or dxl_id not in self.data_dict:
+        if self.rx_result.get(dxl_id) != COMM_SUCCESS or dxl_id not in self.data_dict:
             return False
 
         start_addr = self.data_dict[dxl_id][PARAM_NUM_ADDRESS]
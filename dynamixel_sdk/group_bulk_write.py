@@ -28,7 +28,7 @@ class GroupBulkWrite:
         self.ph = ph
 
         self.is_param_changed = False
-        self.param = []
+        self.param = bytearray()
         self.data_list = {}
 
         self.clearParam()
@@ -37,7 +37,7 @@ class GroupBulkWrite:
         if self.ph.getProtocolVersion() == 1.0 or not self.data_list:
             return
 
-        self.param = []
+        self.param = bytearray()
 
         for dxl_id in self.data_list:
             if not self.data_list[dxl_id]:
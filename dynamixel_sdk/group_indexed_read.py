@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2020 University of Georgia Bio-Sensing and Instrumentation Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+from .robotis_def import *
+from .group_bulk_read import *
+from . import protocol1_packet_handler as protocol1
+
+
+# Reads the same area of several protocol 1.0 devices with one READ sent to the broadcast ID, for devices that answer
+# it one after another in the order of an index set on each of them beforehand (the 3mxl M3XL_SYNC_READ_INDEX).
+# It has the GroupBulkRead interface, but every ID must be added with the same address and length.
+class GroupIndexedRead(GroupBulkRead):
+    def makeParam(self):
+        return
+
+    def txPacket(self):
+        if self.ph.getProtocolVersion() != 1.0 or len(self.data_dict.keys()) == 0:
+            return COMM_NOT_AVAILABLE
+
+        spans = set((start_address, data_length) for _, start_address, data_length in self.data_dict.values())
+        if len(spans) != 1:
+            return COMM_NOT_AVAILABLE
+        start_address, data_length = spans.pop()
+
+        txpacket = bytearray(8)
+        txpacket[protocol1.PKT_ID] = BROADCAST_ID
+        txpacket[protocol1.PKT_LENGTH] = 4
+        txpacket[protocol1.PKT_INSTRUCTION] = INST_READ
+        txpacket[protocol1.PKT_PARAMETER0 + 0] = start_address
+        txpacket[protocol1.PKT_PARAMETER0 + 1] = data_length
+
+        with self.port.arbiter:
+            result = self.ph.txPacket(self.port, txpacket)
+            if result == COMM_SUCCESS:
+                self.port.setPacketTimeout((data_length + 6) * len(self.data_dict.keys()))
+
+            return result
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2020 University of Georgia Bio-Sensing and Instrumentation Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+from .robotis_def import *
+from .group_bulk_read import *
+
+
+# Reads areas of several devices with one READ per ID, for protocol 1.0 devices without bulk read (e.g. AX series).
+# It has the GroupBulkRead interface, so callers do not need to know which one they use.
+class GroupSequentialRead(GroupBulkRead):
+    def makeParam(self):
+        return
+
+    def txPacket(self):
+        return COMM_NOT_AVAILABLE
+
+    def rxPacket(self):
+        return COMM_NOT_AVAILABLE
+
+    def txRxPacket(self):
+        # the whole sequence holds the bus, so each READ goes out as soon as the previous status packet is parsed
+        with self.port.arbiter:
+            self.last_result = False
+
+            if len(self.data_dict.keys()) == 0:
+                return COMM_NOT_AVAILABLE
+
+            self.rx_result = {}
+            result = COMM_SUCCESS
+            for dxl_id in self.data_dict:
+                data, start_address, data_length = self.data_dict[dxl_id]
+                read, self.rx_result[dxl_id], _ = self.ph.readTxRx(self.port, dxl_id, start_address, data_length)
+                if self.rx_result[dxl_id] == COMM_SUCCESS:
+                    data[:] = read
+                elif result == COMM_SUCCESS:
+                    result = self.rx_result[dxl_id]
+
+            if result == COMM_SUCCESS:
+                self.last_result = True
+
+            return result
@@ -20,6 +20,7 @@
 # Author: Ryu Woon Jung (Leon)
 
 from .robotis_def import *
+from .status_packet_parser import readStatusBurst
 
 
 class GroupSyncRead:
@@ -31,8 +32,9 @@ class GroupSyncRead:
 
         self.last_result = False
         self.is_param_changed = False
-        self.param = []
+        self.param = bytearray()
         self.data_dict = {}
+        self.rx_result = {}
 
         self.clearParam()
 
@@ -43,7 +45,7 @@ class GroupSyncRead:
         if not self.data_dict:  # len(self.data_dict.keys()) == 0:
             return
 
-        self.param = []
+        self.param = bytearray()
 
         for dxl_id in self.data_dict:
             self.param.append(dxl_id)
@@ -55,7 +57,7 @@ class GroupSyncRead:
         if dxl_id in self.data_dict:  # dxl_id already exist
             return False
 
-        self.data_dict[dxl_id] = []  # [0] * self.data_length
+        self.data_dict[dxl_id] = bytearray(self.data_length)
 
         self.is_param_changed = True
         return True
@@ -93,15 +95,20 @@ class GroupSyncRead:
         if self.ph.getProtocolVersion() == 1.0:
             return COMM_NOT_AVAILABLE
 
-        result = COMM_RX_FAIL
-
         if len(self.data_dict.keys()) == 0:
             return COMM_NOT_AVAILABLE
 
+        # every ID gets its own result, so a silent device does not discard the data of the others.
+        self.rx_result = {}
+        rx_dict = readStatusBurst(self.port, self.ph, dict.fromkeys(self.data_dict, self.data_length))
+
+        result = COMM_SUCCESS
         for dxl_id in self.data_dict:
-            self.data_dict[dxl_id], result, _ = self.ph.readRx(self.port, dxl_id, self.data_length)
-            if result != COMM_SUCCESS:
-                return result
+            data, self.rx_result[dxl_id], _ = rx_dict[dxl_id]
+            if self.rx_result[dxl_id] == COMM_SUCCESS:
+                self.data_dict[dxl_id][:] = data
+            elif result == COMM_SUCCESS:
+                result = self.rx_result[dxl_id]
 
         if result == COMM_SUCCESS:
             self.last_result = True
@@ -109,17 +116,20 @@ class GroupSyncRead:
         return result
 
     def txRxPacket(self):
-        if self.ph.getProtocolVersion() == 1.0:
-            return COMM_NOT_AVAILABLE
+        # the whole transaction holds the bus, so other threads queue instead of getting COMM_PORT_BUSY
+        with self.port.arbiter:
+            if self.ph.getProtocolVersion() == 1.0:
+                return COMM_NOT_AVAILABLE
 
-        result = self.txPacket()
-        if result != COMM_SUCCESS:
-            return result
+            result = self.txPacket()
+            if result != COMM_SUCCESS:
+                return result
 
-        return self.rxPacket()
+            return self.rxPacket()
 
     def isAvailable(self, dxl_id, address, data_length):
-        if self.ph.getProtocolVersion() == 1.0 or self.last_result is False or dxl_id not in self.data_dict:
+        if self.ph.getProtocolVersion() == 1.0 or self.rx_result.get(dxl_id) != COMM_SUCCESS or \
+                dxl_id not in self.data_dict:
             return False
 
         if (address < self.start_address) or (self.start_address + self.data_length - data_length < address):
@@ -30,7 +30,7 @@ class GroupSyncWrite:
         self.data_length = data_length
 
         self.is_param_changed = False
-        self.param = []
+        self.param = bytearray()
         self.data_dict = {}
 
         self.clearParam()
@@ -39,7 +39,7 @@ class GroupSyncWrite:
         if not self.data_dict:
             return
 
-        self.param = []
+        self.param = bytearray()
 
         for dxl_id in self.data_dict:
             if not self.data_dict[dxl_id]:
@@ -0,0 +1,278 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2020 University of Georgia Bio-Sensing and Instrumentation Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+import os
+import threading
+from .robotis_def import *
+from .port_handler import monotonic_ns
+
+# Histogram precision: every power of two range is split into 2 ** HISTOGRAM_SUB_BITS buckets, so a recorded value
+# is known to within 1 / 32 (~3 %). Values are microseconds, up to 2 ** HISTOGRAM_MAX_BITS (about 71 minutes).
+HISTOGRAM_SUB_BITS = 5
+HISTOGRAM_MAX_BITS = 32
+
+INSTRUCTION_NAMES = {
+    INST_PING: "ping",
+    INST_READ: "read",
+    INST_WRITE: "write",
+    INST_REG_WRITE: "reg_write",
+    INST_ACTION: "action",
+    INST_FACTORY_RESET: "factory_reset",
+    INST_CLEAR: "clear",
+    INST_SYNC_WRITE: "sync_write",
+    INST_BULK_READ: "bulk_read",
+    INST_REBOOT: "reboot",
+    INST_STATUS: "status",
+    INST_SYNC_READ: "sync_read",
+    INST_BULK_WRITE: "bulk_write",
+}
+
+RTT_QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+
+class LatencyHistogram:
+    """Counts values in log-linear buckets, like an HDR histogram.
+
+    Recording is a bit length, two shifts and a list increment, and the memory used is fixed whatever the number of
+    values recorded. Percentiles are returned as the highest value of the matching bucket.
+    """
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    SUB_BUCKETS = 1 << HISTOGRAM_SUB_BITS
+    HIGHEST = (1 << HISTOGRAM_MAX_BITS) - 1
+
+    def __init__(self):
+        self.counts = [0] * (self.index(self.HIGHEST) + 1)
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    @staticmethod
+    def index(value):
+        """Returns the bucket of a value"""
+        shift = value.bit_length() - HISTOGRAM_SUB_BITS - 1
+        if shift <= 0:
+            return value
+        return (shift << HISTOGRAM_SUB_BITS) + (value >> shift)
+
+    @classmethod
+    def lowest(cls, index):
+        """Returns the lowest value held by a bucket"""
+        if index < 2 * cls.SUB_BUCKETS:
+            return index
+        shift = (index >> HISTOGRAM_SUB_BITS) - 1
+        return (index - (shift << HISTOGRAM_SUB_BITS)) << shift
+
+    def record(self, value):
+        value = min(max(int(value), 0), self.HIGHEST)
+        self.counts[self.index(value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def reset(self):
+        self.counts = [0] * len(self.counts)
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percent):
+        """Returns the value below which a percentage of the recorded values fall, or 0 if none was recorded"""
+        if self.count == 0:
+            return 0
+        rank = max(1, int(round(self.count * percent / 100.0)))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self.lowest(index + 1) - 1, self.max)
+        return self.max
+
+
+class TransactionStats:
+    """Holds the counters of one instruction sent to one ID"""
+    __slots__ = ("sent", "tx_bytes", "received", "rx_bytes", "timeouts", "corrupt", "errors", "retries", "rtt")
+
+    def __init__(self):
+        self.sent = 0
+        self.tx_bytes = 0
+        self.received = 0
+        self.rx_bytes = 0
+        self.timeouts = 0
+        self.corrupt = 0
+        self.errors = 0
+        self.retries = 0
+        # round trip in microseconds, from writing the instruction packet to parsing the status packet.
+        self.rtt = LatencyHistogram()
+
+    def as_dict(self):
+        rtt = self.rtt
+        return {
+            "sent": self.sent,
+            "tx_bytes": self.tx_bytes,
+            "received": self.received,
+            "rx_bytes": self.rx_bytes,
+            "timeouts": self.timeouts,
+            "corrupt": self.corrupt,
+            "errors": self.errors,
+            "retries": self.retries,
+            "rtt_us": {
+                "count": rtt.count,
+                "min": rtt.min or 0,
+                "mean": rtt.mean(),
+                "max": rtt.max,
+                "p50": rtt.percentile(50),
+                "p90": rtt.percentile(90),
+                "p99": rtt.percentile(99),
+                "p99.9": rtt.percentile(99.9),
+            },
+        }
+
+
+class Instrumentation:
+    """Records the traffic of a port per ID and instruction.
+
+    Attach one to a port with `port.instrument = Instrumentation()`. The packet handlers only check that attribute
+    against None, so a port without instrumentation pays nothing else. Broadcast packets are recorded under
+    BROADCAST_ID, and the status packets of sync and bulk reads under the ID that sent them.
+    """
+
+    def __init__(self, name=""):
+        self.name = name
+        self.stats = {}
+        self.lock = threading.Lock()
+        # instruction and send time of the last packet, which the status packets that follow are matched to.
+        self.instruction = None
+        self.sent_time = 0
+
+    def get(self, dxl_id, instruction):
+        """Returns the TransactionStats of an instruction sent to an ID"""
+        key = (dxl_id, instruction)
+        stats = self.stats.get(key)
+        if stats is None:
+            with self.lock:
+                stats = self.stats.setdefault(key, TransactionStats())
+        return stats
+
+    def sent(self, dxl_id, instruction, length):
+        """Records an instruction packet about to be written to the port"""
+        stats = self.get(dxl_id, instruction)
+        with self.lock:
+            stats.sent += 1
+            stats.tx_bytes += length
+        self.instruction = instruction
+        self.sent_time = monotonic_ns()
+
+    def received(self, dxl_id, length, result, error=0):
+        """Records the outcome of waiting for the status packet of an ID to the last instruction sent"""
+        now = monotonic_ns()
+        stats = self.get(dxl_id, self.instruction)
+        with self.lock:
+            if result == COMM_SUCCESS:
+                stats.received += 1
+                stats.rx_bytes += length
+                stats.rtt.record((now - self.sent_time) // 1000)
+                if error != 0:
+                    stats.errors += 1
+            elif result == COMM_RX_TIMEOUT:
+                stats.timeouts += 1
+            elif result == COMM_RX_CORRUPT:
+                stats.corrupt += 1
+                stats.rx_bytes += length
+
+    def retried(self, dxl_id, instruction):
+        """Records that an instruction to an ID is sent again after a failure"""
+        stats = self.get(dxl_id, instruction)
+        with self.lock:
+            stats.retries += 1
+
+    def reset(self):
+        with self.lock:
+            self.stats = {}
+
+    def snapshot(self):
+        """Returns a copy of every counter as a dictionary of {(dxl_id, instruction name): {counter: value}}"""
+        with self.lock:
+            return dict(((dxl_id, INSTRUCTION_NAMES.get(instruction, str(instruction))), stats.as_dict())
+                        for (dxl_id, instruction), stats in sorted(self.stats.items()))
+
+    def prometheus(self):
+        """Returns every counter in the Prometheus text exposition format"""
+        return prometheus_text(self)
+
+
+# (metric, help, TransactionStats attribute)
+PROMETHEUS_COUNTERS = (
+    ("dynamixel_packets_sent_total", "Instruction packets sent.", "sent"),
+    ("dynamixel_tx_bytes_total", "Bytes of instruction packets sent.", "tx_bytes"),
+    ("dynamixel_packets_received_total", "Valid status packets received.", "received"),
+    ("dynamixel_rx_bytes_total", "Bytes of status packets received.", "rx_bytes"),
+    ("dynamixel_timeouts_total", "Status packets not received before the packet timeout.", "timeouts"),
+    ("dynamixel_corrupt_total", "Status packets received with a bad length or checksum.", "corrupt"),
+    ("dynamixel_status_errors_total", "Status packets with error bits set.", "errors"),
+    ("dynamixel_retries_total", "Instructions sent again after a failure.", "retries"),
+)
+
+
+def prometheus_text(*instrumentations):
+    """Returns the counters of one or more Instrumentation objects in the Prometheus text exposition format, with
+    the Instrumentation name as the port label"""
+    rows = []
+    for instrumentation in instrumentations:
+        with instrumentation.lock:
+            for (dxl_id, instruction), stats in sorted(instrumentation.stats.items()):
+                labels = 'port="%s",id="%d",instruction="%s"' % (
+                    instrumentation.name.replace('\\', '\\\\').replace('"', '\\"'), dxl_id,
+                    INSTRUCTION_NAMES.get(instruction, str(instruction)))
+                rows.append((labels, stats))
+
+    lines = []
+    for metric, description, attribute in PROMETHEUS_COUNTERS:
+        lines.append("# HELP %s %s" % (metric, description))
+        lines.append("# TYPE %s counter" % metric)
+        for labels, stats in rows:
+            lines.append("%s{%s} %d" % (metric, labels, getattr(stats, attribute)))
+
+    lines.append("# HELP dynamixel_rtt_seconds Round trip from instruction packet to status packet.")
+    lines.append("# TYPE dynamixel_rtt_seconds summary")
+    for labels, stats in rows:
+        rtt = stats.rtt
+        for quantile in RTT_QUANTILES:
+            lines.append('dynamixel_rtt_seconds{%s,quantile="%g"} %.6f'
+                         % (labels, quantile, rtt.percentile(quantile * 100.0) / 1000000.0))
+        lines.append("dynamixel_rtt_seconds_sum{%s} %.6f" % (labels, rtt.total / 1000000.0))
+        lines.append("dynamixel_rtt_seconds_count{%s} %d" % (labels, rtt.count))
+
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path, *instrumentations):
+    """Writes prometheus_text() to a file, replacing it in one step so a collector never reads it half written"""
+    temporary = "%s.%d.tmp" % (path, os.getpid())
+    with open(temporary, "w") as f:
+        f.write(prometheus_text(*instrumentations))
+    os.replace(temporary, path)
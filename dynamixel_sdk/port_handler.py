@@ -23,10 +23,20 @@ import time
 import serial
 import sys
 import platform
+import select
+
+from .bus_arbiter import *
 
 LATENCY_TIMER = 16
 DEFAULT_BAUDRATE = 1000000
 
+# monotonic clock in nanoseconds; wall clock jumps must not stretch or cut short a packet timeout.
+if hasattr(time, 'monotonic_ns'):
+    monotonic_ns = time.monotonic_ns
+else:
+    def monotonic_ns():
+        return int(time.monotonic() * 1000000000)
+
 
 class PortHandler(object):
     def __init__(self, port_name):
@@ -34,11 +44,20 @@ class PortHandler(object):
         self.baudrate = DEFAULT_BAUDRATE
         self.packet_start_time = 0.0
         self.packet_timeout = 0.0
+        self.packet_deadline = 0
         self.tx_time_per_byte = 0.0
+        # milliseconds allowed on top of the wire time of a status packet, None for the fixed LATENCY_TIMER margin
+        self.packet_timeout_margin = None
 
         self.is_using = False
+        self.arbiter = BusArbiter()
+        # an Instrumentation recording the traffic, None when not instrumented
+        self.instrument = None
         self.port_name = port_name
         self.ser = None
+        self.fd = None
+        # the packet deadline the serial read timeout was last set for, see waitForData
+        self.timeout_deadline = None
 
     def openPort(self):
         return self.setBaudRate(self.baudrate)
@@ -74,31 +93,55 @@ class PortHandler(object):
         return self.ser.in_waiting
 
     def readPort(self, length):
+        # block until data arrives or the packet deadline passes, instead of returning empty-handed and letting
+        # the rx loops spin on isPacketTimeout.
+        if length > 0:
+            self.waitForData()
+
         if (sys.version_info > (3, 0)):
             return self.ser.read(length)
         else:
-            return [ord(ch) for ch in self.ser.read(length)]
+            return bytearray(self.ser.read(length))
 
     def writePort(self, packet):
         return self.ser.write(packet)
 
+    def waitForData(self):
+        remaining = max(self.packet_deadline - monotonic_ns(), 0)
+
+        if self.fd is not None:
+            # returns as soon as at least one byte can be read.
+            if remaining > 0:
+                select.select([self.fd], [], [], remaining / 1000000000.0)
+        else:
+            # no pollable descriptor (e.g. Windows), so pyserial's own read timeout does the waiting. setting it
+            # reconfigures the port, so it is only set once per packet deadline, and to 0 once the deadline passed.
+            if self.packet_deadline != self.timeout_deadline or (remaining == 0 and self.ser.timeout != 0):
+                self.timeout_deadline = self.packet_deadline
+                self.ser.timeout = remaining / 1000000000.0
+
     def setPacketTimeout(self, packet_length):
-        self.packet_start_time = self.getCurrentTime()
-        self.packet_timeout = (self.tx_time_per_byte * packet_length) + (LATENCY_TIMER * 2.0) + 2.0
+        margin = self.packet_timeout_margin
+        if margin is None:
+            margin = (LATENCY_TIMER * 2.0) + 2.0
+        self.setPacketTimeoutMillis((self.tx_time_per_byte * packet_length) + margin)
 
     def setPacketTimeoutMillis(self, msec):
-        self.packet_start_time = self.getCurrentTime()
+        now = monotonic_ns()
+        self.packet_start_time = now / 1000000.0
         self.packet_timeout = msec
+        self.packet_deadline = now + int(msec * 1000000)
 
     def isPacketTimeout(self):
-        if self.getTimeSinceStart() > self.packet_timeout:
+        if monotonic_ns() > self.packet_deadline:
             self.packet_timeout = 0
+            self.packet_deadline = 0
             return True
 
         return False
 
     def getCurrentTime(self):
-        return round(time.time() * 1000000000) / 1000000.0
+        return monotonic_ns() / 1000000.0
 
     def getTimeSinceStart(self):
         time_since = self.getCurrentTime() - self.packet_start_time
@@ -122,6 +165,13 @@ class PortHandler(object):
 
         self.is_open = True
 
+        # posix ports expose a descriptor that waitForData can select on.
+        try:
+            self.fd = self.ser.fileno()
+        except Exception:
+            self.fd = None
+        self.timeout_deadline = None
+
         self.ser.reset_input_buffer()
 
         self.tx_time_per_byte = (1000.0 / self.baudrate) * 10.0
@@ -94,12 +94,13 @@ class Protocol1PacketHandler(object):
         return ""
 
     def txPacket(self, port, txpacket):
-        checksum = 0
         total_packet_length = txpacket[PKT_LENGTH] + 4  # 4: HEADER0 HEADER1 ID LENGTH
 
-        if port.is_using:
-            return COMM_PORT_BUSY
-        port.is_using = True
+        # waits while another thread holds the bus for a transaction, and makes the check and set atomic
+        with port.arbiter:
+            if port.is_using:
+                return COMM_PORT_BUSY
+            port.is_using = True
 
         # check max packet length
         if total_packet_length > TXPACKET_MAX_LEN:
@@ -111,13 +112,15 @@ class Protocol1PacketHandler(object):
         txpacket[PKT_HEADER1] = 0xFF
 
         # add a checksum to the packet
-        for idx in range(2, total_packet_length - 1):  # except header, checksum
-            checksum += txpacket[idx]
+        checksum = sum(txpacket[2: total_packet_length - 1])  # except header, checksum
 
         txpacket[total_packet_length - 1] = ~checksum & 0xFF
 
         #print "[TxPacket] %r" % txpacket
 
+        if port.instrument is not None:
+            port.instrument.sent(txpacket[PKT_ID], txpacket[PKT_INSTRUCTION], total_packet_length)
+
         # tx packet
         port.clearPort()
         written_packet_length = port.writePort(txpacket)
@@ -128,10 +131,9 @@ class Protocol1PacketHandler(object):
         return COMM_SUCCESS
 
     def rxPacket(self, port):
-        rxpacket = []
+        rxpacket = bytearray()
 
         result = COMM_TX_FAIL
-        checksum = 0
         rx_length = 0
         wait_length = 6  # minimum length (HEADER0 HEADER1 ID LENGTH ERROR CHKSUM)
 
@@ -140,9 +142,9 @@ class Protocol1PacketHandler(object):
             rx_length = len(rxpacket)
             if rx_length >= wait_length:
                 # find packet header
-                for idx in range(0, (rx_length - 1)):
-                    if (rxpacket[idx] == 0xFF) and (rxpacket[idx + 1] == 0xFF):
-                        break
+                idx = rxpacket.find(b'\xFF\xFF')
+                if idx == -1:
+                    idx = rx_length - 1  # keep the last byte, it may be the start of a header
 
                 if idx == 0:  # found at the beginning of the packet
                     if (rxpacket[PKT_ID] > 0xFD) or (rxpacket[PKT_LENGTH] > RXPACKET_MAX_LEN) or (
@@ -170,9 +172,7 @@ class Protocol1PacketHandler(object):
                             continue
 
                     # calculate checksum
-                    for i in range(2, wait_length - 1):  # except header, checksum
-                        checksum += rxpacket[i]
-                    checksum = ~checksum & 0xFF
+                    checksum = ~sum(rxpacket[2: wait_length - 1]) & 0xFF  # except header, checksum
 
                     # verify checksum
                     if rxpacket[wait_length - 1] == checksum:
@@ -182,7 +182,8 @@ class Protocol1PacketHandler(object):
                     break
 
                 else:
-                    # remove unnecessary packets
+                    # remove unnecessary packets. deleting from the front of a bytearray does not move the rest of
+                    # the buffer, so resyncing on a noisy line stays linear.
                     del rxpacket[0: idx]
                     rx_length -= idx
 
@@ -203,45 +204,50 @@ class Protocol1PacketHandler(object):
 
     # NOT for BulkRead
     def txRxPacket(self, port, txpacket):
-        rxpacket = None
-        error = 0
-
-        # tx packet
-        result = self.txPacket(port, txpacket)
-        if result != COMM_SUCCESS:
-            return rxpacket, result, error
-
-        # (Instruction == BulkRead) == this function is not available.
-        if txpacket[PKT_INSTRUCTION] == INST_BULK_READ:
-            result = COMM_NOT_AVAILABLE
+        # the whole transaction holds the bus, so other threads queue instead of getting COMM_PORT_BUSY
+        with port.arbiter:
+            rxpacket = None
+            error = 0
+
+            # tx packet
+            result = self.txPacket(port, txpacket)
+            if result != COMM_SUCCESS:
+                return rxpacket, result, error
+
+            # (Instruction == BulkRead) == this function is not available.
+            if txpacket[PKT_INSTRUCTION] == INST_BULK_READ:
+                result = COMM_NOT_AVAILABLE
+
+            # (ID == Broadcast ID) == no need to wait for status packet or not available
+            if (txpacket[PKT_ID] == BROADCAST_ID):
+                port.is_using = False
+                return rxpacket, result, error
+
+            # set packet timeout
+            if txpacket[PKT_INSTRUCTION] == INST_READ:
+                port.setPacketTimeout(txpacket[PKT_PARAMETER0 + 1] + 6)
+            else:
+                port.setPacketTimeout(6)  # HEADER0 HEADER1 ID LENGTH ERROR CHECKSUM
 
-        # (ID == Broadcast ID) == no need to wait for status packet or not available
-        if (txpacket[PKT_ID] == BROADCAST_ID):
-            port.is_using = False
-            return rxpacket, result, error
+            # rx packet
+            while True:
+                rxpacket, result = self.rxPacket(port)
+                if result != COMM_SUCCESS or txpacket[PKT_ID] == rxpacket[PKT_ID]:
+                    break
 
-        # set packet timeout
-        if txpacket[PKT_INSTRUCTION] == INST_READ:
-            port.setPacketTimeout(txpacket[PKT_PARAMETER0 + 1] + 6)
-        else:
-            port.setPacketTimeout(6)  # HEADER0 HEADER1 ID LENGTH ERROR CHECKSUM
+            if result == COMM_SUCCESS and txpacket[PKT_ID] == rxpacket[PKT_ID]:
+                error = rxpacket[PKT_ERROR]
 
-        # rx packet
-        while True:
-            rxpacket, result = self.rxPacket(port)
-            if result != COMM_SUCCESS or txpacket[PKT_ID] == rxpacket[PKT_ID]:
-                break
+            if port.instrument is not None:
+                port.instrument.received(txpacket[PKT_ID], len(rxpacket), result, error)
 
-        if result == COMM_SUCCESS and txpacket[PKT_ID] == rxpacket[PKT_ID]:
-            error = rxpacket[PKT_ERROR]
-
-        return rxpacket, result, error
+            return rxpacket, result, error
 
     def ping(self, port, dxl_id):
         model_number = 0
         error = 0
 
-        txpacket = [0] * 6
+        txpacket = bytearray(6)
 
         if dxl_id >= BROADCAST_ID:
             return model_number, COMM_NOT_AVAILABLE, error
@@ -259,12 +265,12 @@ class Protocol1PacketHandler(object):
 
         return model_number, result, error
 
-    def broadcastPing(self, port):
+    def broadcastPing(self, port, max_id=MAX_ID, silence=None):
         data_list = None
         return data_list, COMM_NOT_AVAILABLE
 
     def action(self, port, dxl_id):
-        txpacket = [0] * 6
+        txpacket = bytearray(6)
 
         txpacket[PKT_ID] = dxl_id
         txpacket[PKT_LENGTH] = 2
@@ -278,7 +284,7 @@ class Protocol1PacketHandler(object):
         return COMM_NOT_AVAILABLE, 0
 
     def factoryReset(self, port, dxl_id):
-        txpacket = [0] * 6
+        txpacket = bytearray(6)
 
         txpacket[PKT_ID] = dxl_id
         txpacket[PKT_LENGTH] = 2
@@ -290,7 +296,7 @@ class Protocol1PacketHandler(object):
 
     def readTx(self, port, dxl_id, address, length):
 
-        txpacket = [0] * 8
+        txpacket = bytearray(8)
 
         if dxl_id >= BROADCAST_ID:
             return COMM_NOT_AVAILABLE
@@ -301,20 +307,22 @@ class Protocol1PacketHandler(object):
         txpacket[PKT_PARAMETER0 + 0] = address
         txpacket[PKT_PARAMETER0 + 1] = length
 
-        result = self.txPacket(port, txpacket)
+        # the send holds the bus like txRxPacket, so other threads queue instead of getting COMM_PORT_BUSY
+        with port.arbiter:
+            result = self.txPacket(port, txpacket)
 
-        # set packet timeout
-        if result == COMM_SUCCESS:
-            port.setPacketTimeout(length + 6)
+            # set packet timeout
+            if result == COMM_SUCCESS:
+                port.setPacketTimeout(length + 6)
 
-        return result
+            return result
 
     def readRx(self, port, dxl_id, length):
         result = COMM_TX_FAIL
         error = 0
 
         rxpacket = None
-        data = []
+        data = bytearray()
 
         while True:
             rxpacket, result = self.rxPacket(port)
@@ -325,13 +333,13 @@ class Protocol1PacketHandler(object):
         if result == COMM_SUCCESS and rxpacket[PKT_ID] == dxl_id:
             error = rxpacket[PKT_ERROR]
 
-            data.extend(rxpacket[PKT_PARAMETER0: PKT_PARAMETER0 + length])
+            data = rxpacket[PKT_PARAMETER0: PKT_PARAMETER0 + length]
 
         return data, result, error
 
     def readTxRx(self, port, dxl_id, address, length):
-        txpacket = [0] * 8
-        data = []
+        txpacket = bytearray(8)
+        data = bytearray()
 
         if dxl_id >= BROADCAST_ID:
             return data, COMM_NOT_AVAILABLE, 0
@@ -346,7 +354,7 @@ class Protocol1PacketHandler(object):
         if result == COMM_SUCCESS:
             error = rxpacket[PKT_ERROR]
 
-            data.extend(rxpacket[PKT_PARAMETER0: PKT_PARAMETER0 + length])
+            data = rxpacket[PKT_PARAMETER0: PKT_PARAMETER0 + length]
 
         return data, result, error
 
@@ -392,7 +400,7 @@ class Protocol1PacketHandler(object):
         return data_read, result, error
 
     def writeTxOnly(self, port, dxl_id, address, length, data):
-        txpacket = [0] * (length + 7)
+        txpacket = bytearray(length + 7)
 
         txpacket[PKT_ID] = dxl_id
         txpacket[PKT_LENGTH] = length + 3
@@ -401,13 +409,14 @@ class Protocol1PacketHandler(object):
 
         txpacket[PKT_PARAMETER0 + 1: PKT_PARAMETER0 + 1 + length] = data[0: length]
 
-        result = self.txPacket(port, txpacket)
-        port.is_using = False
+        with port.arbiter:
+            result = self.txPacket(port, txpacket)
+            port.is_using = False
 
-        return result
+            return result
 
     def writeTxRx(self, port, dxl_id, address, length, data):
-        txpacket = [0] * (length + 7)
+        txpacket = bytearray(length + 7)
 
         txpacket[PKT_ID] = dxl_id
         txpacket[PKT_LENGTH] = length + 3
@@ -450,7 +459,7 @@ class Protocol1PacketHandler(object):
         return self.writeTxRx(port, dxl_id, address, 4, data_write)
 
     def regWriteTxOnly(self, port, dxl_id, address, length, data):
-        txpacket = [0] * (length + 7)
+        txpacket = bytearray(length + 7)
 
         txpacket[PKT_ID] = dxl_id
         txpacket[PKT_LENGTH] = length + 3
@@ -459,13 +468,14 @@ class Protocol1PacketHandler(object):
 
         txpacket[PKT_PARAMETER0 + 1: PKT_PARAMETER0 + 1 + length] = data[0: length]
 
-        result = self.txPacket(port, txpacket)
-        port.is_using = False
+        with port.arbiter:
+            result = self.txPacket(port, txpacket)
+            port.is_using = False
 
-        return result
+            return result
 
     def regWriteTxRx(self, port, dxl_id, address, length, data):
-        txpacket = [0] * (length + 7)
+        txpacket = bytearray(length + 7)
 
         txpacket[PKT_ID] = dxl_id
         txpacket[PKT_LENGTH] = length + 3
@@ -482,7 +492,7 @@ class Protocol1PacketHandler(object):
         return COMM_NOT_AVAILABLE
 
     def syncWriteTxOnly(self, port, start_address, data_length, param, param_length):
-        txpacket = [0] * (param_length + 8)
+        txpacket = bytearray(param_length + 8)
         # 8: HEADER0 HEADER1 ID LEN INST START_ADDR DATA_LEN ... CHKSUM
 
         txpacket[PKT_ID] = BROADCAST_ID
@@ -498,7 +508,7 @@ class Protocol1PacketHandler(object):
         return result
 
     def bulkReadTx(self, port, param, param_length):
-        txpacket = [0] * (param_length + 7)
+        txpacket = bytearray(param_length + 7)
         # 7: HEADER0 HEADER1 ID LEN INST 0x00 ... CHKSUM
 
         txpacket[PKT_ID] = BROADCAST_ID
@@ -508,16 +518,17 @@ class Protocol1PacketHandler(object):
 
         txpacket[PKT_PARAMETER0 + 1: PKT_PARAMETER0 + 1 + param_length] = param[0: param_length]
 
-        result = self.txPacket(port, txpacket)
-        if result == COMM_SUCCESS:
-            wait_length = 0
-            i = 0
-            while i < param_length:
-                wait_length += param[i] + 7
-                i += 3
-            port.setPacketTimeout(wait_length)
-
-        return result
+        with port.arbiter:
+            result = self.txPacket(port, txpacket)
+            if result == COMM_SUCCESS:
+                wait_length = 0
+                i = 0
+                while i < param_length:
+                    wait_length += param[i] + 7
+                    i += 3
+                port.setPacketTimeout(wait_length)
+
+            return result
 
     def bulkWriteTxOnly(self, port, param, param_length):
         return COMM_NOT_AVAILABLE
@@ -47,6 +47,54 @@ ERRNUM_ACCESS = 7  # Access error
 
 ERRBIT_ALERT = 128  # When the device has a problem, this bit is set to 1. Check "Device Status Check" value.
 
+# CRC-16 (polynomial 0x8005) lookup table, built once per process rather than on every updateCRC call
+CRC_TABLE = (0x0000,
+             0x8005, 0x800F, 0x000A, 0x801B, 0x001E, 0x0014, 0x8011,
+             0x8033, 0x0036, 0x003C, 0x8039, 0x0028, 0x802D, 0x8027,
+             0x0022, 0x8063, 0x0066, 0x006C, 0x8069, 0x0078, 0x807D,
+             0x8077, 0x0072, 0x0050, 0x8055, 0x805F, 0x005A, 0x804B,
+             0x004E, 0x0044, 0x8041, 0x80C3, 0x00C6, 0x00CC, 0x80C9,
+             0x00D8, 0x80DD, 0x80D7, 0x00D2, 0x00F0, 0x80F5, 0x80FF,
+             0x00FA, 0x80EB, 0x00EE, 0x00E4, 0x80E1, 0x00A0, 0x80A5,
+             0x80AF, 0x00AA, 0x80BB, 0x00BE, 0x00B4, 0x80B1, 0x8093,
+             0x0096, 0x009C, 0x8099, 0x0088, 0x808D, 0x8087, 0x0082,
+             0x8183, 0x0186, 0x018C, 0x8189, 0x0198, 0x819D, 0x8197,
+             0x0192, 0x01B0, 0x81B5, 0x81BF, 0x01BA, 0x81AB, 0x01AE,
+             0x01A4, 0x81A1, 0x01E0, 0x81E5, 0x81EF, 0x01EA, 0x81FB,
+             0x01FE, 0x01F4, 0x81F1, 0x81D3, 0x01D6, 0x01DC, 0x81D9,
+             0x01C8, 0x81CD, 0x81C7, 0x01C2, 0x0140, 0x8145, 0x814F,
+             0x014A, 0x815B, 0x015E, 0x0154, 0x8151, 0x8173, 0x0176,
+             0x017C, 0x8179, 0x0168, 0x816D, 0x8167, 0x0162, 0x8123,
+             0x0126, 0x012C, 0x8129, 0x0138, 0x813D, 0x8137, 0x0132,
+             0x0110, 0x8115, 0x811F, 0x011A, 0x810B, 0x010E, 0x0104,
+             0x8101, 0x8303, 0x0306, 0x030C, 0x8309, 0x0318, 0x831D,
+             0x8317, 0x0312, 0x0330, 0x8335, 0x833F, 0x033A, 0x832B,
+             0x032E, 0x0324, 0x8321, 0x0360, 0x8365, 0x836F, 0x036A,
+             0x837B, 0x037E, 0x0374, 0x8371, 0x8353, 0x0356, 0x035C,
+             0x8359, 0x0348, 0x834D, 0x8347, 0x0342, 0x03C0, 0x83C5,
+             0x83CF, 0x03CA, 0x83DB, 0x03DE, 0x03D4, 0x83D1, 0x83F3,
+             0x03F6, 0x03FC, 0x83F9, 0x03E8, 0x83ED, 0x83E7, 0x03E2,
+             0x83A3, 0x03A6, 0x03AC, 0x83A9, 0x03B8, 0x83BD, 0x83B7,
+             0x03B2, 0x0390, 0x8395, 0x839F, 0x039A, 0x838B, 0x038E,
+             0x0384, 0x8381, 0x0280, 0x8285, 0x828F, 0x028A, 0x829B,
+             0x029E, 0x0294, 0x8291, 0x82B3, 0x02B6, 0x02BC, 0x82B9,
+             0x02A8, 0x82AD, 0x82A7, 0x02A2, 0x82E3, 0x02E6, 0x02EC,
+             0x82E9, 0x02F8, 0x82FD, 0x82F7, 0x02F2, 0x02D0, 0x82D5,
+             0x82DF, 0x02DA, 0x82CB, 0x02CE, 0x02C4, 0x82C1, 0x8243,
+             0x0246, 0x024C, 0x8249, 0x0258, 0x825D, 0x8257, 0x0252,
+             0x0270, 0x8275, 0x827F, 0x027A, 0x826B, 0x026E, 0x0264,
+             0x8261, 0x0220, 0x8225, 0x822F, 0x022A, 0x823B, 0x023E,
+             0x0234, 0x8231, 0x8213, 0x0216, 0x021C, 0x8219, 0x0208,
+             0x820D, 0x8207, 0x0202)
+
+# crcmod ships a C implementation of the same CRC; without it the table-driven loop above is used.
+try:
+    import crcmod
+
+    crc16_ext = crcmod.mkCrcFun(0x18005, initCrc=0, rev=False, xorOut=0)
+except ImportError:
+    crc16_ext = None
+
 
 class Protocol2PacketHandler(object):
     def getProtocolVersion(self):
@@ -106,81 +154,30 @@ class Protocol2PacketHandler(object):
             return "[RxPacketError] Unknown error code!"
 
     def updateCRC(self, crc_accum, data_blk_ptr, data_blk_size):
-        crc_table = [0x0000,
-                     0x8005, 0x800F, 0x000A, 0x801B, 0x001E, 0x0014, 0x8011,
-                     0x8033, 0x0036, 0x003C, 0x8039, 0x0028, 0x802D, 0x8027,
-                     0x0022, 0x8063, 0x0066, 0x006C, 0x8069, 0x0078, 0x807D,
-                     0x8077, 0x0072, 0x0050, 0x8055, 0x805F, 0x005A, 0x804B,
-                     0x004E, 0x0044, 0x8041, 0x80C3, 0x00C6, 0x00CC, 0x80C9,
-                     0x00D8, 0x80DD, 0x80D7, 0x00D2, 0x00F0, 0x80F5, 0x80FF,
-                     0x00FA, 0x80EB, 0x00EE, 0x00E4, 0x80E1, 0x00A0, 0x80A5,
-                     0x80AF, 0x00AA, 0x80BB, 0x00BE, 0x00B4, 0x80B1, 0x8093,
-                     0x0096, 0x009C, 0x8099, 0x0088, 0x808D, 0x8087, 0x0082,
-                     0x8183, 0x0186, 0x018C, 0x8189, 0x0198, 0x819D, 0x8197,
-                     0x0192, 0x01B0, 0x81B5, 0x81BF, 0x01BA, 0x81AB, 0x01AE,
-                     0x01A4, 0x81A1, 0x01E0, 0x81E5, 0x81EF, 0x01EA, 0x81FB,
-                     0x01FE, 0x01F4, 0x81F1, 0x81D3, 0x01D6, 0x01DC, 0x81D9,
-                     0x01C8, 0x81CD, 0x81C7, 0x01C2, 0x0140, 0x8145, 0x814F,
-                     0x014A, 0x815B, 0x015E, 0x0154, 0x8151, 0x8173, 0x0176,
-                     0x017C, 0x8179, 0x0168, 0x816D, 0x8167, 0x0162, 0x8123,
-                     0x0126, 0x012C, 0x8129, 0x0138, 0x813D, 0x8137, 0x0132,
-                     0x0110, 0x8115, 0x811F, 0x011A, 0x810B, 0x010E, 0x0104,
-                     0x8101, 0x8303, 0x0306, 0x030C, 0x8309, 0x0318, 0x831D,
-                     0x8317, 0x0312, 0x0330, 0x8335, 0x833F, 0x033A, 0x832B,
-                     0x032E, 0x0324, 0x8321, 0x0360, 0x8365, 0x836F, 0x036A,
-                     0x837B, 0x037E, 0x0374, 0x8371, 0x8353, 0x0356, 0x035C,
-                     0x8359, 0x0348, 0x834D, 0x8347, 0x0342, 0x03C0, 0x83C5,
-                     0x83CF, 0x03CA, 0x83DB, 0x03DE, 0x03D4, 0x83D1, 0x83F3,
-                     0x03F6, 0x03FC, 0x83F9, 0x03E8, 0x83ED, 0x83E7, 0x03E2,
-                     0x83A3, 0x03A6, 0x03AC, 0x83A9, 0x03B8, 0x83BD, 0x83B7,
-                     0x03B2, 0x0390, 0x8395, 0x839F, 0x039A, 0x838B, 0x038E,
-                     0x0384, 0x8381, 0x0280, 0x8285, 0x828F, 0x028A, 0x829B,
-                     0x029E, 0x0294, 0x8291, 0x82B3, 0x02B6, 0x02BC, 0x82B9,
-                     0x02A8, 0x82AD, 0x82A7, 0x02A2, 0x82E3, 0x02E6, 0x02EC,
-                     0x82E9, 0x02F8, 0x82FD, 0x82F7, 0x02F2, 0x02D0, 0x82D5,
-                     0x82DF, 0x02DA, 0x82CB, 0x02CE, 0x02C4, 0x82C1, 0x8243,
-                     0x0246, 0x024C, 0x8249, 0x0258, 0x825D, 0x8257, 0x0252,
-                     0x0270, 0x8275, 0x827F, 0x027A, 0x826B, 0x026E, 0x0264,
-                     0x8261, 0x0220, 0x8225, 0x822F, 0x022A, 0x823B, 0x023E,
-                     0x0234, 0x8231, 0x8213, 0x0216, 0x021C, 0x8219, 0x0208,
-                     0x820D, 0x8207, 0x0202]
-
-        for j in range(0, data_blk_size):
-            i = ((crc_accum >> 8) ^ data_blk_ptr[j]) & 0xFF
-            crc_accum = ((crc_accum << 8) ^ crc_table[i]) & 0xFFFF
+        # accepts lists of ints as well as bytes, bytearray and memoryview buffers.
+        data = bytes(data_blk_ptr[0: data_blk_size])
+        if crc16_ext is not None:
+            return crc16_ext(data, crc_accum)
+
+        crc_table = CRC_TABLE
+        for byte in data:
+            crc_accum = ((crc_accum << 8) ^ crc_table[((crc_accum >> 8) ^ byte) & 0xFF]) & 0xFFFF
 
         return crc_accum
 
     def addStuffing(self, packet):
         packet_length_in = DXL_MAKEWORD(packet[PKT_LENGTH_L], packet[PKT_LENGTH_H])
-        packet_length_out = packet_length_in
-
-        temp = [0] * TXPACKET_MAX_LEN
-
-        # FF FF FD XX ID LEN_L LEN_H
-        temp[PKT_HEADER0: PKT_HEADER0 + PKT_LENGTH_H + 1] = packet[PKT_HEADER0: PKT_HEADER0 + PKT_LENGTH_H + 1]
 
-        index = PKT_INSTRUCTION
+        # FF FF FD inside INST ... PARAM (except CRC) gets an extra FD. most packets have none and are returned
+        # untouched; otherwise the packet is stuffed in place so the caller's packet object grows with it.
+        body = bytes(packet[PKT_INSTRUCTION: PKT_INSTRUCTION + packet_length_in - 2])
+        if body.find(b'\xFF\xFF\xFD') == -1:
+            return packet
 
-        for i in range(0, packet_length_in - 2):  # except CRC
-            temp[index] = packet[i + PKT_INSTRUCTION]
-            index = index + 1
-            if packet[i + PKT_INSTRUCTION] == 0xFD \
-                    and packet[i + PKT_INSTRUCTION - 1] == 0xFF \
-                    and packet[i + PKT_INSTRUCTION - 2] == 0xFF:
-                # FF FF FD
-                temp[index] = 0xFD
-                index = index + 1
-                packet_length_out = packet_length_out + 1
+        stuffed = body.replace(b'\xFF\xFF\xFD', b'\xFF\xFF\xFD\xFD')
+        packet_length_out = packet_length_in + len(stuffed) - len(body)
 
-        temp[index] = packet[PKT_INSTRUCTION + packet_length_in - 2]
-        temp[index + 1] = packet[PKT_INSTRUCTION + packet_length_in - 1]
-        index = index + 2
-
-        if packet_length_in != packet_length_out:
-            packet = [0] * index
-
-        packet[0: index] = temp[0: index]
+        packet[PKT_INSTRUCTION: PKT_INSTRUCTION + packet_length_in - 2] = stuffed
 
         packet[PKT_LENGTH_L] = DXL_LOBYTE(packet_length_out)
         packet[PKT_LENGTH_H] = DXL_HIBYTE(packet_length_out)
@@ -189,20 +186,16 @@ class Protocol2PacketHandler(object):
 
     def removeStuffing(self, packet):
         packet_length_in = DXL_MAKEWORD(packet[PKT_LENGTH_L], packet[PKT_LENGTH_H])
-        packet_length_out = packet_length_in
-
-        index = PKT_INSTRUCTION
-        for i in range(0, (packet_length_in - 2)):  # except CRC
-            if (packet[i + PKT_INSTRUCTION] == 0xFD) and (packet[i + PKT_INSTRUCTION + 1] == 0xFD) and (
-                    packet[i + PKT_INSTRUCTION - 1] == 0xFF) and (packet[i + PKT_INSTRUCTION - 2] == 0xFF):
-                # FF FF FD FD
-                packet_length_out = packet_length_out - 1
-            else:
-                packet[index] = packet[i + PKT_INSTRUCTION]
-                index += 1
 
-        packet[index] = packet[PKT_INSTRUCTION + packet_length_in - 2]
-        packet[index + 1] = packet[PKT_INSTRUCTION + packet_length_in - 1]
+        # FF FF FD FD inside INST ... PARAM (except CRC) loses its extra FD.
+        body = bytes(packet[PKT_INSTRUCTION: PKT_INSTRUCTION + packet_length_in - 2])
+        if body.find(b'\xFF\xFF\xFD\xFD') == -1:
+            return packet
+
+        unstuffed = body.replace(b'\xFF\xFF\xFD\xFD', b'\xFF\xFF\xFD')
+        packet_length_out = packet_length_in - len(body) + len(unstuffed)
+
+        packet[PKT_INSTRUCTION: PKT_INSTRUCTION + packet_length_in - 2] = unstuffed
 
         packet[PKT_LENGTH_L] = DXL_LOBYTE(packet_length_out)
         packet[PKT_LENGTH_H] = DXL_HIBYTE(packet_length_out)
@@ -210,9 +203,11 @@ class Protocol2PacketHandler(object):
         return packet
 
     def txPacket(self, port, txpacket):
-        if port.is_using:
-            return COMM_PORT_BUSY
-        port.is_using = True
+        # waits while another thread holds the bus for a transaction, and makes the check and set atomic
+        with port.arbiter:
+            if port.is_using:
+                return COMM_PORT_BUSY
+            port.is_using = True
 
         # byte stuffing for header
         self.addStuffing(txpacket)
@@ -237,6 +232,9 @@ class Protocol2PacketHandler(object):
         txpacket[total_packet_length - 2] = DXL_LOBYTE(crc)
         txpacket[total_packet_length - 1] = DXL_HIBYTE(crc)
 
+        if port.instrument is not None:
+            port.instrument.sent(txpacket[PKT_ID], txpacket[PKT_INSTRUCTION], total_packet_length)
+
         # tx packet
         port.clearPort()
         written_packet_length = port.writePort(txpacket)
@@ -247,7 +245,7 @@ class Protocol2PacketHandler(object):
         return COMM_SUCCESS
 
     def rxPacket(self, port):
-        rxpacket = []
+        rxpacket = bytearray()
 
         result = COMM_TX_FAIL
         rx_length = 0
@@ -257,11 +255,12 @@ class Protocol2PacketHandler(object):
             rxpacket.extend(port.readPort(wait_length - rx_length))
             rx_length = len(rxpacket)
             if rx_length >= wait_length:
-                # find packet header
-                for idx in range(0, (rx_length - 3)):
-                    if (rxpacket[idx] == 0xFF) and (rxpacket[idx + 1] == 0xFF) and (rxpacket[idx + 2] == 0xFD) and (
-                            rxpacket[idx + 3] != 0xFD):
-                        break
+                # find packet header (FF FF FD not followed by a stuffed FD)
+                idx = rxpacket.find(b'\xFF\xFF\xFD')
+                while idx != -1 and idx + 3 < rx_length and rxpacket[idx + 3] == 0xFD:
+                    idx = rxpacket.find(b'\xFF\xFF\xFD', idx + 1)
+                if idx == -1:
+                    idx = rx_length - 3  # keep the last bytes, they may be the start of a header
 
                 if idx == 0:
                     if (rxpacket[PKT_RESERVED] != 0x00) or (rxpacket[PKT_ID] > 0xFC) or (
@@ -295,7 +294,8 @@ class Protocol2PacketHandler(object):
                     break
 
                 else:
-                    # remove unnecessary packets
+                    # remove unnecessary packets. deleting from the front of a bytearray does not move the rest of
+                    # the buffer, so resyncing on a noisy line stays linear.
                     del rxpacket[0: idx]
                     rx_length -= idx
 
@@ -316,47 +316,52 @@ class Protocol2PacketHandler(object):
 
     # NOT for BulkRead / SyncRead instruction
     def txRxPacket(self, port, txpacket):
-        rxpacket = None
-        error = 0
-
-        # tx packet
-        result = self.txPacket(port, txpacket)
-        if result != COMM_SUCCESS:
-            return rxpacket, result, error
-
-        # (Instruction == BulkRead or SyncRead) == this function is not available.
-        if txpacket[PKT_INSTRUCTION] == INST_BULK_READ or txpacket[PKT_INSTRUCTION] == INST_SYNC_READ:
-            result = COMM_NOT_AVAILABLE
+        # the whole transaction holds the bus, so other threads queue instead of getting COMM_PORT_BUSY
+        with port.arbiter:
+            rxpacket = None
+            error = 0
+
+            # tx packet
+            result = self.txPacket(port, txpacket)
+            if result != COMM_SUCCESS:
+                return rxpacket, result, error
+
+            # (Instruction == BulkRead or SyncRead) == this function is not available.
+            if txpacket[PKT_INSTRUCTION] == INST_BULK_READ or txpacket[PKT_INSTRUCTION] == INST_SYNC_READ:
+                result = COMM_NOT_AVAILABLE
+
+            # (ID == Broadcast ID) == no need to wait for status packet or not available.
+            # (Instruction == action) == no need to wait for status packet
+            if txpacket[PKT_ID] == BROADCAST_ID or txpacket[PKT_INSTRUCTION] == INST_ACTION:
+                port.is_using = False
+                return rxpacket, result, error
+
+            # set packet timeout
+            if txpacket[PKT_INSTRUCTION] == INST_READ:
+                port.setPacketTimeout(DXL_MAKEWORD(txpacket[PKT_PARAMETER0 + 2], txpacket[PKT_PARAMETER0 + 3]) + 11)
+            else:
+                port.setPacketTimeout(11)
+                # HEADER0 HEADER1 HEADER2 RESERVED ID LENGTH_L LENGTH_H INST ERROR CRC16_L CRC16_H
 
-        # (ID == Broadcast ID) == no need to wait for status packet or not available.
-        # (Instruction == action) == no need to wait for status packet
-        if txpacket[PKT_ID] == BROADCAST_ID or txpacket[PKT_INSTRUCTION] == INST_ACTION:
-            port.is_using = False
-            return rxpacket, result, error
+            # rx packet
+            while True:
+                rxpacket, result = self.rxPacket(port)
+                if result != COMM_SUCCESS or txpacket[PKT_ID] == rxpacket[PKT_ID]:
+                    break
 
-        # set packet timeout
-        if txpacket[PKT_INSTRUCTION] == INST_READ:
-            port.setPacketTimeout(DXL_MAKEWORD(txpacket[PKT_PARAMETER0 + 2], txpacket[PKT_PARAMETER0 + 3]) + 11)
-        else:
-            port.setPacketTimeout(11)
-            # HEADER0 HEADER1 HEADER2 RESERVED ID LENGTH_L LENGTH_H INST ERROR CRC16_L CRC16_H
+            if result == COMM_SUCCESS and txpacket[PKT_ID] == rxpacket[PKT_ID]:
+                error = rxpacket[PKT_ERROR]
 
-        # rx packet
-        while True:
-            rxpacket, result = self.rxPacket(port)
-            if result != COMM_SUCCESS or txpacket[PKT_ID] == rxpacket[PKT_ID]:
-                break
+            if port.instrument is not None:
+                port.instrument.received(txpacket[PKT_ID], len(rxpacket), result, error)
 
-        if result == COMM_SUCCESS and txpacket[PKT_ID] == rxpacket[PKT_ID]:
-            error = rxpacket[PKT_ERROR]
-
-        return rxpacket, result, error
+            return rxpacket, result, error
 
     def ping(self, port, dxl_id):
         model_number = 0
         error = 0
 
-        txpacket = [0] * 10
+        txpacket = bytearray(10)
 
         if dxl_id >= BROADCAST_ID:
             return model_number, COMM_NOT_AVAILABLE, error
@@ -372,16 +377,18 @@ class Protocol2PacketHandler(object):
 
         return model_number, result, error
 
-    def broadcastPing(self, port):
+    def broadcastPing(self, port, max_id=MAX_ID, silence=None):
+        # max_id shortens the reply window to IDs up to it. with silence (ms), listening stops once the bus has been
+        # quiet that long after a reply, instead of always waiting for the whole window.
         data_list = {}
 
         STATUS_LENGTH = 14
 
         rx_length = 0
-        wait_length = STATUS_LENGTH * MAX_ID
+        wait_length = STATUS_LENGTH * max_id
 
-        txpacket = [0] * 10
-        rxpacket = []
+        txpacket = bytearray(10)
+        rxpacket = bytearray()
 
         tx_time_per_byte = (1000.0 / port.getBaudRate()) *10.0;
 
@@ -390,23 +397,31 @@ class Protocol2PacketHandler(object):
         txpacket[PKT_LENGTH_H] = 0
         txpacket[PKT_INSTRUCTION] = INST_PING
 
-        result = self.txPacket(port, txpacket)
-        if result != COMM_SUCCESS:
-            port.is_using = False
-            return data_list, result
-
-        # set rx timeout
-        #port.setPacketTimeout(wait_length * 1)
-        port.setPacketTimeoutMillis((wait_length * tx_time_per_byte) + (3.0 * MAX_ID) + 16.0);
-
-        while True:
-            rxpacket += port.readPort(wait_length - rx_length)
-            rx_length = len(rxpacket)
+        # the whole reply window holds the bus, so other threads queue instead of getting COMM_PORT_BUSY
+        with port.arbiter:
+            result = self.txPacket(port, txpacket)
+            if result != COMM_SUCCESS:
+                port.is_using = False
+                return data_list, result
+
+            # set rx timeout
+            #port.setPacketTimeout(wait_length * 1)
+            port.setPacketTimeoutMillis((wait_length * tx_time_per_byte) + (3.0 * max_id) + 16.0);
+            # the end of the whole reply window, which a silence deadline never goes past
+            window_end = port.getCurrentTime() + port.packet_timeout
+
+            while True:
+                received = port.readPort(wait_length - rx_length)
+                rxpacket += received
+                rx_length = len(rxpacket)
+
+                if port.isPacketTimeout() or rx_length >= wait_length:
+                    break
 
-            if port.isPacketTimeout():  # or rx_length >= wait_length
-                break
+                if received and silence is not None:
+                    port.setPacketTimeoutMillis(min(silence, window_end - port.getCurrentTime()))
 
-        port.is_using = False
+            port.is_using = False
 
         if rx_length == 0:
             return data_list, COMM_RX_TIMEOUT
@@ -416,9 +431,9 @@ class Protocol2PacketHandler(object):
                 return data_list, COMM_RX_CORRUPT
 
             # find packet header
-            for idx in range(0, rx_length - 2):
-                if rxpacket[idx] == 0xFF and rxpacket[idx + 1] == 0xFF and rxpacket[idx + 2] == 0xFD:
-                    break
+            idx = rxpacket.find(b'\xFF\xFF\xFD')
+            if idx == -1:
+                idx = rx_length - 2
 
             if idx == 0:  # found at the beginning of the packet
                 # verify CRC16
@@ -453,7 +468,7 @@ class Protocol2PacketHandler(object):
         return data_list, result
 
     def action(self, port, dxl_id):
-        txpacket = [0] * 10
+        txpacket = bytearray(10)
 
         txpacket[PKT_ID] = dxl_id
         txpacket[PKT_LENGTH_L] = 3
@@ -464,7 +479,7 @@ class Protocol2PacketHandler(object):
         return result
 
     def reboot(self, port, dxl_id):
-        txpacket = [0] * 10
+        txpacket = bytearray(10)
 
         txpacket[PKT_ID] = dxl_id
         txpacket[PKT_LENGTH_L] = 3
@@ -475,7 +490,7 @@ class Protocol2PacketHandler(object):
         return result, error
 
     def clearMultiTurn(self, port, dxl_id):
-        txpacket = [0] * 15
+        txpacket = bytearray(15)
 
         txpacket[PKT_ID] = dxl_id
         txpacket[PKT_LENGTH_L] = 8
@@ -491,7 +506,7 @@ class Protocol2PacketHandler(object):
         return result, error
 
     def factoryReset(self, port, dxl_id, option):
-        txpacket = [0] * 11
+        txpacket = bytearray(11)
 
         txpacket[PKT_ID] = dxl_id
         txpacket[PKT_LENGTH_L] = 4
@@ -503,7 +518,7 @@ class Protocol2PacketHandler(object):
         return result, error
 
     def readTx(self, port, dxl_id, address, length):
-        txpacket = [0] * 14
+        txpacket = bytearray(14)
 
         if dxl_id >= BROADCAST_ID:
             return COMM_NOT_AVAILABLE
@@ -517,20 +532,22 @@ class Protocol2PacketHandler(object):
         txpacket[PKT_PARAMETER0 + 2] = DXL_LOBYTE(length)
         txpacket[PKT_PARAMETER0 + 3] = DXL_HIBYTE(length)
 
-        result = self.txPacket(port, txpacket)
+        # the send holds the bus like txRxPacket, so other threads queue instead of getting COMM_PORT_BUSY
+        with port.arbiter:
+            result = self.txPacket(port, txpacket)
 
-        # set packet timeout
-        if result == COMM_SUCCESS:
-            port.setPacketTimeout(length + 11)
+            # set packet timeout
+            if result == COMM_SUCCESS:
+                port.setPacketTimeout(length + 11)
 
-        return result
+            return result
 
     def readRx(self, port, dxl_id, length):
         result = COMM_TX_FAIL
         error = 0
 
         rxpacket = None
-        data = []
+        data = bytearray()
 
         while True:
             rxpacket, result = self.rxPacket(port)
@@ -541,15 +558,15 @@ class Protocol2PacketHandler(object):
         if result == COMM_SUCCESS and rxpacket[PKT_ID] == dxl_id:
             error = rxpacket[PKT_ERROR]
 
-            data.extend(rxpacket[PKT_PARAMETER0 + 1: PKT_PARAMETER0 + 1 + length])
+            data = rxpacket[PKT_PARAMETER0 + 1: PKT_PARAMETER0 + 1 + length]
 
         return data, result, error
 
     def readTxRx(self, port, dxl_id, address, length):
         error = 0
 
-        txpacket = [0] * 14
-        data = []
+        txpacket = bytearray(14)
+        data = bytearray()
 
         if dxl_id >= BROADCAST_ID:
             return data, COMM_NOT_AVAILABLE, error
@@ -567,7 +584,7 @@ class Protocol2PacketHandler(object):
         if result == COMM_SUCCESS:
             error = rxpacket[PKT_ERROR]
 
-            data.extend(rxpacket[PKT_PARAMETER0 + 1: PKT_PARAMETER0 + 1 + length])
+            data = rxpacket[PKT_PARAMETER0 + 1: PKT_PARAMETER0 + 1 + length]
 
         return data, result, error
 
@@ -613,7 +630,7 @@ class Protocol2PacketHandler(object):
         return data_read, result, error
 
     def writeTxOnly(self, port, dxl_id, address, length, data):
-        txpacket = [0] * (length + 12)
+        txpacket = bytearray(length + 12)
 
         txpacket[PKT_ID] = dxl_id
         txpacket[PKT_LENGTH_L] = DXL_LOBYTE(length + 5)
@@ -624,13 +641,14 @@ class Protocol2PacketHandler(object):
 
         txpacket[PKT_PARAMETER0 + 2: PKT_PARAMETER0 + 2 + length] = data[0: length]
 
-        result = self.txPacket(port, txpacket)
-        port.is_using = False
+        with port.arbiter:
+            result = self.txPacket(port, txpacket)
+            port.is_using = False
 
-        return result
+            return result
 
     def writeTxRx(self, port, dxl_id, address, length, data):
-        txpacket = [0] * (length + 12)
+        txpacket = bytearray(length + 12)
 
         txpacket[PKT_ID] = dxl_id
         txpacket[PKT_LENGTH_L] = DXL_LOBYTE(length + 5)
@@ -675,7 +693,7 @@ class Protocol2PacketHandler(object):
         return self.writeTxRx(port, dxl_id, address, 4, data_write)
 
     def regWriteTxOnly(self, port, dxl_id, address, length, data):
-        txpacket = [0] * (length + 12)
+        txpacket = bytearray(length + 12)
 
         txpacket[PKT_ID] = dxl_id
         txpacket[PKT_LENGTH_L] = DXL_LOBYTE(length + 5)
@@ -686,13 +704,14 @@ class Protocol2PacketHandler(object):
 
         txpacket[PKT_PARAMETER0 + 2: PKT_PARAMETER0 + 2 + length] = data[0: length]
 
-        result = self.txPacket(port, txpacket)
-        port.is_using = False
+        with port.arbiter:
+            result = self.txPacket(port, txpacket)
+            port.is_using = False
 
-        return result
+            return result
 
     def regWriteTxRx(self, port, dxl_id, address, length, data):
-        txpacket = [0] * (length + 12)
+        txpacket = bytearray(length + 12)
 
         txpacket[PKT_ID] = dxl_id
         txpacket[PKT_LENGTH_L] = DXL_LOBYTE(length + 5)
@@ -708,7 +727,7 @@ class Protocol2PacketHandler(object):
         return result, error
 
     def syncReadTx(self, port, start_address, data_length, param, param_length):
-        txpacket = [0] * (param_length + 14)
+        txpacket = bytearray(param_length + 14)
         # 14: HEADER0 HEADER1 HEADER2 RESERVED ID LEN_L LEN_H INST START_ADDR_L START_ADDR_H DATA_LEN_L DATA_LEN_H CRC16_L CRC16_H
 
         txpacket[PKT_ID] = BROADCAST_ID
@@ -724,14 +743,15 @@ class Protocol2PacketHandler(object):
 
         txpacket[PKT_PARAMETER0 + 4: PKT_PARAMETER0 + 4 + param_length] = param[0: param_length]
 
-        result = self.txPacket(port, txpacket)
-        if result == COMM_SUCCESS:
-            port.setPacketTimeout((11 + data_length) * param_length)
+        with port.arbiter:
+            result = self.txPacket(port, txpacket)
+            if result == COMM_SUCCESS:
+                port.setPacketTimeout((11 + data_length) * param_length)
 
-        return result
+            return result
 
     def syncWriteTxOnly(self, port, start_address, data_length, param, param_length):
-        txpacket = [0] * (param_length + 14)
+        txpacket = bytearray(param_length + 14)
         # 14: HEADER0 HEADER1 HEADER2 RESERVED ID LEN_L LEN_H INST START_ADDR_L START_ADDR_H DATA_LEN_L DATA_LEN_H CRC16_L CRC16_H
 
         txpacket[PKT_ID] = BROADCAST_ID
@@ -752,7 +772,7 @@ class Protocol2PacketHandler(object):
         return result
 
     def bulkReadTx(self, port, param, param_length):
-        txpacket = [0] * (param_length + 10)
+        txpacket = bytearray(param_length + 10)
         # 10: HEADER0 HEADER1 HEADER2 RESERVED ID LEN_L LEN_H INST CRC16_L CRC16_H
 
         txpacket[PKT_ID] = BROADCAST_ID
@@ -762,19 +782,20 @@ class Protocol2PacketHandler(object):
 
         txpacket[PKT_PARAMETER0: PKT_PARAMETER0 + param_length] = param[0: param_length]
 
-        result = self.txPacket(port, txpacket)
-        if result == COMM_SUCCESS:
-            wait_length = 0
-            i = 0
-            while i < param_length:
-                wait_length += DXL_MAKEWORD(param[i + 3], param[i + 4]) + 10
-                i += 5
-            port.setPacketTimeout(wait_length)
+        with port.arbiter:
+            result = self.txPacket(port, txpacket)
+            if result == COMM_SUCCESS:
+                wait_length = 0
+                i = 0
+                while i < param_length:
+                    wait_length += DXL_MAKEWORD(param[i + 3], param[i + 4]) + 10
+                    i += 5
+                port.setPacketTimeout(wait_length)
 
-        return result
+            return result
 
     def bulkWriteTxOnly(self, port, param, param_length):
-        txpacket = [0] * (param_length + 10)
+        txpacket = bytearray(param_length + 10)
         # 10: HEADER0 HEADER1 HEADER2 RESERVED ID LEN_L LEN_H INST CRC16_L CRC16_H
 
         txpacket[PKT_ID] = BROADCAST_ID
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2020 University of Georgia Bio-Sensing and Instrumentation Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+from .robotis_def import *
+from . import protocol1_packet_handler as protocol1
+from . import protocol2_packet_handler as protocol2
+
+# minimum status packet lengths
+# protocol 1.0: HEADER0 HEADER1 ID LENGTH ERROR CHKSUM
+# protocol 2.0: HEADER0 HEADER1 HEADER2 RESERVED ID LENGTH_L LENGTH_H INST ERROR CRC16_L CRC16_H
+STATUS_OVERHEAD_1 = 6
+STATUS_OVERHEAD_2 = 11
+
+
+class StatusPacketParser:
+    """Splits a byte stream into status packets.
+
+    feed() takes any chunk of received bytes and returns an iterator of (dxl_id, result, error, data) tuples, one
+    per complete packet found so far. result is COMM_SUCCESS or COMM_RX_CORRUPT when the checksum/CRC does not match.
+    Incomplete packets are kept until the next feed().
+    """
+
+    def __init__(self, ph):
+        self.ph = ph
+        self.buffer = bytearray()
+
+        if ph.getProtocolVersion() == 1.0:
+            self.header = b'\xFF\xFF'
+            self.min_length = STATUS_OVERHEAD_1
+        else:
+            self.header = b'\xFF\xFF\xFD'
+            self.min_length = STATUS_OVERHEAD_2
+
+    def clear(self):
+        del self.buffer[:]
+
+    def feed(self, data):
+        self.buffer += data
+        if self.ph.getProtocolVersion() == 1.0:
+            return self.__parse1()
+        return self.__parse2()
+
+    def __sync(self):
+        # drops everything in front of the next header and returns whether a whole minimum packet is buffered.
+        buffer = self.buffer
+        idx = buffer.find(self.header)
+        if idx == -1:
+            del buffer[0: max(0, len(buffer) - len(self.header) + 1)]
+            return False
+        if idx > 0:
+            del buffer[0: idx]
+        return len(buffer) >= self.min_length
+
+    def __parse1(self):
+        buffer = self.buffer
+        while self.__sync():
+            if (buffer[protocol1.PKT_ID] > 0xFD) or (buffer[protocol1.PKT_LENGTH] > protocol1.RXPACKET_MAX_LEN) or (
+                    buffer[protocol1.PKT_ERROR] > 0x7F):
+                del buffer[0]
+                continue
+
+            total_length = buffer[protocol1.PKT_LENGTH] + protocol1.PKT_LENGTH + 1
+            if len(buffer) < total_length:
+                return
+
+            dxl_id = buffer[protocol1.PKT_ID]
+            if buffer[total_length - 1] == ~sum(buffer[2: total_length - 1]) & 0xFF:
+                data = buffer[protocol1.PKT_PARAMETER0: total_length - 1]
+                error = buffer[protocol1.PKT_ERROR]
+                del buffer[0: total_length]
+                yield dxl_id, COMM_SUCCESS, error, data
+            else:
+                del buffer[0: len(self.header)]
+                yield dxl_id, COMM_RX_CORRUPT, 0, None
+
+    def __parse2(self):
+        buffer = self.buffer
+        while self.__sync():
+            packet_length = DXL_MAKEWORD(buffer[protocol2.PKT_LENGTH_L], buffer[protocol2.PKT_LENGTH_H])
+            if (buffer[protocol2.PKT_RESERVED] != 0x00) or (buffer[protocol2.PKT_ID] > 0xFC) or (
+                    packet_length > protocol2.RXPACKET_MAX_LEN) or (buffer[protocol2.PKT_INSTRUCTION] != 0x55):
+                del buffer[0]
+                continue
+
+            total_length = packet_length + protocol2.PKT_LENGTH_H + 1
+            if len(buffer) < total_length:
+                return
+
+            dxl_id = buffer[protocol2.PKT_ID]
+            crc = DXL_MAKEWORD(buffer[total_length - 2], buffer[total_length - 1])
+            if self.ph.updateCRC(0, buffer, total_length - 2) == crc:
+                packet = self.ph.removeStuffing(buffer[0: total_length])
+                packet_length = DXL_MAKEWORD(packet[protocol2.PKT_LENGTH_L], packet[protocol2.PKT_LENGTH_H])
+                data = packet[protocol2.PKT_PARAMETER0 + 1: protocol2.PKT_LENGTH_H + 1 + packet_length - 2]
+                del buffer[0: total_length]
+                yield dxl_id, COMM_SUCCESS, packet[protocol2.PKT_ERROR], data
+            else:
+                del buffer[0: len(self.header)]
+                yield dxl_id, COMM_RX_CORRUPT, 0, None
+
+
+def readStatusBurst(port, ph, data_lengths):
+    """Receives the status packets of a sync/bulk read in one pass.
+
+    data_lengths is a dictionary of {dxl_id: data_length}. The whole expected burst is requested from the port at
+    once and every packet is routed to its ID, so one missing or corrupt reply does not hide the others. Returns a
+    dictionary of {dxl_id: (data, result, error)} with COMM_RX_TIMEOUT or COMM_RX_CORRUPT for IDs that did not answer
+    correctly before the packet timeout set by the matching Tx call.
+    """
+    parser = StatusPacketParser(ph)
+    overhead = parser.min_length
+
+    wait_length = 0
+    for dxl_id in data_lengths:
+        wait_length += data_lengths[dxl_id] + overhead
+
+    rx_dict = {}
+    corrupt_ids = set()
+    rx_length = 0
+    instrument = port.instrument
+
+    while True:
+        # byte stuffing can make the burst longer than expected, so always ask for at least one more packet.
+        received = port.readPort(max(wait_length - rx_length, overhead))
+        rx_length += len(received)
+
+        for dxl_id, result, error, data in parser.feed(received):
+            if dxl_id not in data_lengths or dxl_id in rx_dict:
+                continue
+            if result == COMM_SUCCESS:
+                rx_dict[dxl_id] = (data[0: data_lengths[dxl_id]], result, error)
+                if instrument is not None:
+                    instrument.received(dxl_id, len(data) + overhead, result, error)
+            else:
+                corrupt_ids.add(dxl_id)
+
+        if len(rx_dict) == len(data_lengths) or port.isPacketTimeout():
+            break
+
+    port.is_using = False
+
+    for dxl_id in data_lengths:
+        if dxl_id not in rx_dict:
+            if dxl_id in corrupt_ids:
+                rx_dict[dxl_id] = (bytearray(), COMM_RX_CORRUPT, 0)
+            else:
+                rx_dict[dxl_id] = (bytearray(), COMM_RX_TIMEOUT, 0)
+            if instrument is not None:
+                instrument.received(dxl_id, 0, rx_dict[dxl_id][1])
+
+    return rx_dict
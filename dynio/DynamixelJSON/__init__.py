@@ -15,3 +15,46 @@
 ################################################################################
 
 # Author: Hunter Halloran (Jyumpp)
+
+import json
+import os
+from functools import lru_cache
+from types import MappingProxyType
+
+MODEL_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+# model numbers answered to a ping, with the JSON file of the model and the control table it uses. 2.0 firmware keeps
+# the protocol 2 control table even when switched to protocol 1.
+MODEL_NUMBERS = {
+    12: ("AX12.json", 1),
+    360: ("MX12.json", 1),
+    29: ("MX28.json", 1),
+    30: ("MX28.json", 2),
+    310: ("MX64.json", 1),
+    311: ("MX64.json", 2),
+    320: ("MX106.json", 1),
+    321: ("MX106.json", 2),
+    1120: ("XM540W270.json", 2),
+}
+
+
+def model_path(file_name):
+    """Returns the path of a motor model JSON file shipped with dynio"""
+    return os.path.join(MODEL_DIRECTORY, file_name)
+
+
+def freeze(value):
+    """Returns a read only copy of parsed JSON, with objects as mapping proxies and arrays as tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType(dict((key, freeze(item)) for key, item in value.items()))
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+@lru_cache(maxsize=None)
+def load_model(json_file):
+    """Returns the config of a motor model JSON file, parsed once per process and shared by every motor"""
+    # motors only read their config, so every motor of a model can hold the same frozen objects.
+    with open(json_file) as fd:
+        return freeze(json.load(fd))
@@ -16,4 +16,11 @@
 
 # Author: Hunter Halloran (Jyumpp)
 
+import dynio.errors as errors
+import dynio.retry as retry
 import dynio.dynamixel_controller as dxl
+import dynio.async_dynamixel_controller as async_dxl
+import dynio.dynamixel_bus_pool as dxl_pool
+import dynio.telemetry as telemetry
+import dynio.bus_planner as bus_planner
+import dynio.virtual_bus as virtual_bus
@@ -0,0 +1,61 @@
+################################################################################
+# Copyright 2020 University of Georgia Bio-Sensing and Instrumentation Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AsyncDynamixelIO:
+    """Creates an awaitable front end for a DynamixelIO"""
+
+    def __init__(self, dxl_io):
+        # the dynamixel sdk packet loops are synchronous, so every bus transaction is queued on one dedicated worker
+        # thread. the event loop never blocks on a serial round trip, and since transactions run strictly one after
+        # another in submission order, concurrent coroutines never find the port busy.
+        self.dxl_io = dxl_io
+        self.__executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dynio-bus")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Stops the bus worker once the queued transactions have finished"""
+        self.__executor.shutdown(wait=False)
+
+    async def run(self, function, *args, **kwargs):
+        """Queues a blocking call that uses the bus, such as any motor method, and returns its result"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.__executor, functools.partial(function, *args, **kwargs))
+
+    async def write_control_table(self, protocol, dxl_id, value, address, size):
+        """Writes a specified value to a given address in the control table"""
+        return await self.run(self.dxl_io.write_control_table, protocol, dxl_id, value, address, size)
+
+    async def read_control_table(self, protocol, dxl_id, address, size):
+        """Returns the held value from a given address in the control table"""
+        return await self.run(self.dxl_io.read_control_table, protocol, dxl_id, address, size)
+
+    async def sync_write_control_table(self, data_name, values):
+        """Writes a value per motor to a control table area of a specific name using a single sync write packet"""
+        return await self.run(self.dxl_io.sync_write_control_table, data_name, values)
+
+    async def read_many(self, motors, fields):
+        """Reads control table areas of specific names from many motors using one group read per protocol"""
+        return await self.run(self.dxl_io.read_many, motors, fields)
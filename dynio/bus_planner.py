@@ -0,0 +1,294 @@
+################################################################################
+# Copyright 2020 University of Georgia Bio-Sensing and Instrumentation Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+import math
+import time
+import warnings
+from dynamixel_sdk import GroupBulkRead, GroupIndexedRead
+from dynamixel_sdk.port_handler import LATENCY_TIMER
+from dynio.control_table import snapshot_type
+
+# fixed bytes of the packets used by group reads and writes, see the dynamixel protocol 1.0 and 2.0 e-manuals.
+# instruction packets: header, id, length, instruction, parameters that do not depend on the motor count, checksum.
+BULK_READ_1 = 7  # + 3 per motor
+READ_1 = 8  # per motor for sequential reads, once for indexed reads
+SYNC_READ_2 = 14  # + 1 per motor
+BULK_READ_2 = 10  # + 5 per motor
+SYNC_WRITE_1 = 8  # + (1 + size) per motor
+SYNC_WRITE_2 = 14  # + (1 + size) per motor
+# status packets, + data length.
+STATUS_1 = 6
+STATUS_2 = 11
+
+
+def span(motor, fields):
+    """Returns the start address and length of the area covering some fields of a motor's control table"""
+    entries = [motor.CONTROL_TABLE[data_name] for data_name in fields]
+    start = min(address for address, _ in entries)
+    return start, max(address + size for address, size in entries) - start
+
+
+def lcm(a, b):
+    return a * b // math.gcd(a, b)
+
+
+class PlannedRead:
+    """Describes a group read of some fields from some motors at a given rate"""
+
+    def __init__(self, motors, fields, rate):
+        self.motors = list(motors)
+        self.fields = tuple(fields)
+        self.rate = rate
+        self.every = 1
+        self.phase = 0
+        # the rate the schedule gives, in Hz, once planned.
+        self.achieved_rate = None
+
+    def cost(self, tx_time_per_byte, latency, return_delay, group_read_type=None):
+        """Returns the predicted bus time in milliseconds, counting one adapter round trip per packet.
+        group_read_type is DynamixelIO.group_read_type, without it every motor is counted as bulk read"""
+        total = 0.0
+        groups = {}
+        for motor in self.motors:
+            group_type = group_read_type(motor) if group_read_type is not None else GroupBulkRead
+            groups.setdefault((motor.PROTOCOL, group_type), []).append(span(motor, self.fields))
+
+        # the same choice of packets as DynamixelIO.read_many.
+        for (protocol, group_type), spans in groups.items():
+            packets = 1
+            if protocol == 2 and len(set(spans)) == 1:
+                tx = SYNC_READ_2 + len(spans)
+            elif protocol == 2:
+                tx = BULK_READ_2 + 5 * len(spans)
+            elif group_type is GroupBulkRead:
+                tx = BULK_READ_1 + 3 * len(spans)
+            elif group_type is GroupIndexedRead and len(set(spans)) == 1:
+                tx = READ_1
+            else:
+                # one READ and one round trip per motor.
+                tx = READ_1 * len(spans)
+                packets = len(spans)
+            rx = sum((STATUS_1 if protocol == 1 else STATUS_2) + length for _, length in spans)
+            total += (tx + rx) * tx_time_per_byte + latency * packets + return_delay * len(spans)
+        return total
+
+    def run(self, dxl_io, results):
+        # a motor can be in several reads of a slot, so each record is kept with its fields until the slot is done.
+        for motor, record in dxl_io.read_many(self.motors, self.fields).items():
+            results.setdefault(motor, []).append((self.fields, record))
+
+
+class PlannedWrite:
+    """Describes a sync write of a field to some motors at a given rate, with values given by a function"""
+
+    def __init__(self, motors, data_name, source, rate):
+        self.motors = list(motors)
+        self.data_name = data_name
+        # merged writes keep every source with the motors it was given for.
+        self.sources = [(self.motors[:], source)]
+        self.rate = rate
+        self.every = 1
+        self.phase = 0
+        self.achieved_rate = None
+
+    def cost(self, tx_time_per_byte, latency, return_delay, group_read_type=None):
+        """Returns the predicted bus time in milliseconds. Sync writes are not answered, so no round trip is counted"""
+        total = 0.0
+        groups = {}
+        for motor in self.motors:
+            address, size = motor.CONTROL_TABLE[self.data_name]
+            groups.setdefault((motor.PROTOCOL, address, size), []).append(motor)
+
+        for (protocol, _, size), motors in groups.items():
+            overhead = SYNC_WRITE_1 if protocol == 1 else SYNC_WRITE_2
+            total += (overhead + (1 + size) * len(motors)) * tx_time_per_byte
+        return total
+
+    def run(self, dxl_io, results):
+        values = {}
+        for motors, source in self.sources:
+            given = source()
+            values.update((motor, given[motor]) for motor in motors if motor in given)
+        dxl_io.sync_write_control_table(self.data_name, values)
+
+
+class BusPlanner:
+    """Creates a cyclic schedule of group reads and writes that fits a bus time budget.
+
+    Transactions are added with a rate in Hz, merged into as few group packets as possible, and spread over the
+    slots of a cycle of `period` milliseconds so that slower transactions share the load evenly. The bus time of each
+    transaction is predicted from the port's time per byte, one adapter round trip per answered packet and the motor
+    return delay. run_cycle() executes the next slot and records its actual duration for report().
+    """
+
+    def __init__(self, dxl_io, period, latency=None, return_delay=0.0, max_slots=1000):
+        self.dxl_io = dxl_io
+        self.period = period
+        # the adapter round trip. LATENCY_TIMER is the ftdi default, most setups lower it to 1 ms for control loops.
+        self.latency = LATENCY_TIMER if latency is None else latency
+        # motor return delay in milliseconds (Return_Delay_Time is in units of 2 us).
+        self.return_delay = return_delay
+        self.max_slots = max_slots
+
+        self.reads = []
+        self.writes = []
+        self.transactions = []
+        self.slots = [[]]
+        self.predicted = [0.0]
+        self.actual = [None]
+        self.cycle = 0
+
+    def check_rate(self, rate):
+        """Raises a ValueError for a rate the schedule cannot give, above one transaction per period"""
+        if rate <= 0 or rate * self.period > 1000.0:
+            raise ValueError("a rate of %g Hz cannot be met with a period of %g ms, the highest is %g Hz"
+                             % (rate, self.period, 1000.0 / self.period))
+
+    def add_read(self, motors, fields, rate):
+        """Schedules reading some fields from some motors at a given rate in Hz"""
+        self.check_rate(rate)
+        self.reads.append(PlannedRead(motors, fields, rate))
+        self.plan()
+
+    def add_write(self, motors, data_name, source, rate):
+        """Schedules writing a field to some motors at a given rate in Hz.
+        source is called when the write is sent and returns a dictionary of {motor: value}"""
+        self.check_rate(rate)
+        self.writes.append(PlannedWrite(motors, data_name, source, rate))
+        self.plan()
+
+    def merge(self):
+        """Returns the transactions with reads and writes of equal rate combined into shared packets"""
+        merged = {}
+        for read in self.reads:
+            # reads of the same fields are sent to every motor at once.
+            key = ("fields", read.rate, read.fields)
+            if key in merged:
+                merged[key].motors += [motor for motor in read.motors if motor not in merged[key].motors]
+            else:
+                merged[key] = PlannedRead(read.motors, read.fields, read.rate)
+
+        reads = {}
+        for read in merged.values():
+            # reads from the same motors are widened to cover every field.
+            key = (read.rate, frozenset(read.motors))
+            if key in reads:
+                reads[key].fields += tuple(data_name for data_name in read.fields if data_name not in reads[key].fields)
+            else:
+                reads[key] = read
+
+        writes = {}
+        for write in self.writes:
+            key = (write.rate, write.data_name)
+            if key in writes:
+                writes[key].motors += [motor for motor in write.motors if motor not in writes[key].motors]
+                writes[key].sources += write.sources
+            else:
+                writes[key] = PlannedWrite(write.motors, write.data_name, None, write.rate)
+                writes[key].sources = write.sources[:]
+
+        return list(reads.values()) + list(writes.values())
+
+    def cost(self, transaction):
+        """Returns the predicted bus time of a transaction in milliseconds"""
+        return transaction.cost(self.dxl_io.port_handler.tx_time_per_byte, self.latency, self.return_delay,
+                                self.dxl_io.group_read_type)
+
+    def plan(self):
+        """Rebuilds the slots from the added reads and writes"""
+        self.transactions = self.merge()
+
+        slot_count = 1
+        for transaction in self.transactions:
+            transaction.every = max(1, int(round(1000.0 / (transaction.rate * self.period))))
+            slot_count = lcm(slot_count, transaction.every)
+        if slot_count > self.max_slots:
+            # a transaction whose spacing does not divide the shorter cycle gets an uneven gap when it wraps.
+            warnings.warn("the cycle of %d slots needed by the rates is cut to max_slots = %d, so some rates are not "
+                          "met exactly, see report()" % (slot_count, self.max_slots), RuntimeWarning)
+            slot_count = self.max_slots
+
+        # the most expensive transactions are placed first, each at the phase that keeps the busiest slot lowest.
+        self.slots = [[] for _ in range(slot_count)]
+        self.predicted = [0.0] * slot_count
+        for transaction in sorted(self.transactions, key=self.cost, reverse=True):
+            cost = self.cost(transaction)
+            best = None
+            for phase in range(min(transaction.every, slot_count)):
+                peak = max(self.predicted[slot] for slot in range(phase, slot_count, transaction.every))
+                if best is None or peak < best[0]:
+                    best = (peak, phase)
+            transaction.phase = best[1]
+            slots = range(transaction.phase, slot_count, transaction.every)
+            for slot in slots:
+                self.slots[slot].append(transaction)
+                self.predicted[slot] += cost
+            transaction.achieved_rate = len(slots) * 1000.0 / (slot_count * self.period)
+
+        self.actual = [None] * slot_count
+        self.cycle = 0
+
+    def fits(self):
+        """Returns whether every slot is predicted to fit in the period"""
+        return max(self.predicted) <= self.period
+
+    def run_cycle(self):
+        """Executes the transactions of the next slot and returns the records read, as a dictionary of
+        {motor: record}"""
+        slot = self.cycle % len(self.slots)
+        self.cycle += 1
+
+        reads = {}
+        start = time.monotonic()
+        for transaction in self.slots[slot]:
+            transaction.run(self.dxl_io, reads)
+        self.actual[slot] = (time.monotonic() - start) * 1000.0
+
+        # the records of a motor read by several transactions are merged into one holding every field read, with
+        # None for fields of a failed read. a motor none of whose reads succeeded gets None.
+        results = {}
+        for motor, parts in reads.items():
+            if len(parts) == 1:
+                results[motor] = parts[0][1]
+                continue
+            fields = []
+            values = {}
+            for part_fields, record in parts:
+                fields += [data_name for data_name in part_fields if data_name not in fields]
+                if record is not None:
+                    values.update(zip(part_fields, record))
+            if values:
+                results[motor] = snapshot_type(tuple(fields))(*[values.get(data_name) for data_name in fields])
+            else:
+                results[motor] = None
+        return results
+
+    def report(self):
+        """Returns a list with, for every slot, the transaction count, the predicted and last measured bus time in
+        milliseconds, the matching share of the period, and the requested and achieved rates of its transactions"""
+        report = []
+        for slot in range(len(self.slots)):
+            actual = self.actual[slot]
+            report.append({
+                "slot": slot,
+                "transactions": len(self.slots[slot]),
+                "predicted": self.predicted[slot],
+                "actual": actual,
+                "predicted_utilization": self.predicted[slot] / self.period,
+                "actual_utilization": None if actual is None else actual / self.period,
+                "rates": [(transaction.rate, transaction.achieved_rate) for transaction in self.slots[slot]],
+            })
+        return report
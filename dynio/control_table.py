@@ -0,0 +1,220 @@
+################################################################################
+# Copyright 2020 University of Georgia Bio-Sensing and Instrumentation Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+import struct
+from collections import namedtuple
+from functools import lru_cache
+from dynio.DynamixelJSON import load_model
+
+# control table areas holding two's complement values. the JSON files only give address and size, so every other
+# area is treated as unsigned.
+SIGNED_REGISTERS = frozenset((
+    # protocol 1 series
+    "Multi_Turn_Offset",
+    # protocol 2 series
+    "Homing_Offset", "Goal_PWM", "Goal_Current", "Goal_Velocity", "Goal_Position", "Present_PWM", "Present_Current",
+    "Present_Velocity", "Present_Position", "Velocity_Trajectory", "Position_Trajectory",
+    # 3mxl
+    "M3XL_OFFSET_MOTOR", "M3XL_OFFSET_JOINT", "M3XL_CURRENT", "M3XL_TORQUE", "M3XL_ANGULAR_RATE", "M3XL_SPEED",
+    "M3XL_DESIRED_CURRENT", "M3XL_DESIRED_ACCEL", "M3XL_DESIRED_SPEED", "M3XL_DESIRED_TORQUE", "M3XL_DESIRED_PWM",
+    "M3XL_DESIRED_LINEAR_SPEED", "M3XL_DESIRED_LINEAR_ACCEL", "M3XL_MOTOR_CURRENT", "M3XL_POSITION_32",
+    "M3XL_DESIRED_POSITION_32", "M3XL_INDEX_POSITION_32",
+))
+
+# names of the status return level area in the bundled control tables. at level 2 every instruction is answered, at
+# level 1 only PING and READ, and at level 0 only PING.
+STATUS_RETURN_LEVEL_NAMES = ("Status_Return_Level", "Return_Status_Level", "M3XL_STATUS_RETURN_LEVEL")
+
+# little endian struct formats per area size, unsigned and signed.
+STRUCT_FORMATS = {1: ("<B", "<b"), 2: ("<H", "<h"), 4: ("<I", "<i")}
+
+
+class Register:
+    """Describes one control table area of a motor model"""
+    __slots__ = ("name", "address", "size", "signed", "mask", "encoder", "decoder")
+
+    def __init__(self, name, address, size, signed=False):
+        self.name = name
+        self.address = address
+        self.size = size
+        self.signed = signed
+        self.mask = (1 << (8 * size)) - 1
+        self.encoder = struct.Struct(STRUCT_FORMATS[size][0])
+        self.decoder = struct.Struct(STRUCT_FORMATS[size][signed])
+
+    def __repr__(self):
+        return "Register(%r, %d, %d, signed=%r)" % (self.name, self.address, self.size, self.signed)
+
+    def encode(self, value):
+        """Returns the bytes written to the area for a value, negative values as two's complement"""
+        return self.encoder.pack(value & self.mask)
+
+    def decode(self, data, offset=0):
+        """Returns the value held in the bytes read from the area"""
+        return self.decoder.unpack_from(data, offset)[0]
+
+
+class Registers:
+    """Holds a Register for every control table area of a motor model, as attributes named after the areas"""
+
+    def __init__(self, control_table):
+        for name, (address, size) in control_table.items():
+            # areas of a size without a struct format, such as 3 byte ones, are only reachable by address.
+            if size in STRUCT_FORMATS:
+                setattr(self, name, Register(name, address, size, name in SIGNED_REGISTERS))
+
+    def __iter__(self):
+        return iter(self.__dict__.values())
+
+    def __contains__(self, name):
+        return name in self.__dict__
+
+    def get(self, name, default=None):
+        """Returns the Register of a control table area of a specific name"""
+        return self.__dict__.get(name, default)
+
+    def status_return_level(self):
+        """Returns the Register of the status return level area, whatever the model calls it"""
+        for name in STATUS_RETURN_LEVEL_NAMES:
+            if name in self.__dict__:
+                return self.__dict__[name]
+        return None
+
+
+@lru_cache(maxsize=None)
+def snapshot_type(fields):
+    """Returns the record type used by DynamixelIO.read_many for a given tuple of control table names"""
+    return namedtuple("Snapshot", fields)
+
+
+@lru_cache(maxsize=None)
+def load_registers(json_file, control_table_protocol=1):
+    """Returns the Registers of a motor model JSON file, built once per process and shared by every motor"""
+    config = load_model(json_file).get("Protocol_%d" % control_table_protocol)
+    return Registers(config.get("Control_Table"))
+
+
+class ControlTableMirror:
+    """Keeps a copy of the control table of a motor to skip the reads and writes it does not need.
+
+    Areas in front of the torque enable register are EEPROM: the motor only changes them when told to, so once known
+    they are read from the copy and writes of the value already held are not sent. RAM areas always go to the bus,
+    but their last known values are kept for peek().
+    """
+
+    def __init__(self, motor):
+        self.motor = motor
+        registers = list(motor.regs)
+        torque_enable = motor.regs.get("Torque_Enable") or motor.regs.get("TORQUE_ENABLE")
+
+        self.eeprom_size = torque_enable.address if torque_enable is not None else 0
+        self.image = bytearray(max(register.address + register.size for register in registers))
+        self.valid = bytearray(len(self.image))
+        self.written = set()
+
+    def is_eeprom(self, register):
+        """Returns whether a Register lies in the EEPROM area"""
+        return register.address + register.size <= self.eeprom_size
+
+    def is_known(self, register):
+        """Returns whether the value of a Register is held in the copy"""
+        return self.valid.find(0, register.address, register.address + register.size) == -1
+
+    def store(self, address, data):
+        """Updates the copy with bytes read from or written to the motor"""
+        self.image[address: address + len(data)] = data
+        self.valid[address: address + len(data)] = b'\x01' * len(data)
+
+    def peek(self, register):
+        """Returns the last known value of a Register without using the bus, or None if it is not known"""
+        if not self.is_known(register):
+            return None
+        return register.decode(self.image, register.address)
+
+    def read_data(self, register):
+        """Returns the bytes of a Register, from the copy for known EEPROM areas and from the bus otherwise.
+        Returns None if the read failed"""
+        if self.is_eeprom(register) and self.is_known(register):
+            return self.image[register.address: register.address + register.size]
+
+        motor = self.motor
+        data = motor.dxl_io.read_data(motor.PROTOCOL, motor.dxl_id, register.address, register.size)
+        if data is not None:
+            self.store(register.address, data)
+            self.written.discard(register.name)
+        return data
+
+    def read(self, register):
+        """Returns the value of a Register, or 0 if the read failed"""
+        data = self.read_data(register)
+        return register.decode(data) if data is not None else 0
+
+    def write(self, register, value):
+        """Writes a value to a Register unless it is an EEPROM area already holding it.
+        Returns whether the motor holds the value afterwards"""
+        data = register.encode(value)
+        if self.is_eeprom(register) and self.is_known(register) and \
+                self.image[register.address: register.address + register.size] == data:
+            return True
+
+        motor = self.motor
+        if not motor.dxl_io.write_data(motor.PROTOCOL, motor.dxl_id, register.address, data):
+            # a rejected or lost write leaves the motor in an unknown state.
+            self.invalidate([register])
+            return False
+        self.written_to(register, data)
+        return True
+
+    def written_to(self, register, data):
+        """Updates the copy with bytes written to a Register by other means, such as a sync write"""
+        self.store(register.address, data)
+        self.written.add(register.name)
+
+    def refresh(self, registers=None):
+        """Reads the given Registers, or the whole EEPROM area in one packet, from the motor into the copy.
+        Returns whether every read succeeded"""
+        motor = self.motor
+        if registers is None:
+            if self.eeprom_size == 0:
+                return True
+            spans = [(0, self.eeprom_size)]
+        else:
+            spans = [(register.address, register.size) for register in registers]
+
+        success = True
+        for address, size in spans:
+            data = motor.dxl_io.read_data(motor.PROTOCOL, motor.dxl_id, address, size)
+            if data is None:
+                self.valid[address: address + size] = bytes(size)
+                success = False
+            else:
+                self.store(address, data)
+
+        if registers is None:
+            self.written.clear()
+        else:
+            self.written.difference_update(register.name for register in registers)
+        return success
+
+    def invalidate(self, registers=None):
+        """Forgets the given Registers, or the whole copy, so they are read from the motor again"""
+        if registers is None:
+            self.valid[:] = bytes(len(self.valid))
+            self.written.clear()
+            return
+        for register in registers:
+            self.valid[register.address: register.address + register.size] = bytes(register.size)
+            self.written.discard(register.name)
@@ -0,0 +1,86 @@
+################################################################################
+# Copyright 2020 University of Georgia Bio-Sensing and Instrumentation Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+from concurrent.futures import ThreadPoolExecutor
+
+
+class DynamixelBusPool:
+    """Creates a handler that drives several DynamixelIO buses in parallel"""
+
+    def __init__(self, dxl_ios):
+        # every bus gets its own worker thread. the serial reads and writes release the GIL, so the buses really do
+        # transfer at the same time and a group operation takes as long as the slowest bus, not the sum of them.
+        self.dxl_ios = list(dxl_ios)
+        self.motors = {}
+        self.__executor = ThreadPoolExecutor(max_workers=max(1, len(self.dxl_ios)), thread_name_prefix="dynio-pool")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Stops the bus workers once the running operations have finished"""
+        self.__executor.shutdown(wait=True)
+
+    def add_motors(self, motors):
+        """Registers motors so they can be addressed by ID, which must be unique across the pool"""
+        for motor in motors:
+            known = self.motors.get(motor.dxl_id)
+            if known is not None and known is not motor:
+                raise (NameError("DuplicateIDError"))
+            self.motors[motor.dxl_id] = motor
+
+    def get_motor(self, dxl_id):
+        """Returns the registered motor with a given ID"""
+        return self.motors[dxl_id]
+
+    def get_io(self, dxl_id):
+        """Returns the DynamixelIO of the bus a registered motor is connected to"""
+        return self.motors[dxl_id].dxl_io
+
+    def run(self, function, dxl_ios=None):
+        """Calls a function with each DynamixelIO in parallel and returns a dictionary of {dxl_io: result}"""
+        if dxl_ios is None:
+            dxl_ios = self.dxl_ios
+        futures = dict((dxl_io, self.__executor.submit(function, dxl_io)) for dxl_io in dxl_ios)
+        return dict((dxl_io, future.result()) for dxl_io, future in futures.items())
+
+    def __split(self, items):
+        # groups motors, or the IDs of registered motors, by the bus they are connected to.
+        buses = {}
+        for item in items:
+            motor = self.motors[item] if isinstance(item, int) else item
+            buses.setdefault(motor.dxl_io, []).append((motor, item))
+        return buses
+
+    def sync_write_control_table(self, data_name, values):
+        """Writes a value per motor to a control table area of a specific name using one sync write per bus.
+        Values are given as a dictionary of {motor or dxl_id: value}"""
+        buses = self.__split(values)
+        self.run(lambda dxl_io: dxl_io.sync_write_control_table(
+            data_name, dict((motor, values[item]) for motor, item in buses[dxl_io])), buses)
+
+    def read_many(self, motors, fields):
+        """Reads control table areas of specific names from many motors using the group reads of all buses in
+        parallel. Returns a merged dictionary of {motor: record}, with None for motors that did not answer"""
+        buses = self.__split(motors)
+        records = {}
+        for bus_records in self.run(lambda dxl_io: dxl_io.read_many([motor for motor, _ in buses[dxl_io]], fields),
+                                    buses).values():
+            records.update(bus_records)
+        return records
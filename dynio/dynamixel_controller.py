@@ -16,22 +16,60 @@
 
 # Author: Hunter Halloran (Jyumpp)
 
+import struct
+import threading
+import time
 from dynamixel_sdk import *
-import json
-import pkg_resources
+from dynamixel_sdk import protocol1_packet_handler as protocol1
+from dynio.DynamixelJSON import load_model, model_path, MODEL_NUMBERS
+from dynio.control_table import load_registers, ControlTableMirror, snapshot_type
+from dynio.telemetry import TelemetryPoller
+from dynio.bus_planner import BusPlanner
+from dynio.errors import ERROR_PRINT, ERROR_RAISE, ERROR_RETURN, ERROR_COUNT, make_error
+from dynio.retry import RETRIED_RESULTS
+from collections import namedtuple, Counter
+from contextlib import contextmanager
 from deprecation import deprecated
 from dataclasses import dataclass
 
+# numpy is optional, ThreeMxlMotor.read_log_array needs it.
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# a motor answering DynamixelIO.scan(), with a ready motor object when its model is known.
+FoundMotor = namedtuple("FoundMotor", ("dxl_id", "protocol", "baud_rate", "model_number", "motor"))
+
 
 class DynamixelIO:
     """Creates communication handler for Dynamixel motors"""
 
     def __init__(self,
                  device_name='/dev/ttyUSB0',
-                 baud_rate=57600):
-        if device_name is None:
+                 baud_rate=57600,
+                 port_handler=None,
+                 error_policy=ERROR_PRINT,
+                 retry_policy=None):
+        self.__sync_writers = {}
+        self.__read_indexes = {}
+        # {(protocol, dxl_id): [status return level, its address, time.monotonic() of the last check or None]}
+        self.__return_levels = {}
+        # seconds between the reads checking that a motor written without replies still has its status return level.
+        self.return_level_check = 1.0
+        # lets read_many use one broadcast READ for a group of 3mxl boards, see group_read_type().
+        self.indexed_reads = False
+        # a RetryPolicy, or None to try every transaction once with the SDK's fixed packet timeout.
+        self.retry_policy = retry_policy
+        # one of the ERROR_* policies, or a function called with each DynamixelError.
+        self.error_policy = error_policy
+        self.error_counts = Counter()
+        self.__errors = threading.local()
+        if device_name is None and port_handler is None:
             return
-        self.port_handler = PortHandler(device_name)
+        # any PortHandler compatible object can be given instead of a device name, such as a VirtualPortHandler.
+        self.port_handler = port_handler if port_handler is not None else PortHandler(device_name)
         self.packet_handler = [PacketHandler(1), PacketHandler(2)]
         if not self.port_handler.setBaudRate(baud_rate):
             raise (NameError("BaudChangeError"))
@@ -39,52 +77,408 @@ class DynamixelIO:
         if not self.port_handler.openPort():
             raise (NameError("PortOpenError"))
 
-    def __check_error(self, protocol, dxl_comm_result, dxl_error):
-        """Prints the error message when not successful"""
-        if dxl_comm_result != COMM_SUCCESS:
-            print("%s" % self.packet_handler[protocol - 1].getTxRxResult(dxl_comm_result))
-        elif dxl_error != 0:
-            print("%s" % self.packet_handler[protocol - 1].getRxPacketError(dxl_error))
+    def __check_error(self, protocol, dxl_comm_result, dxl_error, dxl_id=None, instruction=None, address=None):
+        """Handles a failed transaction according to the error policy"""
+        if dxl_comm_result == COMM_SUCCESS and dxl_error == 0:
+            return
+        error = make_error(protocol, dxl_id, instruction, address, dxl_comm_result, dxl_error)
+        self.__errors.last = error
+
+        policy = getattr(self.__errors, "policy", None) or self.error_policy
+        if policy == ERROR_PRINT:
+            print("%s" % error.message())
+        elif policy == ERROR_RAISE:
+            raise error
+        elif policy == ERROR_COUNT:
+            self.error_counts[(dxl_id, dxl_comm_result, dxl_error)] += 1
+        elif callable(policy):
+            policy(error)
+
+    @contextmanager
+    def error_handling(self, policy):
+        """Sets the error policy of the transactions made by the current thread within a with block"""
+        previous = getattr(self.__errors, "policy", None)
+        self.__errors.policy = policy
+        try:
+            yield
+        finally:
+            self.__errors.policy = previous
+
+    @property
+    def last_error(self):
+        """The DynamixelError of the last failed transaction of the current thread, or None"""
+        return getattr(self.__errors, "last", None)
+
+    def priority(self, level):
+        """Sets the bus priority of the transactions made by the current thread within a with block"""
+        return self.port_handler.arbiter.priority(level)
+
+    def enable_instrumentation(self, instrumentation=None):
+        """Starts recording the traffic of the port and returns the Instrumentation holding it"""
+        if instrumentation is None:
+            instrumentation = Instrumentation(self.port_handler.getPortName())
+        self.port_handler.instrument = instrumentation
+        return instrumentation
+
+    def disable_instrumentation(self):
+        """Stops recording the traffic of the port"""
+        self.port_handler.instrument = None
 
     def write_control_table(self, protocol, dxl_id, value, address, size):
         """Writes a specified value to a given address in the control table"""
-        dxl_comm_result = 0
-        dxl_error = 0
-
-        # the following has to be done inelegantly due to the dynamixel sdk having separate functions per packet size.
-        # future versions of this library may replace usage of the dynamixel sdk to increase efficiency and remove this
-        # bulky situation.
-        if size == 1:
-            dxl_comm_result, dxl_error = self.packet_handler[protocol - 1].write1ByteTxRx(self.port_handler, dxl_id,
-                                                                                          address, value)
-        elif size == 2:
-            dxl_comm_result, dxl_error = self.packet_handler[protocol - 1].write2ByteTxRx(self.port_handler, dxl_id,
-                                                                                          address, value)
-        elif size == 4:
-            dxl_comm_result, dxl_error = self.packet_handler[protocol - 1].write4ByteTxRx(self.port_handler, dxl_id,
-                                                                                          address, value)
-        self.__check_error(protocol, dxl_comm_result, dxl_error)
+        self.write_data(protocol, dxl_id, address, [(value >> (8 * i)) & 0xFF for i in range(size)])
 
     def read_control_table(self, protocol, dxl_id, address, size):
         """Returns the held value from a given address in the control table"""
-        ret_val = 0
-        dxl_comm_result = 0
-        dxl_error = 0
-
-        # the following has to be done inelegantly due to the dynamixel sdk having separate functions per packet size.
-        # future versions of this library may replace usage of the dynamixel sdk to increase efficiency and remove this
-        # bulky situation.
-        if size == 1:
-            ret_val, dxl_comm_result, dxl_error = self.packet_handler[protocol - 1].read1ByteTxRx(self.port_handler,
-                                                                                                  dxl_id, address)
-        elif size == 2:
-            ret_val, dxl_comm_result, dxl_error = self.packet_handler[protocol - 1].read2ByteTxRx(self.port_handler,
-                                                                                                  dxl_id, address)
-        elif size == 4:
-            ret_val, dxl_comm_result, dxl_error = self.packet_handler[protocol - 1].read4ByteTxRx(self.port_handler,
-                                                                                                  dxl_id, address)
-        self.__check_error(protocol, dxl_comm_result, dxl_error)
-        return ret_val
+        data = self.read_data(protocol, dxl_id, address, size)
+        return int.from_bytes(data, "little") if data is not None else 0
+
+    def write_register(self, protocol, dxl_id, register, value):
+        """Writes a value to the control table area described by a Register"""
+        self.write_data(protocol, dxl_id, register.address, register.encode(value))
+
+    def read_register(self, protocol, dxl_id, register):
+        """Returns the value held in the control table area described by a Register"""
+        data = self.read_data(protocol, dxl_id, register.address, register.size)
+        return register.decode(data) if data is not None else 0
+
+    def __transact(self, dxl_id, instruction, failure, function, *args):
+        """Calls a packet handler transaction under the retry policy and returns its results.
+        failure is returned, without using the bus, for an ID the policy considers silent"""
+        policy = self.retry_policy
+        port = self.port_handler
+        if policy is None:
+            return function(port, *args)
+
+        outcome = failure
+        for attempt in range(policy.attempts(dxl_id)):
+            if attempt > 0 and port.instrument is not None:
+                port.instrument.retried(dxl_id, instruction)
+            # the margin is set while holding the bus, so it only applies to this transaction.
+            with port.arbiter:
+                port.packet_timeout_margin = policy.timeout(dxl_id, attempt)
+                start = time.monotonic()
+                outcome = function(port, *args)
+                rtt = (time.monotonic() - start) * 1000.0
+                port.packet_timeout_margin = None
+            policy.observe(dxl_id, outcome[-2], rtt)
+            if outcome[-2] not in RETRIED_RESULTS:
+                return outcome
+        policy.failed(dxl_id)
+        return outcome
+
+    def write_data(self, protocol, dxl_id, address, data):
+        """Writes raw bytes to the control table starting at a given address.
+        Returns whether the motor accepted the write, or only whether it was sent to a motor that does not answer
+        writes"""
+        level = self.__return_level(protocol, dxl_id)
+        if level is not None and level < 2:
+            # the motor sends no status packet, so the write only uses the bus for the instruction packet.
+            dxl_comm_result = self.packet_handler[protocol - 1].writeTxOnly(self.port_handler, dxl_id, address,
+                                                                            len(data), data)
+            self.__check_error(protocol, dxl_comm_result, 0, dxl_id, INST_WRITE, address)
+            return dxl_comm_result == COMM_SUCCESS
+
+        dxl_comm_result, dxl_error = self.__transact(dxl_id, INST_WRITE, (COMM_RX_TIMEOUT, 0),
+                                                     self.packet_handler[protocol - 1].writeTxRx, dxl_id, address,
+                                                     len(data), data)
+        self.__check_error(protocol, dxl_comm_result, dxl_error, dxl_id, INST_WRITE, address)
+        return dxl_comm_result == COMM_SUCCESS and dxl_error == 0
+
+    def read_data(self, protocol, dxl_id, address, size):
+        """Returns the raw bytes of the control table starting at a given address, or None if the read failed"""
+        data, dxl_comm_result, dxl_error = self.__transact(dxl_id, INST_READ, (None, COMM_RX_TIMEOUT, 0),
+                                                           self.packet_handler[protocol - 1].readTxRx, dxl_id,
+                                                           address, size)
+        self.__check_error(protocol, dxl_comm_result, dxl_error, dxl_id, INST_READ, address)
+        return data if dxl_comm_result == COMM_SUCCESS else None
+
+    def __return_level(self, protocol, dxl_id):
+        """Returns the status return level known for an ID, checking it again if the last check is too old"""
+        known = self.__return_levels.get((protocol, dxl_id))
+        if known is None:
+            return None
+        level, address, checked = known
+        now = time.monotonic()
+        if checked is None or (self.return_level_check is not None and now - checked >= self.return_level_check):
+            # the check uses the bus before the write. a motor that was replaced or reset answers writes again, and
+            # a motor that cannot be checked is written with replies until set_status_return_level is called again.
+            known[2] = now
+            if level == 0:
+                answered = self.__answers_ping(protocol, dxl_id)
+            else:
+                data = self.read_data(protocol, dxl_id, address, 1)
+                answered = data is not None and data[0] == level
+            if not answered:
+                del self.__return_levels[(protocol, dxl_id)]
+                return None
+        return level
+
+    def __answers_ping(self, protocol, dxl_id):
+        """Returns whether the motor with an ID answers a PING, which it does at every status return level"""
+        if protocol == 2:
+            return self.ping(protocol, dxl_id) is not None
+        # the SDK's protocol 1 ping also reads the model number, which a motor at level 0 does not answer.
+        txpacket = bytearray(6)
+        txpacket[protocol1.PKT_ID] = dxl_id
+        txpacket[protocol1.PKT_LENGTH] = 2
+        txpacket[protocol1.PKT_INSTRUCTION] = INST_PING
+        _, dxl_comm_result, _ = self.packet_handler[0].txRxPacket(self.port_handler, txpacket)
+        return dxl_comm_result == COMM_SUCCESS
+
+    def set_status_return_level(self, motors, level=1):
+        """Sets the status return level of many motors with one sync write per control table layout.
+        Writes to motors at level 0 or 1 are sent without waiting for a status packet"""
+        values = {}
+        for motor in motors:
+            values.setdefault(motor.regs.status_return_level().name, {})[motor] = level
+        for data_name, group in values.items():
+            self.sync_write_control_table(data_name, group)
+
+        # the sync write is not answered, so each motor is checked before its first write.
+        for motor in motors:
+            register = motor.regs.status_return_level()
+            self.__return_levels.pop((motor.PROTOCOL, motor.dxl_id), None)
+            if level < 2:
+                self.__return_levels[(motor.PROTOCOL, motor.dxl_id)] = [level, register.address, None]
+
+    def verify_status_return_level(self, motors):
+        """Reads the status return level of many motors with group reads and uses it for their next writes.
+        Motors that answer a PING but not the READ are at level 0. Returns a dictionary of {motor: level}, with None
+        for motors that did not answer at all"""
+        levels = {}
+        now = time.monotonic()
+        names = {}
+        for motor in motors:
+            names.setdefault(motor.regs.status_return_level().name, []).append(motor)
+        for data_name, group in names.items():
+            # motors at level 0 never answer the READ, so its failures are only reported once the ping fails too.
+            with self.error_handling(ERROR_RETURN):
+                records = self.read_many(group, [data_name])
+            for motor, record in records.items():
+                register = motor.regs.status_return_level()
+                if record is not None:
+                    level = record[0]
+                elif self.__answers_ping(motor.PROTOCOL, motor.dxl_id):
+                    level = 0
+                else:
+                    level = None
+                    self.__check_error(motor.PROTOCOL, COMM_RX_TIMEOUT, 0, motor.dxl_id, INST_PING)
+
+                levels[motor] = level
+                self.__return_levels.pop((motor.PROTOCOL, motor.dxl_id), None)
+                if level is not None:
+                    motor.mirror.store(register.address, register.encode(level))
+                    if level < 2:
+                        self.__return_levels[(motor.PROTOCOL, motor.dxl_id)] = [level, register.address, now]
+        return levels
+
+    def sync_write_control_table(self, data_name, values):
+        """Writes a value per motor to a control table area of a specific name using a single sync write packet.
+        Values are given as a dictionary of {motor: value}"""
+        # a sync write packet carries one start address and data length, so motors are grouped by protocol and by
+        # where their model keeps the named entry. a fleet of one model costs a single broadcast packet.
+        groups = {}
+        for motor, value in values.items():
+            address, size = motor.CONTROL_TABLE.get(data_name)
+            groups.setdefault((motor.PROTOCOL, address, size), []).append((motor, value))
+
+        for (protocol, address, size), params in groups.items():
+            group_sync_write = self.__sync_writers.get((protocol, address, size))
+            if group_sync_write is None:
+                group_sync_write = GroupSyncWrite(self.port_handler, self.packet_handler[protocol - 1], address, size)
+                self.__sync_writers[(protocol, address, size)] = group_sync_write
+            group_sync_write.clearParam()
+            for motor, value in params:
+                group_sync_write.addParam(motor.dxl_id, [(value >> (8 * i)) & 0xFF for i in range(size)])
+            dxl_comm_result = group_sync_write.txPacket()
+
+            # sync writes are not answered, so a sent packet is taken as written, like mirror.write does.
+            for motor, value in params:
+                register = motor.regs.get(data_name)
+                if register is None:
+                    continue
+                if dxl_comm_result == COMM_SUCCESS:
+                    motor.mirror.written_to(register, register.encode(value))
+                else:
+                    motor.mirror.invalidate([register])
+            self.__check_error(protocol, dxl_comm_result, 0, BROADCAST_ID, INST_SYNC_WRITE, address)
+
+    def group_read_type(self, motor):
+        """Returns the SDK group read class read_many uses for a motor"""
+        if motor.PROTOCOL == 2:
+            return GroupBulkRead
+        # the 3mxl sync read index is not documented beyond its address, so indexed reads are only used when asked.
+        if motor.GROUP_READ is GroupIndexedRead and not self.indexed_reads:
+            return GroupSequentialRead
+        return motor.GROUP_READ
+
+    def __assign_read_indexes(self, motors):
+        """Gives each 3mxl of an indexed read its place in the answer order, writing only the indexes that changed.
+        Boards indexed for an earlier group are given 0 so they stay out of the broadcast READ"""
+        indexes = dict((motor, 0) for motor in self.__read_indexes)
+        indexes.update((motor, index) for index, motor in enumerate(motors, 1))
+        changed = dict((motor, index) for motor, index in indexes.items() if self.__read_indexes.get(motor) != index)
+        if changed:
+            self.sync_write_control_table("M3XL_SYNC_READ_INDEX", changed)
+            self.__read_indexes.update(changed)
+
+    @staticmethod
+    def __decode(motor, data_name, data, offset, size):
+        """Returns the value of a field in bytes read from a motor, signed if its Register is"""
+        register = motor.regs.get(data_name)
+        if register is None:
+            return int.from_bytes(data[offset: offset + size], "little")
+        return register.decode(data, offset)
+
+    def read_many(self, motors, fields):
+        """Reads control table areas of specific names from many motors using one group read per protocol and
+        group read type.
+        Returns a dictionary of {motor: record} where each record holds the fields in the requested order, or None
+        if the motor did not answer"""
+        record_type = snapshot_type(tuple(fields))
+
+        # the span covering every requested field is read from each motor in one go, and decoded afterwards using
+        # the sizes from the motor's own control table.
+        policy = self.retry_policy
+        now = time.monotonic()
+        records = {}
+        failures = []
+        plans = {}
+        for motor in motors:
+            entries = [motor.CONTROL_TABLE.get(data_name) for data_name in fields]
+            start = min(address for address, _ in entries)
+            length = max(address + size for address, size in entries) - start
+            if policy is not None and policy.attempts(motor.dxl_id, now) == 0:
+                # silent motors are left out of the packet rather than costing the whole group a timeout.
+                records[motor] = None
+                failures.append((motor.PROTOCOL, COMM_RX_TIMEOUT, motor.dxl_id, INST_BULK_READ, start))
+                continue
+            plans.setdefault((motor.PROTOCOL, self.group_read_type(motor)), []).append((motor, entries, start, length))
+
+        for (protocol, group_type), plan in plans.items():
+            spans = set((start, length) for _, _, start, length in plan)
+            if group_type is GroupIndexedRead and len(spans) != 1:
+                # the broadcast READ carries one span, other areas are read from each board in turn.
+                group_type = GroupSequentialRead
+            if protocol == 2 and len(spans) == 1:
+                # a protocol 2 sync read is the shortest packet but needs the same span on every motor.
+                start, length = spans.pop()
+                instruction = INST_SYNC_READ
+                group_read = GroupSyncRead(self.port_handler, self.packet_handler[1], start, length)
+                for motor, _, _, _ in plan:
+                    group_read.addParam(motor.dxl_id)
+            else:
+                instruction = INST_BULK_READ if group_type is GroupBulkRead else INST_READ
+                if group_type is GroupIndexedRead:
+                    self.__assign_read_indexes([motor for motor, _, _, _ in plan])
+                group_read = group_type(self.port_handler, self.packet_handler[protocol - 1])
+                for motor, _, start, length in plan:
+                    group_read.addParam(motor.dxl_id, start, length)
+            if policy is None:
+                result = group_read.txRxPacket()
+            else:
+                # a group read is not retried, the next call is. its timeout fits the slowest motor in it.
+                margins = [policy.timeout(motor.dxl_id) for motor, _, _, _ in plan]
+                with self.port_handler.arbiter:
+                    self.port_handler.packet_timeout_margin = None if None in margins else max(margins)
+                    result = group_read.txRxPacket()
+                    self.port_handler.packet_timeout_margin = None
+                for motor, _, _, _ in plan:
+                    motor_result = group_read.rx_result.get(motor.dxl_id, result)
+                    policy.observe(motor.dxl_id, motor_result)
+                    if motor_result in RETRIED_RESULTS:
+                        policy.failed(motor.dxl_id)
+
+            for motor, entries, start, length in plan:
+                if group_read.isAvailable(motor.dxl_id, start, length):
+                    # the bytes read from start onwards. the bulk read types keep them with their span.
+                    data = group_read.data_dict[motor.dxl_id]
+                    if instruction != INST_SYNC_READ:
+                        data = data[PARAM_NUM_DATA]
+                    records[motor] = record_type(*[self.__decode(motor, data_name, data, address - start, size)
+                                                   for data_name, (address, size) in zip(fields, entries)])
+                else:
+                    records[motor] = None
+                    failures.append((protocol, group_read.rx_result.get(motor.dxl_id, result), motor.dxl_id,
+                                     instruction, start))
+
+        # errors are handled once every record is in, so a raising policy does not lose the other motors' data.
+        for protocol, result, dxl_id, instruction, start in failures:
+            self.__check_error(protocol, result, 0, dxl_id, instruction, start)
+        return records
+
+    def ping(self, protocol, dxl_id, timeout=None):
+        """Returns the model number of the motor with an ID, or None if it did not answer.
+        timeout replaces the SDK's packet timeout margin, in milliseconds"""
+        port = self.port_handler
+        with port.arbiter:
+            port.packet_timeout_margin = timeout
+            model_number, dxl_comm_result, _ = self.packet_handler[protocol - 1].ping(port, dxl_id)
+            port.packet_timeout_margin = None
+        return model_number if dxl_comm_result == COMM_SUCCESS else None
+
+    def scan(self, protocols=(1, 2), baud_rates=None, max_id=MAX_ID, timeout=None, silence=None, models=None):
+        """Finds the motors on the bus and returns a list of FoundMotor, with a motor object for every known model.
+
+        Protocol 2 uses one broadcast ping, which can stop listening after `silence` milliseconds without a reply.
+        Protocol 1 has no broadcast ping, so IDs up to max_id are pinged one by one, each waiting `timeout`
+        milliseconds on top of the reply time (the SDK margin of LATENCY_TIMER * 2 + 2 ms by default). Every baud rate
+        of baud_rates is tried in turn, then the port goes back to its own. models adds {model_number: (json_file,
+        control_table_protocol)} entries to MODEL_NUMBERS, e.g. for the 3mxl.
+        """
+        known = dict(MODEL_NUMBERS)
+        if models is not None:
+            known.update(models)
+        port = self.port_handler
+        original_baud_rate = port.getBaudRate()
+
+        found = []
+        for baud_rate in (baud_rates or [original_baud_rate]):
+            if baud_rate != port.getBaudRate() and not port.setBaudRate(baud_rate):
+                raise (NameError("BaudChangeError"))
+
+            for protocol in protocols:
+                if protocol == 2:
+                    data_list, _ = self.packet_handler[1].broadcastPing(port, max_id, silence)
+                    answers = [(dxl_id, data_list[dxl_id][0]) for dxl_id in sorted(data_list)]
+                else:
+                    answers = []
+                    for dxl_id in range(max_id + 1):
+                        model_number = self.ping(protocol, dxl_id, timeout)
+                        if model_number is not None:
+                            answers.append((dxl_id, model_number))
+
+                for dxl_id, model_number in answers:
+                    motor = None
+                    if model_number in known:
+                        json_file, control_table_protocol = known[model_number]
+                        if json_file == "3mxl.json":
+                            motor = self.new_three_mxl_motor(dxl_id)
+                        else:
+                            motor = DynamixelMotor(dxl_id, self, model_path(json_file),
+                                                   protocol=protocol, control_table_protocol=control_table_protocol)
+                    found.append(FoundMotor(dxl_id, protocol, baud_rate, model_number, motor))
+
+        if port.getBaudRate() != original_baud_rate:
+            port.setBaudRate(original_baud_rate)
+        return found
+
+    def read_states(self, motors):
+        """Reads the feedback block of many 3mxl motors with one group read.
+        Returns a dictionary of {motor: ThreeMxlState}, with None for motors that did not answer"""
+        states = {}
+        for motor, record in self.read_many(motors, THREE_MXL_STATE_FIELDS).items():
+            states[motor] = None if record is None else ThreeMxlState(*record)
+        return states
+
+    def new_telemetry_poller(self, motors, rates, history=1024):
+        """Returns a new TelemetryPoller sampling control table areas of many motors at given rates"""
+        return TelemetryPoller(self, motors, rates, history)
+
+    def new_bus_planner(self, period, latency=None, return_delay=0.0):
+        """Returns a new BusPlanner scheduling group reads and writes in cycles of a given period in milliseconds"""
+        return BusPlanner(self, period, latency, return_delay)
 
     def new_motor(self, dxl_id, json_file, protocol=2, control_table_protocol=None):
         """Returns a new DynamixelMotor object of a given protocol with a given control table"""
@@ -92,35 +486,29 @@ class DynamixelIO:
 
     def new_three_mxl_motor(self, dxl_id):
         """Returns a new ThreeMxlMotor object of a given protocol with a given control table"""
-        return ThreeMxlMotor(dxl_id, self,
-                             pkg_resources.resource_filename(__name__, "DynamixelJSON/3mxl.json"))
+        return ThreeMxlMotor(dxl_id, self, model_path("3mxl.json"))
 
     def new_ax12(self, dxl_id):
         """Returns a new DynamixelMotor object for an AX12"""
-        return DynamixelMotor(dxl_id, self,
-                              pkg_resources.resource_filename(__name__, "DynamixelJSON/AX12.json"))
+        return DynamixelMotor(dxl_id, self, model_path("AX12.json"))
 
     def new_mx12(self, dxl_id):
         """Returns a new DynamixelMotor object for an MX12"""
-        return DynamixelMotor(dxl_id, self,
-                              pkg_resources.resource_filename(__name__, "DynamixelJSON/MX12.json"))
+        return DynamixelMotor(dxl_id, self, model_path("MX12.json"))
 
     def new_mx28(self, dxl_id, protocol=1, control_table_protocol=None):
         """Returns a new DynamixelMotor object for an MX28"""
-        return DynamixelMotor(dxl_id, self,
-                              pkg_resources.resource_filename(__name__, "DynamixelJSON/MX28.json"),
+        return DynamixelMotor(dxl_id, self, model_path("MX28.json"),
                               protocol=protocol, control_table_protocol=control_table_protocol)
 
     def new_mx64(self, dxl_id, protocol=1, control_table_protocol=None):
         """Returns a new DynamixelMotor object for an MX64"""
-        return DynamixelMotor(dxl_id, self,
-                              pkg_resources.resource_filename(__name__, "DynamixelJSON/MX64.json"),
+        return DynamixelMotor(dxl_id, self, model_path("MX64.json"),
                               protocol=protocol, control_table_protocol=control_table_protocol)
 
     def new_mx106(self, dxl_id, protocol=1, control_table_protocol=None):
         """Returns a new DynamixelMotor object for an MX106"""
-        return DynamixelMotor(dxl_id, self,
-                              pkg_resources.resource_filename(__name__, "DynamixelJSON/MX106.json"),
+        return DynamixelMotor(dxl_id, self, model_path("MX106.json"),
                               protocol=protocol, control_table_protocol=control_table_protocol)
 
     # the following functions are deprecated and will be removed in version 1.0 release. They have been restructured
@@ -131,22 +519,19 @@ class DynamixelIO:
     @deprecated('0.8', '1.0', details="Use new_ax12() instead")
     def new_ax12_1(self, dxl_id):
         """Returns a new DynamixelMotor object for an AX12"""
-        return DynamixelMotor(dxl_id, self,
-                              pkg_resources.resource_filename(__name__, "DynamixelJSON/AX12.json"))
+        return DynamixelMotor(dxl_id, self, model_path("AX12.json"))
 
     # protocol 2 MX motors all use the same control table and could be initialized with the same control table layout,
     # but this decreases readability and should be called with the specific motor being used instead.
     @deprecated('0.8', '1.0', details="Use the specific new motor function instead")
     def new_mx_2(self, dxl_id):
         """Returns a new DynamixelMotor object of a given protocol for an MX series"""
-        return DynamixelMotor(dxl_id, self,
-                              pkg_resources.resource_filename(__name__, "DynamixelJSON/MX64.json"), 2)
+        return DynamixelMotor(dxl_id, self, model_path("MX64.json"), 2)
 
     @deprecated('0.8', '1.0', details="Use new_mx12() instead")
     def new_mx12_1(self, dxl_id):
         """Returns a new DynamixelMotor object for an MX12"""
-        return DynamixelMotor(dxl_id, self,
-                              pkg_resources.resource_filename(__name__, "DynamixelJSON/MX12.json"))
+        return DynamixelMotor(dxl_id, self, model_path("MX12.json"))
 
     @deprecated('0.8', '1.0', details="Use new_mx28() instead")
     def new_mx28_1(self, dxl_id):
@@ -156,14 +541,12 @@ class DynamixelIO:
     @deprecated('0.8', '1.0', details="Use new_mx64() instead")
     def new_mx64_1(self, dxl_id):
         """Returns a new DynamixelMotor object for an MX64"""
-        return DynamixelMotor(dxl_id, self,
-                              pkg_resources.resource_filename(__name__, "DynamixelJSON/MX64.json"))
+        return DynamixelMotor(dxl_id, self, model_path("MX64.json"))
 
     @deprecated('0.8', '1.0', details="Use new_mx106() instead")
     def new_mx106_1(self, dxl_id):
         """Returns a new DynamixelMotor object for an MX106"""
-        return DynamixelMotor(dxl_id, self,
-                              pkg_resources.resource_filename(__name__, "DynamixelJSON/MX106.json"))
+        return DynamixelMotor(dxl_id, self, model_path("MX106.json"))
 
 
 class DynamixelMotor:
@@ -178,9 +561,7 @@ class DynamixelMotor:
             control_table_protocol = protocol
 
         # loads the JSON config file and gathers the appropriate control table.
-        fd = open(json_file)
-        config = json.load(fd)
-        fd.close()
+        config = load_model(json_file)
         if control_table_protocol == 1:
             config = config.get("Protocol_1")
         else:
@@ -192,19 +573,39 @@ class DynamixelMotor:
         self.dxl_io = dxl_io
         self.PROTOCOL = protocol
         self.CONTROL_TABLE = config.get("Control_Table")
+        self.regs = load_registers(json_file, control_table_protocol)
+        self.mirror = ControlTableMirror(self)
         self.min_position = config.get("Values").get("Min_Position")
         self.max_position = config.get("Values").get("Max_Position")
         self.max_angle = config.get("Values").get("Max_Angle")
+        # protocol 1 motors without bulk read, such as the AX series, are read one after another by read_many.
+        self.GROUP_READ = GroupBulkRead if protocol == 2 or config.get("Values").get("Bulk_Read") else \
+            GroupSequentialRead
 
     def write_control_table(self, data_name, value):
         """Writes a value to a control table area of a specific name"""
-        self.dxl_io.write_control_table(self.PROTOCOL, self.dxl_id, value, self.CONTROL_TABLE.get(data_name)[0],
-                                        self.CONTROL_TABLE.get(data_name)[1])
+        self.mirror.write(getattr(self.regs, data_name), value)
 
     def read_control_table(self, data_name):
         """Reads the value from a control table area of a specific name"""
-        return self.dxl_io.read_control_table(self.PROTOCOL, self.dxl_id, self.CONTROL_TABLE.get(data_name)[0],
-                                              self.CONTROL_TABLE.get(data_name)[1])
+        data = self.mirror.read_data(getattr(self.regs, data_name))
+        return int.from_bytes(data, "little") if data is not None else 0
+
+    def write_register(self, register, value):
+        """Writes a value to a control table area given by a Register from regs, such as regs.Goal_Position"""
+        self.mirror.write(register, value)
+
+    def read_register(self, register):
+        """Reads the value from a control table area given by a Register from regs, such as regs.Present_Position"""
+        return self.mirror.read(register)
+
+    def refresh(self, data_names=None):
+        """Reads the given control table areas, or the whole EEPROM area, from the motor into its mirror"""
+        return self.mirror.refresh(None if data_names is None else [getattr(self.regs, name) for name in data_names])
+
+    def invalidate(self, data_names=None):
+        """Forgets the mirrored values of the given control table areas, or of all of them"""
+        self.mirror.invalidate(None if data_names is None else [getattr(self.regs, name) for name in data_names])
 
     def set_velocity_mode(self, goal_current=None):
         """Sets the motor to run in velocity (wheel) mode and sets the goal current if provided"""
@@ -268,6 +669,7 @@ class DynamixelMotor:
                 velocity += 1024
             self.write_control_table("Moving_Speed", velocity)
         elif self.CONTROL_TABLE_PROTOCOL == 2:
+            # operating mode is an EEPROM area, so only the first call reads it from the motor.
             if self.read_control_table("Operating_Mode") == 1:
                 self.write_control_table("Goal_Velocity", velocity)
             else:
@@ -319,7 +721,39 @@ class DynamixelMotor:
 
     def torque_disable(self):
         """Disables motor torque"""
-        self.write_control_table("Torque_Enable", 0)
+        with self.dxl_io.priority(BUS_PRIORITY_SAFETY):
+            self.write_control_table("Torque_Enable", 0)
+
+
+# the 3mxl feedback block, M3XL_VOLTAGE to M3XL_SPEED, as little endian fields in control table order.
+THREE_MXL_STATE_FIELDS = ("M3XL_VOLTAGE", "M3XL_CURRENT", "M3XL_TORQUE", "M3XL_ANGLE", "M3XL_ANGULAR_RATE",
+                          "M3XL_POSITION_32", "M3XL_SPEED")
+THREE_MXL_STATE = struct.Struct("<HhhHhih")
+
+
+# the 3mxl data logger keeps 500 samples, downloaded in blocks of 5. see scripts/3mxlControlTable.h.
+THREE_MXL_LOG_SAMPLE = struct.Struct("<Hfffff")
+THREE_MXL_LOG_SAMPLES_PER_BLOCK = 5
+THREE_MXL_LOG_BLOCKS = 100
+ThreeMxlLogSample = namedtuple("ThreeMxlLogSample", ("sample_time", "pwm_duty_cycle", "motor_current", "bus_voltage",
+                                                     "desired_value", "actual_value"))
+
+
+@dataclass
+class ThreeMxlState:
+    """Holds the feedback block of a 3mxl, in the motor's own units"""
+    voltage: int  # 10 mV
+    current: int  # 10 mA
+    torque: int  # mNm
+    angle: int  # mrad
+    angular_rate: int  # 10 mrad/s
+    position: int  # mm, 32 bit
+    speed: int  # 0.1 mm/s
+
+    @classmethod
+    def decode(cls, data):
+        """Returns the state held in the bytes read from M3XL_VOLTAGE onwards"""
+        return cls(*THREE_MXL_STATE.unpack_from(data))
 
 
 class ThreeMxlMotor:
@@ -328,27 +762,43 @@ class ThreeMxlMotor:
     def __init__(self, dxl_id, dxl_io, json_file):
         """Initializes a new DynamixelMotor object"""
         # loads the JSON config file and gathers the appropriate control table.
-        fd = open(json_file)
-        config = json.load(fd)
-        fd.close()
-        config = config.get("Protocol_1")
+        config = load_model(json_file).get("Protocol_1")
 
         # sets the motor object values based on inputs or JSON options.
         self.CONTROL_TABLE_PROTOCOL = 1
         self.dxl_id = dxl_id
         self.dxl_io = dxl_io
         self.PROTOCOL = 1
+        # boards answer a broadcast READ in the order set in M3XL_SYNC_READ_INDEX, see DynamixelIO.indexed_reads.
+        self.GROUP_READ = GroupIndexedRead
         self.CONTROL_TABLE = config.get("Control_Table")
+        self.regs = load_registers(json_file, 1)
+        self.mirror = ControlTableMirror(self)
 
     def write_control_table(self, data_name, value):
         """Writes a value to a control table area of a specific name"""
-        self.dxl_io.write_control_table(self.PROTOCOL, self.dxl_id, value, self.CONTROL_TABLE.get(data_name)[0],
-                                        self.CONTROL_TABLE.get(data_name)[1])
+        self.mirror.write(getattr(self.regs, data_name), value)
 
     def read_control_table(self, data_name):
         """Reads the value from a control table area of a specific name"""
-        return self.dxl_io.read_control_table(self.PROTOCOL, self.dxl_id, self.CONTROL_TABLE.get(data_name)[0],
-                                              self.CONTROL_TABLE.get(data_name)[1])
+        data = self.mirror.read_data(getattr(self.regs, data_name))
+        return int.from_bytes(data, "little") if data is not None else 0
+
+    def write_register(self, register, value):
+        """Writes a value to a control table area given by a Register from regs, such as regs.Goal_Position"""
+        self.mirror.write(register, value)
+
+    def read_register(self, register):
+        """Reads the value from a control table area given by a Register from regs, such as regs.Present_Position"""
+        return self.mirror.read(register)
+
+    def refresh(self, data_names=None):
+        """Reads the given control table areas, or the whole EEPROM area, from the motor into its mirror"""
+        return self.mirror.refresh(None if data_names is None else [getattr(self.regs, name) for name in data_names])
+
+    def invalidate(self, data_names=None):
+        """Forgets the mirrored values of the given control table areas, or of all of them"""
+        self.mirror.invalidate(None if data_names is None else [getattr(self.regs, name) for name in data_names])
 
     def set_mode_position(self):
         self.write_control_table("M3XL_CONTROL_MODE", 0)
@@ -378,4 +828,58 @@ class ThreeMxlMotor:
         self.write_control_table("M3XL_DESIRED_LINEAR_ACCEL", acceleration)
 
     def get_pos(self):
-        return self.read_control_table("M3XL_ANGLE_L")
+        return self.read_control_table("M3XL_ANGLE")
+
+    def start_logger(self, interval=1):
+        """Starts the on-board data logger, sampling every interval milliseconds into its 500 sample buffer"""
+        self.write_control_table("M3XL_LOG_DATA_INTERVAL", interval)
+        self.write_control_table("M3XL_ENABLE_DATA_LOGGER", 1)
+
+    def stop_logger(self):
+        self.write_control_table("M3XL_ENABLE_DATA_LOGGER", 0)
+
+    def read_log_blocks(self, blocks=THREE_MXL_LOG_BLOCKS):
+        """Yields the raw blocks of the data logger, each downloaded only when the previous one has been consumed.
+        Stops early if a block cannot be read"""
+        address = self.regs.M3XL_DATA_LOGGER.address
+        size = THREE_MXL_LOG_SAMPLE.size * THREE_MXL_LOG_SAMPLES_PER_BLOCK
+        for block in range(1, blocks + 1):
+            # writing a block number selects the block, reading from the same address returns it. the mirror is
+            # bypassed, the block is not a copy of the areas that follow the address.
+            if not self.dxl_io.write_data(self.PROTOCOL, self.dxl_id, address, bytes((block,))):
+                return
+            data = self.dxl_io.read_data(self.PROTOCOL, self.dxl_id, address, size)
+            if data is None:
+                return
+            yield data
+
+    def read_log(self, blocks=THREE_MXL_LOG_BLOCKS):
+        """Yields the samples of the data logger as ThreeMxlLogSample, downloading them lazily one block at a time"""
+        for data in self.read_log_blocks(blocks):
+            for sample in THREE_MXL_LOG_SAMPLE.iter_unpack(data):
+                yield ThreeMxlLogSample(*sample)
+
+    def read_log_array(self, blocks=THREE_MXL_LOG_BLOCKS):
+        """Returns the samples of the data logger as a numpy structured array with the ThreeMxlLogSample fields"""
+        if numpy is None:
+            raise ImportError("read_log_array needs numpy")
+        dtype = numpy.dtype([("sample_time", "<u2")] + [(name, "<f4") for name in ThreeMxlLogSample._fields[1:]])
+        return numpy.frombuffer(b"".join(self.read_log_blocks(blocks)), dtype=dtype)
+
+    def set_position_32(self, position):
+        """Sets the 32 bit linear goal position in mm, writing all four bytes in one packet"""
+        self.write_register(self.regs.M3XL_DESIRED_POSITION_32, position)
+
+    def get_position_32(self):
+        """Returns the 32 bit linear position in mm, read in one packet"""
+        return self.read_register(self.regs.M3XL_POSITION_32)
+
+    def read_state(self):
+        """Reads voltage, current, torque, angle, angular rate, position and speed in one packet.
+        Returns a ThreeMxlState, or None if the read failed"""
+        start = self.regs.M3XL_VOLTAGE.address
+        data = self.dxl_io.read_data(self.PROTOCOL, self.dxl_id, start, THREE_MXL_STATE.size)
+        if data is None:
+            return None
+        self.mirror.store(start, data)
+        return ThreeMxlState.decode(data)
@@ -0,0 +1,80 @@
+################################################################################
+# Copyright 2020 University of Georgia Bio-Sensing and Instrumentation Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+
+from dynamixel_sdk import *
+
+# what DynamixelIO does with a failed transaction
+ERROR_PRINT = "print"  # prints the SDK message, as dynio always did (default)
+ERROR_RAISE = "raise"  # raises the DynamixelError
+ERROR_RETURN = "return"  # only keeps it as DynamixelIO.last_error, for the caller to inspect
+ERROR_COUNT = "count"  # keeps it as last_error and counts it in DynamixelIO.error_counts
+
+
+class DynamixelError(Exception):
+    """Describes a failed transaction with the protocol, ID, instruction and start address of the instruction packet,
+    the COMM_* result of the exchange and the error bits of the status packet.
+    The message is only formatted when the error is printed"""
+
+    def __init__(self, protocol, dxl_id, instruction, address, result, error=0):
+        Exception.__init__(self, protocol, dxl_id, instruction, address, result, error)
+        self.protocol = protocol
+        self.dxl_id = dxl_id
+        self.instruction = instruction
+        self.address = address
+        self.result = result
+        self.error = error
+
+    def message(self):
+        """Returns the message the SDK gives for the result or error bits"""
+        packet_handler = PacketHandler(self.protocol)
+        if self.result != COMM_SUCCESS:
+            return packet_handler.getTxRxResult(self.result)
+        return packet_handler.getRxPacketError(self.error)
+
+    def __str__(self):
+        return "%s (protocol %d, ID %s, instruction %s, address %s)" % (
+            self.message(), self.protocol, self.dxl_id, INSTRUCTION_NAMES.get(self.instruction, self.instruction),
+            self.address)
+
+
+class DynamixelCommError(DynamixelError):
+    """No valid status packet was exchanged"""
+
+
+class DynamixelTimeoutError(DynamixelCommError):
+    """The motor did not answer before the packet timeout"""
+
+
+class DynamixelCorruptError(DynamixelCommError):
+    """The status packet had a bad header, length or checksum"""
+
+
+class DynamixelHardwareError(DynamixelError):
+    """The motor answered with error bits set, such as overload or overheating"""
+
+
+def make_error(protocol, dxl_id, instruction, address, result, error=0):
+    """Returns a DynamixelError of the type matching a result and error bits"""
+    if result == COMM_RX_TIMEOUT:
+        error_type = DynamixelTimeoutError
+    elif result == COMM_RX_CORRUPT:
+        error_type = DynamixelCorruptError
+    elif result != COMM_SUCCESS:
+        error_type = DynamixelCommError
+    else:
+        error_type = DynamixelHardwareError
+    return error_type(protocol, dxl_id, instruction, address, result, error)
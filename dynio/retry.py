@@ -0,0 +1,122 @@
+################################################################################
+# Copyright 2020 University of Georgia Bio-Sensing and Instrumentation Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+
+import time
+from dynamixel_sdk import *
+
+# results worth sending the instruction again for. error bits in a status packet are the motor's real answer.
+RETRIED_RESULTS = (COMM_RX_TIMEOUT, COMM_RX_CORRUPT)
+
+
+class MotorLink:
+    """Holds what a RetryPolicy has learned about the replies of one ID"""
+    __slots__ = ("srtt", "rttvar", "failures", "silent", "next_probe")
+
+    def __init__(self):
+        self.srtt = None
+        self.rttvar = 0.0
+        self.failures = 0
+        self.silent = False
+        self.next_probe = 0.0
+
+
+class RetryPolicy:
+    """Decides how often and how long DynamixelIO waits for each ID.
+
+    A transaction that times out or comes back corrupt is sent again up to `retries` times. The packet timeout of an
+    ID is learned from its observed round trips, as a smoothed mean plus four mean deviations (the TCP retransmission
+    timer of RFC 6298), kept between min_timeout and max_timeout milliseconds and doubled on every retry. Until an ID
+    has answered, the fixed LATENCY_TIMER * 2 + 2 ms margin of the SDK is used.
+
+    After silent_after failed transactions in a row, retries included, an ID is considered silent: its transactions
+    fail at once with COMM_RX_TIMEOUT without using the bus, except one single attempt every probe_interval seconds
+    that brings it back when it answers.
+    """
+
+    ALPHA = 1.0 / 8.0
+    BETA = 1.0 / 4.0
+
+    def __init__(self, retries=2, adaptive=True, min_timeout=2.0, max_timeout=None, silent_after=3,
+                 probe_interval=1.0):
+        self.retries = retries
+        self.adaptive = adaptive
+        self.min_timeout = min_timeout
+        self.max_timeout = (LATENCY_TIMER * 2.0) + 2.0 if max_timeout is None else max_timeout
+        self.silent_after = silent_after
+        self.probe_interval = probe_interval
+        self.links = {}
+
+    def link(self, dxl_id):
+        """Returns the MotorLink of an ID"""
+        link = self.links.get(dxl_id)
+        if link is None:
+            link = self.links.setdefault(dxl_id, MotorLink())
+        return link
+
+    def attempts(self, dxl_id, now=None):
+        """Returns how many times a transaction with an ID may be tried, 0 when the ID is silent and not due a probe"""
+        link = self.link(dxl_id)
+        if not link.silent:
+            return 1 + self.retries
+        if now is None:
+            now = time.monotonic()
+        if now < link.next_probe:
+            return 0
+        link.next_probe = now + self.probe_interval
+        return 1
+
+    def timeout(self, dxl_id, attempt=0):
+        """Returns the packet timeout margin in milliseconds for an attempt with an ID, or None for the SDK default"""
+        link = self.link(dxl_id)
+        if not self.adaptive or link.srtt is None:
+            return None
+        timeout = max(self.min_timeout, link.srtt + 4.0 * link.rttvar) * (2 ** attempt)
+        return min(timeout, self.max_timeout)
+
+    def observe(self, dxl_id, result, rtt=None):
+        """Records the result of an attempt with an ID and, for answered ones, its round trip in milliseconds"""
+        if result in RETRIED_RESULTS:
+            return
+        link = self.link(dxl_id)
+        link.failures = 0
+        link.silent = False
+        if rtt is None or result != COMM_SUCCESS:
+            return
+        if link.srtt is None:
+            link.srtt = rtt
+            link.rttvar = rtt / 2.0
+        else:
+            link.rttvar += self.BETA * (abs(link.srtt - rtt) - link.rttvar)
+            link.srtt += self.ALPHA * (rtt - link.srtt)
+
+    def failed(self, dxl_id):
+        """Records a transaction with an ID that got no valid answer in any of its attempts"""
+        link = self.link(dxl_id)
+        link.failures += 1
+        if link.failures >= self.silent_after and not link.silent:
+            link.silent = True
+            link.next_probe = time.monotonic() + self.probe_interval
+
+    def is_silent(self, dxl_id):
+        return self.link(dxl_id).silent
+
+    def reset(self, dxl_id=None):
+        """Forgets what was learned about an ID, or about every ID"""
+        if dxl_id is None:
+            self.links = {}
+        else:
+            self.links.pop(dxl_id, None)
@@ -0,0 +1,149 @@
+################################################################################
+# Copyright 2020 University of Georgia Bio-Sensing and Instrumentation Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+import threading
+import time
+from array import array
+from dynamixel_sdk import BUS_PRIORITY_TELEMETRY
+from dynio.errors import ERROR_COUNT
+
+
+class RingBuffer:
+    """Creates a preallocated history of the last samples of one value"""
+    __slots__ = ("data", "size", "count")
+
+    def __init__(self, size):
+        # samples are stored as doubles, which hold every control table value exactly and NaN for missing samples.
+        self.data = array('d', bytes(8 * size))
+        self.size = size
+        self.count = 0
+
+    def __len__(self):
+        return min(self.count, self.size)
+
+    def append(self, value):
+        self.data[self.count % self.size] = value
+        self.count += 1
+
+    def latest(self):
+        """Returns the newest sample, or None if there is none yet"""
+        if self.count == 0:
+            return None
+        return self.data[(self.count - 1) % self.size]
+
+    def views(self):
+        """Returns the held samples, oldest first, as two memoryviews of the buffer without copying them"""
+        view = memoryview(self.data)
+        if self.count <= self.size:
+            return view[0: self.count], view[0: 0]
+        start = self.count % self.size
+        return view[start:], view[0: start]
+
+    def tolist(self):
+        """Returns a copy of the held samples, oldest first"""
+        older, newer = self.views()
+        return older.tolist() + newer.tolist()
+
+
+class TelemetryPoller:
+    """Creates a background sampler keeping a history of control table areas of many motors.
+
+    rates is a dictionary of {data_name: Hz}. Fields sharing a rate are read together with one group read per period,
+    so the bus load is fixed by the rates whatever the number of samples kept. Each rate has a ring buffer of
+    time.monotonic() timestamps, and each motor and field a ring buffer of values, NaN when the motor did not answer.
+    """
+
+    def __init__(self, dxl_io, motors, rates, history=1024):
+        self.dxl_io = dxl_io
+        self.motors = list(motors)
+        self.lock = threading.Lock()
+
+        self.groups = []
+        for rate in sorted(set(rates.values()), reverse=True):
+            fields = tuple(data_name for data_name in rates if rates[data_name] == rate)
+            self.groups.append([1.0 / rate, 0.0, fields, RingBuffer(history)])
+
+        self.__timestamps = {}
+        for group in self.groups:
+            for data_name in group[2]:
+                self.__timestamps[data_name] = group[3]
+        self.__samples = dict(((motor, data_name), RingBuffer(history)) for motor in self.motors for data_name in rates)
+
+        self.__thread = None
+        self.__stop = threading.Event()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def timestamps(self, data_name):
+        """Returns the RingBuffer of sample times of a field"""
+        return self.__timestamps[data_name]
+
+    def samples(self, motor, data_name):
+        """Returns the RingBuffer of the values of a field of a motor"""
+        return self.__samples[(motor, data_name)]
+
+    def poll(self, now=None):
+        """Reads every field that is due and returns the time the next one is due"""
+        if now is None:
+            now = time.monotonic()
+
+        for group in self.groups:
+            period, due, fields, timestamps = group
+            if now < due:
+                continue
+            # a late read skips the periods it missed rather than bursting to catch up, and waits a whole period.
+            group[1] = due + period if due + period > now else now + period
+
+            # missing samples are already kept as NaN, so failures are only counted and never stop the poller.
+            with self.dxl_io.priority(BUS_PRIORITY_TELEMETRY), self.dxl_io.error_handling(ERROR_COUNT):
+                records = self.dxl_io.read_many(self.motors, fields)
+            stamp = time.monotonic()
+
+            with self.lock:
+                timestamps.append(stamp)
+                for motor in self.motors:
+                    record = records.get(motor)
+                    for i, data_name in enumerate(fields):
+                        value = float('nan') if record is None else record[i]
+                        self.__samples[(motor, data_name)].append(value)
+
+        return min(group[1] for group in self.groups)
+
+    def start(self):
+        """Starts polling in a background thread"""
+        if self.__thread is not None:
+            return
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self.__run, name="dynio-telemetry", daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        """Stops the background thread after its current read"""
+        if self.__thread is None:
+            return
+        self.__stop.set()
+        self.__thread.join()
+        self.__thread = None
+
+    def __run(self):
+        while not self.__stop.is_set():
+            next_due = self.poll()
+            self.__stop.wait(max(0.0, next_due - time.monotonic()))
@@ -0,0 +1,373 @@
+################################################################################
+# Copyright 2020 University of Georgia Bio-Sensing and Instrumentation Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+import random
+import time
+from dynamixel_sdk import *
+from dynamixel_sdk.port_handler import monotonic_ns
+from dynio.DynamixelJSON import load_model
+from dynio.control_table import STATUS_RETURN_LEVEL_NAMES
+
+# protocol 2.0 status packet error numbers.
+ERRNUM_INSTRUCTION = 2
+ERRNUM_ACCESS = 7
+
+
+class VirtualMotor:
+    """Creates a simulated motor holding a control table laid out like a motor model JSON file"""
+
+    def __init__(self, dxl_id, json_file, protocol=1, control_table_protocol=None, model_number=0):
+        if protocol == 1 or control_table_protocol is None:
+            control_table_protocol = protocol
+        self.CONTROL_TABLE = load_model(json_file).get("Protocol_%d" % control_table_protocol).get("Control_Table")
+        self.dxl_id = dxl_id
+        self.PROTOCOL = protocol
+        self.model_number = model_number
+
+        self.memory = bytearray(max(256, max(address + size for address, size in self.CONTROL_TABLE.values())))
+        self.registered = None
+        self.on_write = None
+
+        self.set("Model_Number", model_number)
+        for data_name in ("ID", "M3XL_ID"):
+            self.set(data_name, dxl_id)
+        for data_name in STATUS_RETURN_LEVEL_NAMES:
+            self.set(data_name, 2)
+
+    def set(self, data_name, value):
+        """Sets a control table area of a specific name, if the model has it, without using the bus"""
+        entry = self.CONTROL_TABLE.get(data_name)
+        if entry is not None:
+            address, size = entry
+            self.memory[address: address + size] = (value & ((1 << (8 * size)) - 1)).to_bytes(size, "little")
+
+    def get(self, data_name):
+        """Returns the unsigned value of a control table area of a specific name"""
+        address, size = self.CONTROL_TABLE[data_name]
+        return int.from_bytes(self.memory[address: address + size], "little")
+
+    def status_return_level(self):
+        for data_name in STATUS_RETURN_LEVEL_NAMES:
+            if data_name in self.CONTROL_TABLE:
+                return self.get(data_name)
+        return 2
+
+    def read(self, address, length):
+        if address + length > len(self.memory):
+            return None
+        return bytes(self.memory[address: address + length])
+
+    def write(self, address, data):
+        if address + len(data) > len(self.memory):
+            return False
+        self.memory[address: address + len(data)] = data
+        if self.on_write is not None:
+            # lets a test or benchmark model motion, such as copying a goal position to the present position.
+            self.on_write(self, address, bytes(data))
+        return True
+
+
+class VirtualPortHandler(PortHandler):
+    """Creates a PortHandler connected to simulated motors instead of a serial device.
+
+    Protocol 1.0 and 2.0 instruction packets written to the port are answered by the motors with the matching
+    protocol: ping, read, write, reg write, action, reboot, sync write, sync read, bulk read and bulk write, honoring
+    each motor's status return level. With realtime on, replies become readable only after the time the packets
+    would take on the wire at the port's baud rate, plus the return delay and adapter latency in milliseconds.
+    Replies can be dropped, corrupted or preceded by noise at given rates, drawn from a seeded generator so runs are
+    repeatable. With record on, every packet is kept in traffic as (time, "tx" or "rx", bytes).
+    """
+
+    def __init__(self, motors=(), realtime=True, return_delay=0.0, latency=0.0, drop_rate=0.0, corrupt_rate=0.0,
+                 noise_rate=0.0, seed=0, record=False):
+        PortHandler.__init__(self, "virtual")
+        self.motors = {}
+        for motor in motors:
+            self.add_motor(motor)
+
+        self.realtime = realtime
+        self.return_delay = return_delay
+        self.latency = latency
+        self.drop_rate = drop_rate
+        self.corrupt_rate = corrupt_rate
+        self.noise_rate = noise_rate
+        self.random = random.Random(seed)
+        self.record = record
+        self.traffic = []
+
+        # replies waiting to be read, as [time in ns they become readable, bytes].
+        self.pending = []
+        self.bus_free = 0
+        self.ph = [Protocol1PacketHandler(), Protocol2PacketHandler()]
+        self.tx_time_per_byte = (1000.0 / self.baudrate) * 10.0
+
+    def add_motor(self, motor):
+        self.motors[motor.dxl_id] = motor
+
+    def openPort(self):
+        self.is_open = True
+        return True
+
+    def closePort(self):
+        self.is_open = False
+
+    def clearPort(self):
+        del self.pending[:]
+
+    def setBaudRate(self, baudrate):
+        if self.getCFlagBaud(baudrate) <= 0:
+            return False
+        self.baudrate = baudrate
+        self.tx_time_per_byte = (1000.0 / self.baudrate) * 10.0
+        return True
+
+    def setupPort(self, cflag_baud):
+        return self.openPort()
+
+    def getBytesAvailable(self):
+        now = monotonic_ns()
+        return sum(len(data) for ready, data in self.pending if not self.realtime or ready <= now)
+
+    def waitForData(self):
+        if not self.realtime:
+            return
+        # sleeps until the next reply is on the wire or the packet deadline passes.
+        wake = self.packet_deadline
+        if self.pending:
+            wake = min(self.pending[0][0], wake)
+        remaining = wake - monotonic_ns()
+        if remaining > 0:
+            time.sleep(remaining / 1000000000.0)
+
+    def isPacketTimeout(self):
+        # without realtime nothing arrives later than the write that caused it, so waiting for more is pointless.
+        if not self.realtime and not self.pending:
+            self.packet_timeout = 0
+            self.packet_deadline = 0
+            return True
+        return PortHandler.isPacketTimeout(self)
+
+    def readPort(self, length):
+        if length > 0:
+            self.waitForData()
+
+        now = monotonic_ns()
+        received = bytearray()
+        while self.pending and len(received) < length and (not self.realtime or self.pending[0][0] <= now):
+            data = self.pending[0][1]
+            taken = data[0: length - len(received)]
+            received += taken
+            if len(taken) == len(data):
+                self.pending.pop(0)
+            else:
+                self.pending[0][1] = data[len(taken):]
+        return received
+
+    def writePort(self, packet):
+        packet = bytes(packet)
+        now = monotonic_ns()
+        if self.record:
+            self.traffic.append((now, "tx", packet))
+
+        # the instruction occupies the wire first, then the motors answer one after another.
+        self.bus_free = max(self.bus_free, now) + self.__wire_time(len(packet))
+        if packet[0:4] == b'\xFF\xFF\xFD\x00':
+            replies = self.__handle2(packet)
+        else:
+            replies = self.__handle1(packet)
+
+        for reply in replies:
+            reply = self.__disturb(reply)
+            if reply is None:
+                continue
+            self.bus_free += int(self.return_delay * 1000000) + self.__wire_time(len(reply))
+            self.pending.append([self.bus_free + int(self.latency * 1000000), reply])
+            if self.record:
+                self.traffic.append((self.bus_free, "rx", reply))
+
+        return len(packet)
+
+    def __wire_time(self, length):
+        return int(self.tx_time_per_byte * length * 1000000)
+
+    def __disturb(self, reply):
+        if self.drop_rate and self.random.random() < self.drop_rate:
+            return None
+        if self.corrupt_rate and self.random.random() < self.corrupt_rate:
+            reply = bytearray(reply)
+            reply[self.random.randrange(len(reply))] ^= 1 << self.random.randrange(8)
+            reply = bytes(reply)
+        if self.noise_rate and self.random.random() < self.noise_rate:
+            reply = bytes(self.random.randrange(256) for _ in range(self.random.randrange(1, 8))) + reply
+        return reply
+
+    def __answering(self, dxl_id, protocol, instruction):
+        motor = self.motors.get(dxl_id)
+        if motor is None or motor.PROTOCOL != protocol:
+            return None
+        level = motor.status_return_level()
+        if level == 0 and instruction != INST_PING:
+            return None
+        if level == 1 and instruction not in (INST_PING, INST_READ, INST_SYNC_READ, INST_BULK_READ):
+            return None
+        return motor
+
+    def __status1(self, dxl_id, error, params=b''):
+        body = bytes([dxl_id, len(params) + 2, error]) + params
+        return b'\xFF\xFF' + body + bytes([~sum(body) & 0xFF])
+
+    def __status2(self, dxl_id, error, params=b''):
+        length = len(params) + 4
+        packet = bytearray(b'\xFF\xFF\xFD\x00' + bytes([dxl_id, length & 0xFF, length >> 8, INST_STATUS, error]) +
+                           params + b'\x00\x00')
+        self.ph[1].addStuffing(packet)
+        total = DXL_MAKEWORD(packet[5], packet[6]) + 7
+        crc = self.ph[1].updateCRC(0, packet, total - 2)
+        packet[total - 2: total] = bytes([DXL_LOBYTE(crc), DXL_HIBYTE(crc)])
+        return bytes(packet[0: total])
+
+    def __handle1(self, packet):
+        if len(packet) < 6 or packet[0:2] != b'\xFF\xFF' or len(packet) < packet[3] + 4:
+            return []
+        dxl_id, instruction = packet[2], packet[4]
+        params = packet[5: packet[3] + 3]
+        if packet[packet[3] + 3] != ~sum(packet[2: packet[3] + 3]) & 0xFF:
+            return []
+
+        replies = []
+        if instruction == INST_SYNC_WRITE:
+            address, length = params[0], params[1]
+            for i in range(2, len(params), length + 1):
+                motor = self.motors.get(params[i])
+                if motor is not None and motor.PROTOCOL == 1:
+                    motor.write(address, params[i + 1: i + 1 + length])
+        elif instruction == INST_BULK_READ:
+            for i in range(1, len(params), 3):
+                length, target, address = params[i], params[i + 1], params[i + 2]
+                motor = self.__answering(target, 1, INST_BULK_READ)
+                if motor is not None:
+                    data = motor.read(address, length)
+                    replies.append(self.__status1(target, 0, data) if data is not None else
+                                   self.__status1(target, ERRBIT_RANGE))
+        elif dxl_id == BROADCAST_ID and instruction == INST_READ:
+            # 3mxl boards given a sync read index answer a broadcast READ in the order of their indexes.
+            indexed = [(motor.get("M3XL_SYNC_READ_INDEX"), motor) for motor in self.motors.values()
+                       if motor.PROTOCOL == 1 and "M3XL_SYNC_READ_INDEX" in motor.CONTROL_TABLE and
+                       motor.get("M3XL_SYNC_READ_INDEX")]
+            for _, motor in sorted(indexed, key=lambda item: item[0]):
+                if self.__answering(motor.dxl_id, 1, INST_READ) is not None:
+                    error, data = self.__execute(motor, instruction, params, 1)
+                    replies.append(self.__status1(motor.dxl_id, error, data))
+        elif dxl_id == BROADCAST_ID:
+            for motor in self.motors.values():
+                if motor.PROTOCOL == 1:
+                    self.__execute(motor, instruction, params, 1)
+        else:
+            motor = self.motors.get(dxl_id)
+            if motor is not None and motor.PROTOCOL == 1:
+                error, data = self.__execute(motor, instruction, params, 1)
+                if self.__answering(dxl_id, 1, instruction) is not None:
+                    replies.append(self.__status1(dxl_id, error, data))
+        return replies
+
+    def __handle2(self, packet):
+        if len(packet) < 10:
+            return []
+        total = DXL_MAKEWORD(packet[5], packet[6]) + 7
+        if len(packet) < total or DXL_MAKEWORD(packet[total - 2], packet[total - 1]) != \
+                self.ph[1].updateCRC(0, packet, total - 2):
+            return []
+        packet = self.ph[1].removeStuffing(bytearray(packet[0: total]))
+        total = DXL_MAKEWORD(packet[5], packet[6]) + 7
+        dxl_id, instruction = packet[4], packet[7]
+        params = bytes(packet[8: total - 2])
+
+        replies = []
+        if instruction == INST_SYNC_WRITE:
+            address, length = DXL_MAKEWORD(params[0], params[1]), DXL_MAKEWORD(params[2], params[3])
+            for i in range(4, len(params), length + 1):
+                motor = self.motors.get(params[i])
+                if motor is not None and motor.PROTOCOL == 2:
+                    motor.write(address, params[i + 1: i + 1 + length])
+        elif instruction == INST_BULK_WRITE:
+            i = 0
+            while i + 5 <= len(params):
+                target, address, length = params[i], DXL_MAKEWORD(params[i + 1], params[i + 2]), DXL_MAKEWORD(
+                    params[i + 3], params[i + 4])
+                motor = self.motors.get(target)
+                if motor is not None and motor.PROTOCOL == 2:
+                    motor.write(address, params[i + 5: i + 5 + length])
+                i += 5 + length
+        elif instruction == INST_SYNC_READ:
+            address, length = DXL_MAKEWORD(params[0], params[1]), DXL_MAKEWORD(params[2], params[3])
+            for target in params[4:]:
+                replies += self.__read_reply2(target, address, length, INST_SYNC_READ)
+        elif instruction == INST_BULK_READ:
+            for i in range(0, len(params) - 4, 5):
+                replies += self.__read_reply2(params[i], DXL_MAKEWORD(params[i + 1], params[i + 2]),
+                                              DXL_MAKEWORD(params[i + 3], params[i + 4]), INST_BULK_READ)
+        elif dxl_id == BROADCAST_ID:
+            for motor in list(self.motors.values()):
+                if motor.PROTOCOL == 2:
+                    error, data = self.__execute(motor, instruction, params, 2)
+                    if instruction == INST_PING:
+                        replies.append(self.__status2(motor.dxl_id, error, data))
+        else:
+            motor = self.motors.get(dxl_id)
+            if motor is not None and motor.PROTOCOL == 2:
+                error, data = self.__execute(motor, instruction, params, 2)
+                if self.__answering(dxl_id, 2, instruction) is not None:
+                    replies.append(self.__status2(dxl_id, error, data))
+        return replies
+
+    def __read_reply2(self, dxl_id, address, length, instruction):
+        motor = self.__answering(dxl_id, 2, instruction)
+        if motor is None:
+            return []
+        data = motor.read(address, length)
+        if data is None:
+            return [self.__status2(dxl_id, ERRNUM_ACCESS)]
+        return [self.__status2(dxl_id, 0, data)]
+
+    def __execute(self, motor, instruction, params, protocol):
+        # returns the error and data of the status packet answering a single motor instruction.
+        range_error = ERRBIT_RANGE if protocol == 1 else ERRNUM_ACCESS
+        if protocol == 1:
+            address, rest = (params[0], params[1:]) if params else (0, b'')
+        else:
+            address, rest = (DXL_MAKEWORD(params[0], params[1]), params[2:]) if len(params) >= 2 else (0, b'')
+
+        if instruction == INST_PING:
+            if protocol == 1:
+                return 0, b''
+            return 0, bytes([DXL_LOBYTE(motor.model_number), DXL_HIBYTE(motor.model_number), 0])
+        if instruction == INST_READ:
+            length = rest[0] if protocol == 1 else DXL_MAKEWORD(rest[0], rest[1])
+            data = motor.read(address, length)
+            return (0, data) if data is not None else (range_error, b'')
+        if instruction == INST_WRITE:
+            return (0, b'') if motor.write(address, rest) else (range_error, b'')
+        if instruction == INST_REG_WRITE:
+            motor.registered = (address, bytes(rest))
+            return 0, b''
+        if instruction == INST_ACTION:
+            if motor.registered is not None:
+                motor.write(*motor.registered)
+                motor.registered = None
+            return 0, b''
+        if instruction == INST_REBOOT:
+            return 0, b''
+        return (ERRBIT_INSTRUCTION if protocol == 1 else ERRNUM_INSTRUCTION), b''
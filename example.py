@@ -13,8 +13,8 @@ motor2.set_acceleration(1000)
 
 while True:
     command = input("> ")
-    motor.set_speed(int(command))
-    motor2.set_speed(int(command))
+    # both setpoints go out in one sync write packet instead of one write round trip per motor.
+    dxl_io.sync_write_control_table("M3XL_DESIRED_SPEED", {motor: int(command) * 100, motor2: int(command) * 100})
 
 
 # motor.set_speed_mode()
@@ -3,14 +3,20 @@ import json
 
 
 def convert_header_to_json(header_file_path, json_file_path):
-    # Regular expression to match C macro definitions
-    macro_pattern = re.compile(r"#define\s+(\w+)\s+([0-9xXA-Fa-f]+)")
+    # Regular expression to match C macro definitions, only at the start of a line so commented out ones are skipped
+    macro_pattern = re.compile(r"^\s*#define\s+(\w+)\s+([0-9xXA-Fa-f]+)\b", re.MULTILINE)
 
     with open(header_file_path, 'r') as file:
         content = file.read()
 
+    # Only the addresses of the table are control table areas. The header also defines instructions, modes, error
+    # masks and other constants, which are left out so they do not become registers.
+    start = content.index("HERE ARE THE ADRESSES OF THE ELEMENTS IN THE TABLE")
+    content = content[start: content.index("END OF TABLE", start)]
+
     # Find all macro definitions
     macros = macro_pattern.findall(content)
+    names = set(name for name, _ in macros)
 
     # Convert macros to JSON format
     json_data = {"Protocol_1": {"Control_Table": {}}}
@@ -28,14 +34,25 @@ def convert_header_to_json(header_file_path, json_file_path):
         else:
             value = value.upper()
 
-        # Check if suffix is L
-        if name.endswith('L'):
+        # Multi-byte registers are defined one byte at a time, _L and _H for 16 bits and _32_1 to _32_4 for 32 bits.
+        # They become one entry covering every byte, so a value is always read or written in one packet.
+        # 24 bit registers (_L, _M and _H, such as the baud rate) have no matching register size and a 4 byte entry
+        # would cover the next area, so their bytes are kept as separate entries.
+        if name.endswith(('_L', '_M', '_H')) and name[:-2] + '_M' in names:
+            pass
+        elif name.endswith('_L') and name[:-2] + '_H' in names:
             name = name[:-2]
             bytelen = 2
+        elif name.endswith('_H') and name[:-2] + '_L' in names:
+            continue
+        elif name.endswith('_32_1') and all(name[:-1] + str(i) in names for i in (2, 3, 4)):
+            name = name[:-2]
+            bytelen = 4
+        elif re.search(r'_32_[234]$', name) and name[:-1] + '1' in names:
+            continue
 
-        if not name.endswith('H'):
-            # Add to JSON structure
-            json_data["Protocol_1"]["Control_Table"][name] = [value, bytelen]
+        # Add to JSON structure
+        json_data["Protocol_1"]["Control_Table"][name] = [value, bytelen]
 
     # Write the JSON data to a file
     with open(json_file_path, 'w') as json_file:
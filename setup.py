@@ -21,7 +21,7 @@ from setuptools import setup, find_packages
 setup(
     name="dynamixel_controller",
     version='0.8.1',
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks', 'benchmarks.*']),
     author="Hunter Halloran (Jyumpp)",
     author_email="hdh20267@uga.edu",
     package_data={
@@ -32,6 +32,10 @@ setup(
         'pyserial',
         'deprecation',
     ],
+    extras_require={
+        'fast': ['crcmod'],
+        'numpy': ['numpy'],
+    },
     description="A new tool for operating Dynamixel series motors!",
     long_description=open('README.md').read(),
     long_description_content_type='text/markdown',
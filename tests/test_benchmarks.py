@@ -0,0 +1,31 @@
+################################################################################
+# Copyright 2020 University of Georgia Bio-Sensing and Instrumentation Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+import json
+from benchmarks.__main__ import main, SUITES
+
+
+def test_every_suite_reports_results(tmp_path, capsys):
+    path = tmp_path / "results.json"
+    main(["--duration", "0.01", "--json", str(path)])
+    report = json.loads(path.read_text())
+
+    assert sorted(report["suites"]) == sorted(SUITES)
+    for name, suite in report["suites"].items():
+        assert suite["unit"] == SUITES[name][1]
+        assert suite["results"]
+        assert all(value > 0 for value in suite["results"].values())
+    assert "codec" in capsys.readouterr().out
@@ -0,0 +1,78 @@
+################################################################################
+# Copyright 2020 University of Georgia Bio-Sensing and Instrumentation Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+import threading
+import time
+from dynamixel_sdk.bus_arbiter import BusArbiter, BUS_PRIORITY_SAFETY, BUS_PRIORITY_SETPOINT, \
+    BUS_PRIORITY_TELEMETRY
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def test_reentrant_for_the_owning_thread():
+    arbiter = BusArbiter()
+    with arbiter:
+        with arbiter:
+            assert arbiter.depth == 2
+        assert arbiter.owner is threading.current_thread()
+
+        # another thread waits until the outermost block is left.
+        acquired = threading.Event()
+        thread = threading.Thread(target=lambda: (arbiter.acquire(), acquired.set(), arbiter.release()))
+        thread.start()
+        assert not acquired.wait(0.05)
+    assert acquired.wait(5.0)
+    thread.join()
+    assert arbiter.owner is None and arbiter.depth == 0
+
+
+def test_waiting_threads_are_served_by_priority_then_arrival():
+    arbiter = BusArbiter()
+    order = []
+
+    def worker(name, level):
+        with arbiter.priority(level):
+            with arbiter:
+                order.append(name)
+
+    threads = []
+    arbiter.acquire()
+    # each thread is queued before the next one starts, so arrival order is known.
+    for name, level in (("telemetry 1", BUS_PRIORITY_TELEMETRY), ("setpoint 1", BUS_PRIORITY_SETPOINT),
+                        ("telemetry 2", BUS_PRIORITY_TELEMETRY), ("safety", BUS_PRIORITY_SAFETY),
+                        ("setpoint 2", BUS_PRIORITY_SETPOINT)):
+        threads.append(threading.Thread(target=worker, args=(name, level)))
+        threads[-1].start()
+        wait_until(lambda: len(arbiter.waiting) == len(threads))
+    arbiter.release()
+
+    for thread in threads:
+        thread.join()
+    assert order == ["safety", "setpoint 1", "setpoint 2", "telemetry 1", "telemetry 2"]
+
+
+def test_priority_is_restored_after_the_block():
+    arbiter = BusArbiter()
+    with arbiter.priority(BUS_PRIORITY_TELEMETRY):
+        with arbiter.priority(BUS_PRIORITY_SAFETY):
+            assert arbiter.local.priority == BUS_PRIORITY_SAFETY
+        assert arbiter.local.priority == BUS_PRIORITY_TELEMETRY
+    assert arbiter.local.priority == BUS_PRIORITY_SETPOINT
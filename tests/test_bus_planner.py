@@ -0,0 +1,73 @@
+################################################################################
+# Copyright 2020 University of Georgia Bio-Sensing and Instrumentation Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+import pytest
+from dynio.bus_planner import BusPlanner
+from dynio.dynamixel_controller import DynamixelIO
+from dynio.virtual_bus import VirtualMotor, VirtualPortHandler
+from dynio.DynamixelJSON import model_path
+
+
+def make_bus(count=2):
+    virtual = [VirtualMotor(i, model_path("MX28.json")) for i in range(1, count + 1)]
+    for motor in virtual:
+        motor.set("Present_Position", 100 + motor.dxl_id)
+        motor.set("Present_Temperature", 40 + motor.dxl_id)
+    dxl_io = DynamixelIO(port_handler=VirtualPortHandler(virtual, realtime=False), baud_rate=1000000)
+    return dxl_io, [dxl_io.new_mx28(motor.dxl_id) for motor in virtual]
+
+
+def test_rates_above_one_per_period_are_rejected():
+    dxl_io, motors = make_bus()
+    planner = dxl_io.new_bus_planner(10, latency=1)
+    with pytest.raises(ValueError):
+        planner.add_read(motors, ["Present_Position"], 200)
+    with pytest.raises(ValueError):
+        planner.add_write(motors, "Goal_Position", dict, 101)
+    assert planner.transactions == []
+
+
+def test_achieved_rates_are_reported():
+    dxl_io, motors = make_bus()
+    planner = dxl_io.new_bus_planner(10, latency=1)
+    planner.add_read(motors, ["Present_Position"], 100)
+    planner.add_read(motors, ["Present_Temperature"], 30)
+
+    rates = dict(planner.report()[0]["rates"] + planner.report()[1]["rates"] + planner.report()[2]["rates"])
+    assert rates[100] == pytest.approx(100.0)
+    # one read every 3 slots of 10 ms.
+    assert rates[30] == pytest.approx(1000.0 / 30)
+
+
+def test_cut_cycle_warns():
+    dxl_io, motors = make_bus()
+    planner = BusPlanner(dxl_io, 1, latency=1, max_slots=10)
+    planner.add_read(motors, ["Present_Position"], 1000 / 7.0)
+    with pytest.warns(RuntimeWarning):
+        planner.add_read(motors, ["Present_Temperature"], 1000 / 11.0)
+    assert len(planner.slots) == 10
+
+
+def test_records_of_a_motor_read_twice_in_a_slot_are_merged():
+    dxl_io, motors = make_bus()
+    planner = dxl_io.new_bus_planner(10, latency=1)
+    planner.add_read(motors, ["Present_Position"], 100)
+    planner.add_read(motors[:1], ["Present_Temperature"], 100)
+
+    records = planner.run_cycle()
+    assert records[motors[0]].Present_Position == 101
+    assert records[motors[0]].Present_Temperature == 41
+    assert records[motors[1]] == (102,)
@@ -0,0 +1,127 @@
+################################################################################
+# Copyright 2020 University of Georgia Bio-Sensing and Instrumentation Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+from dynio.control_table import load_registers
+from dynio.dynamixel_controller import DynamixelIO
+from dynio.errors import ERROR_COUNT
+from dynio.virtual_bus import VirtualMotor, VirtualPortHandler
+from dynio.DynamixelJSON import load_model, model_path
+
+
+def three_mxl_table():
+    return load_model(model_path("3mxl.json")).get("Protocol_1").get("Control_Table")
+
+
+def test_3mxl_table_holds_only_areas():
+    table = three_mxl_table()
+    for name in ("PING", "POSITION_MODE", "M3XL_RANGE_ERROR", "M3XL_STATUS_MOVING", "TORQUE_ENABLE", "M_PI"):
+        assert name not in table
+
+    # every entry is an area of the motor, which Registers can describe.
+    registers = load_registers(model_path("3mxl.json"))
+    assert len(list(registers)) == len(table)
+
+
+def test_3mxl_multi_byte_areas():
+    table = three_mxl_table()
+    # the 24 bit baud rate keeps its three bytes as separate areas.
+    assert [tuple(table[name]) for name in ("M3XL_BAUD_RATE_L", "M3XL_BAUD_RATE_M", "M3XL_BAUD_RATE_H")] == \
+        [(50, 1), (51, 1), (52, 1)]
+    assert "M3XL_BAUD_RATE" not in table
+    for name, (address, size) in table.items():
+        if not name.startswith("M3XL_BAUD_RATE"):
+            assert address + size <= 50 or address >= 53
+
+    assert tuple(table["M3XL_VOLTAGE"]) == (96, 2)
+    assert tuple(table["M3XL_POSITION_32"]) == (106, 4)
+
+    registers = load_registers(model_path("3mxl.json"))
+    assert registers.M3XL_POSITION_32.signed
+    assert registers.status_return_level().name == "M3XL_STATUS_RETURN_LEVEL"
+
+
+def make_motor():
+    virtual = VirtualMotor(1, model_path("MX28.json"), protocol=2)
+    port = VirtualPortHandler([virtual], realtime=False, record=True)
+    dxl_io = DynamixelIO(port_handler=port, baud_rate=1000000, error_policy=ERROR_COUNT)
+    return virtual, port, dxl_io.new_mx28(1, protocol=2)
+
+
+def sent(port):
+    return sum(1 for _, direction, _ in port.traffic if direction == "tx")
+
+
+def test_mirror_skips_known_eeprom_areas():
+    virtual, port, motor = make_motor()
+    virtual.set("Return_Delay_Time", 10)
+    assert motor.mirror.is_eeprom(motor.regs.Return_Delay_Time)
+    assert not motor.mirror.is_eeprom(motor.regs.Goal_Position)
+
+    # the first read goes to the bus, the next ones come from the copy.
+    assert motor.read_control_table("Return_Delay_Time") == 10
+    assert motor.read_control_table("Return_Delay_Time") == 10
+    assert sent(port) == 1
+
+    # writing the value already held is skipped, a new value is sent.
+    motor.write_control_table("Return_Delay_Time", 10)
+    assert sent(port) == 1
+    motor.write_control_table("Return_Delay_Time", 20)
+    assert sent(port) == 2
+    assert virtual.get("Return_Delay_Time") == 20
+    assert motor.read_control_table("Return_Delay_Time") == 20
+    assert sent(port) == 2
+
+    # RAM areas always use the bus but are kept for peek().
+    virtual.set("Present_Temperature", 40)
+    assert motor.read_control_table("Present_Temperature") == 40
+    assert motor.read_control_table("Present_Temperature") == 40
+    assert sent(port) == 4
+    assert motor.mirror.peek(motor.regs.Present_Temperature) == 40
+
+
+def test_mirror_refresh_reads_the_eeprom_area_at_once():
+    virtual, port, motor = make_motor()
+    virtual.set("Return_Delay_Time", 10)
+    virtual.set("Velocity_Limit", 200)
+    assert motor.refresh()
+    assert sent(port) == 1
+    assert motor.mirror.peek(motor.regs.Return_Delay_Time) == 10
+    assert motor.mirror.peek(motor.regs.Velocity_Limit) == 200
+    assert motor.mirror.peek(motor.regs.Goal_Position) is None
+
+    motor.invalidate(["Velocity_Limit"])
+    assert motor.mirror.peek(motor.regs.Velocity_Limit) is None
+    assert motor.mirror.peek(motor.regs.Return_Delay_Time) == 10
+
+
+def test_mirror_forgets_areas_of_failed_writes():
+    virtual, port, motor = make_motor()
+    motor.write_control_table("Return_Delay_Time", 10)
+    motor.write_control_table("Goal_Position", 100)
+    assert motor.mirror.peek(motor.regs.Return_Delay_Time) == 10
+    assert motor.mirror.peek(motor.regs.Goal_Position) == 100
+
+    # the motor stops answering, so it is unknown whether the writes were applied.
+    del port.motors[1]
+    assert not motor.mirror.write(motor.regs.Return_Delay_Time, 30)
+    assert not motor.mirror.write(motor.regs.Goal_Position, 200)
+    assert motor.mirror.peek(motor.regs.Return_Delay_Time) is None
+    assert motor.mirror.peek(motor.regs.Goal_Position) is None
+
+    # a failed read does not bring the old value back either.
+    assert motor.mirror.read_data(motor.regs.Return_Delay_Time) is None
+    port.add_motor(virtual)
+    assert motor.read_control_table("Return_Delay_Time") == 10
@@ -0,0 +1,114 @@
+################################################################################
+# Copyright 2020 University of Georgia Bio-Sensing and Instrumentation Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+from dynamixel_sdk import INST_BULK_READ, INST_SYNC_READ, INST_SYNC_WRITE
+from dynio.dynamixel_controller import DynamixelIO
+from dynio.errors import ERROR_COUNT
+from dynio.virtual_bus import VirtualMotor, VirtualPortHandler
+from dynio.DynamixelJSON import model_path
+
+
+def make_bus(*motors):
+    return DynamixelIO(port_handler=VirtualPortHandler(motors, realtime=False, record=True), baud_rate=1000000,
+                       error_policy=ERROR_COUNT)
+
+
+def instructions(dxl_io):
+    # the instruction byte of every packet sent, for both protocols.
+    return [packet[7] if packet[0:3] == b'\xFF\xFF\xFD' else packet[4]
+            for _, direction, packet in dxl_io.port_handler.traffic if direction == "tx"]
+
+
+def test_read_many_decodes_signed_areas():
+    virtual = VirtualMotor(1, model_path("MX28.json"), protocol=2)
+    virtual.set("Goal_Position", -100)
+    virtual.set("Present_Velocity", -5)
+    virtual.set("Present_Temperature", 40)
+    dxl_io = make_bus(virtual)
+    motor = dxl_io.new_mx28(1, protocol=2)
+
+    record = dxl_io.read_many([motor], ["Goal_Position", "Present_Velocity", "Present_Temperature"])[motor]
+    assert record == (-100, -5, 40)
+    assert record.Goal_Position == motor.read_register(motor.regs.Goal_Position) == -100
+
+
+def test_read_states_decodes_the_3mxl_feedback_block():
+    virtual = VirtualMotor(1, model_path("3mxl.json"))
+    virtual.set("M3XL_VOLTAGE", 1200)
+    virtual.set("M3XL_CURRENT", -50)
+    virtual.set("M3XL_POSITION_32", -123456)
+    dxl_io = make_bus(virtual)
+    motor = dxl_io.new_three_mxl_motor(1)
+
+    state = dxl_io.read_states([motor])[motor]
+    assert (state.voltage, state.current, state.position) == (1200, -50, -123456)
+
+
+def test_read_many_uses_one_packet_per_protocol():
+    virtual = [VirtualMotor(dxl_id, model_path("MX28.json"), protocol=protocol)
+               for dxl_id, protocol in ((1, 2), (2, 2), (3, 1), (4, 1))]
+    for motor in virtual:
+        motor.set("Present_Position", 100 + motor.dxl_id)
+        motor.set("Present_Load", 10 * motor.dxl_id)
+    dxl_io = make_bus(*virtual)
+    motors = [dxl_io.new_mx28(1, protocol=2), dxl_io.new_mx28(2, protocol=2), dxl_io.new_mx28(3),
+              dxl_io.new_mx28(4)]
+
+    records = dxl_io.read_many(motors, ["Present_Position"])
+    assert [records[motor] for motor in motors] == [(101,), (102,), (103,), (104,)]
+    # protocol 2 motors with one span share a sync read, protocol 1 motors a bulk read.
+    assert sorted(instructions(dxl_io)) == sorted([INST_SYNC_READ, INST_BULK_READ])
+
+    records = dxl_io.read_many(motors[2:], ["Present_Load", "Present_Position"])
+    assert records[motors[3]].Present_Load == 40
+    assert records[motors[3]].Present_Position == 104
+
+
+def test_read_many_gives_none_for_missing_motors():
+    dxl_io = make_bus(VirtualMotor(1, model_path("MX28.json"), protocol=2))
+    motors = [dxl_io.new_mx28(1, protocol=2), dxl_io.new_mx28(2, protocol=2)]
+
+    records = dxl_io.read_many(motors, ["ID"])
+    assert records == {motors[0]: (1,), motors[1]: None}
+
+
+def test_sync_write_control_table_groups_by_layout():
+    virtual = [VirtualMotor(dxl_id, model_path("MX28.json"), protocol=protocol)
+               for dxl_id, protocol in ((1, 2), (2, 2), (3, 1))]
+    dxl_io = make_bus(*virtual)
+    motors = [dxl_io.new_mx28(1, protocol=2), dxl_io.new_mx28(2, protocol=2), dxl_io.new_mx28(3)]
+
+    dxl_io.sync_write_control_table("Goal_Position", {motors[0]: 1000, motors[1]: -1000, motors[2]: 2000})
+    assert instructions(dxl_io) == [INST_SYNC_WRITE, INST_SYNC_WRITE]
+    assert [motor.get("Goal_Position") for motor in virtual] == [1000, (-1000) & 0xFFFFFFFF, 2000]
+
+    # the written values are known to the mirrors without reading them back.
+    assert motors[1].mirror.peek(motors[1].regs.Goal_Position) == -1000
+    assert motors[2].mirror.peek(motors[2].regs.Goal_Position) == 2000
+
+
+def test_scan_finds_motors_of_both_protocols():
+    dxl_io = make_bus(VirtualMotor(1, model_path("MX28.json"), protocol=2, model_number=30),
+                      VirtualMotor(5, model_path("MX28.json"), protocol=1, model_number=29),
+                      VirtualMotor(9, model_path("MX28.json"), protocol=2, model_number=4242))
+
+    found = dxl_io.scan(max_id=10)
+    assert [(motor.dxl_id, motor.protocol, motor.model_number) for motor in found] == \
+        [(5, 1, 29), (1, 2, 30), (9, 2, 4242)]
+    assert found[0].motor.PROTOCOL == 1 and found[0].motor.dxl_id == 5
+    assert found[1].motor.PROTOCOL == 2
+    # unknown models are reported without a motor object.
+    assert found[2].motor is None
@@ -0,0 +1,57 @@
+################################################################################
+# Copyright 2020 University of Georgia Bio-Sensing and Instrumentation Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+import time
+from dynamixel_sdk.port_handler import PortHandler
+
+
+class TimeoutCountingSerial:
+    """Stands in for a pyserial port without a pollable descriptor, counting timeout changes"""
+
+    def __init__(self):
+        self.value = 0
+        self.changes = 0
+
+    @property
+    def timeout(self):
+        return self.value
+
+    @timeout.setter
+    def timeout(self, value):
+        self.value = value
+        self.changes += 1
+
+
+def test_serial_timeout_is_set_once_per_packet_deadline():
+    port = PortHandler("virtual")
+    port.ser = TimeoutCountingSerial()
+
+    port.setPacketTimeoutMillis(50)
+    for _ in range(100):
+        port.waitForData()
+    assert port.ser.changes == 1
+    assert 0 < port.ser.timeout <= 0.05
+
+    # a passed deadline stops reads from blocking.
+    port.packet_deadline = time.monotonic_ns() - 1
+    port.waitForData()
+    port.waitForData()
+    assert port.ser.changes == 2
+    assert port.ser.timeout == 0
+
+    port.setPacketTimeoutMillis(50)
+    port.waitForData()
+    assert port.ser.changes == 3
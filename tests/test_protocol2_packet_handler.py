@@ -0,0 +1,86 @@
+################################################################################
+# Copyright 2020 University of Georgia Bio-Sensing and Instrumentation Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+import pytest
+from dynamixel_sdk import protocol2_packet_handler
+from dynamixel_sdk.protocol2_packet_handler import CRC_TABLE, Protocol2PacketHandler
+from dynamixel_sdk.robotis_def import DXL_LOBYTE, DXL_HIBYTE
+
+
+def reference_crc(data, crc=0):
+    # the bit by bit CRC-16 of the ROBOTIS e-Manual, polynomial 0x8005.
+    for byte in data:
+        crc ^= byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x8005 if crc & 0x8000 else crc << 1) & 0xFFFF
+    return crc
+
+
+def make_packet(params):
+    # INST ... PARAM followed by two CRC bytes, as txPacket hands it to addStuffing.
+    length = len(params) + 3
+    return bytearray(b'\xFF\xFF\xFD\x00\x01' + bytes([DXL_LOBYTE(length), DXL_HIBYTE(length), 0x03]) + params +
+                     b'\x00\x00')
+
+
+def test_crc_table_matches_the_reference_crc():
+    assert len(CRC_TABLE) == 256
+    for byte in range(256):
+        assert CRC_TABLE[byte] == reference_crc(bytes([byte]))
+
+
+@pytest.mark.parametrize("ext", [False, True])
+def test_update_crc_matches_the_reference_crc(monkeypatch, ext):
+    if not ext:
+        monkeypatch.setattr(protocol2_packet_handler, "crc16_ext", None)
+    elif protocol2_packet_handler.crc16_ext is None:
+        pytest.skip("crcmod is not installed")
+    ph = Protocol2PacketHandler()
+
+    # the ping example of the e-Manual.
+    assert ph.updateCRC(0, [0xFF, 0xFF, 0xFD, 0x00, 0x01, 0x03, 0x00, 0x01], 8) == 0x4E19
+
+    data = bytes(range(256)) * 3
+    assert ph.updateCRC(0, data, len(data)) == reference_crc(data)
+    assert ph.updateCRC(ph.updateCRC(0, data, 100), data[100:], len(data) - 100) == reference_crc(data)
+    assert ph.updateCRC(0, bytearray(data), 10) == ph.updateCRC(0, memoryview(data), 10) == reference_crc(data[:10])
+
+
+def test_stuffing_round_trip():
+    ph = Protocol2PacketHandler()
+    params = b'\x74\x00\xFF\xFF\xFD\x01\xFF\xFF\xFD'
+    packet = make_packet(params)
+
+    stuffed = ph.addStuffing(packet)
+    assert stuffed is packet
+    assert packet[7: -2] == b'\x03\x74\x00\xFF\xFF\xFD\xFD\x01\xFF\xFF\xFD\xFD'
+    assert (packet[5], packet[6]) == (len(params) + 5, 0)
+
+    unstuffed = ph.removeStuffing(packet)
+    assert unstuffed == make_packet(params)
+
+
+def test_stuffing_leaves_other_packets_untouched():
+    ph = Protocol2PacketHandler()
+    for params in (b'', b'\xFF\xFF\xFE\xFD', b'\xFF\xFD\xFF\xFF'):
+        packet = make_packet(params)
+        assert ph.addStuffing(packet) == make_packet(params)
+        assert ph.removeStuffing(packet) == make_packet(params)
+
+    # the CRC bytes are never stuffed.
+    packet = make_packet(b'\xFF\xFF')
+    packet[-2:] = b'\xFD\x00'
+    assert ph.addStuffing(bytearray(packet)) == packet
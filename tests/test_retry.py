@@ -0,0 +1,83 @@
+################################################################################
+# Copyright 2020 University of Georgia Bio-Sensing and Instrumentation Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+import pytest
+from dynamixel_sdk import COMM_SUCCESS, COMM_RX_TIMEOUT, LATENCY_TIMER
+from dynio.dynamixel_controller import DynamixelIO
+from dynio.errors import ERROR_COUNT
+from dynio.retry import RetryPolicy
+from dynio.virtual_bus import VirtualMotor, VirtualPortHandler
+from dynio.DynamixelJSON import model_path
+
+
+def sent(port):
+    return sum(1 for _, direction, _ in port.traffic if direction == "tx")
+
+
+def test_round_trip_estimate_follows_rfc_6298():
+    policy = RetryPolicy()
+    assert policy.timeout(1) is None
+
+    policy.observe(1, COMM_SUCCESS, 4.0)
+    assert (policy.link(1).srtt, policy.link(1).rttvar) == (4.0, 2.0)
+    policy.observe(1, COMM_SUCCESS, 8.0)
+    assert policy.link(1).rttvar == pytest.approx(2.0 + (4.0 - 2.0) / 4.0)
+    assert policy.link(1).srtt == pytest.approx(4.0 + (8.0 - 4.0) / 8.0)
+
+    # a smoothed mean plus four mean deviations, doubled on every retry and capped.
+    assert policy.timeout(1) == pytest.approx(4.5 + 4.0 * 2.5)
+    assert policy.timeout(1, attempt=1) == pytest.approx(2 * 14.5)
+    assert policy.timeout(1, attempt=2) == LATENCY_TIMER * 2.0 + 2.0
+
+    # timeouts say nothing about the round trip.
+    policy.observe(1, COMM_RX_TIMEOUT, 100.0)
+    assert policy.link(1).srtt == pytest.approx(4.5)
+    assert RetryPolicy(adaptive=False).timeout(1) is None
+
+
+def test_min_timeout():
+    policy = RetryPolicy(min_timeout=3.0)
+    policy.observe(1, COMM_SUCCESS, 0.1)
+    assert policy.timeout(1) == 3.0
+
+
+def test_silent_ids_are_skipped_until_probed():
+    virtual = VirtualMotor(7, model_path("MX28.json"), protocol=2)
+    port = VirtualPortHandler(realtime=False, record=True)
+    policy = RetryPolicy(retries=1, silent_after=2, probe_interval=60.0)
+    dxl_io = DynamixelIO(port_handler=port, baud_rate=1000000, error_policy=ERROR_COUNT, retry_policy=policy)
+
+    # every failed transaction is tried 1 + retries times until the ID is silent.
+    for count in (2, 4):
+        assert dxl_io.read_data(2, 7, 0, 2) is None
+        assert sent(port) == count
+    assert policy.is_silent(7)
+    assert policy.attempts(7) == 0
+
+    assert dxl_io.read_data(2, 7, 0, 2) is None
+    assert sent(port) == 4
+    assert dxl_io.error_counts
+
+    # a single probe is sent once it is due, and an answer brings the ID back.
+    port.add_motor(virtual)
+    policy.link(7).next_probe = 0.0
+    assert dxl_io.read_data(2, 7, 7, 1) == bytes([7])
+    assert sent(port) == 5
+    assert not policy.is_silent(7)
+    assert policy.link(7).srtt is not None
+
+    policy.reset(7)
+    assert 7 not in policy.links
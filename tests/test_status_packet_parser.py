@@ -0,0 +1,91 @@
+################################################################################
+# Copyright 2020 University of Georgia Bio-Sensing and Instrumentation Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+from dynamixel_sdk import COMM_SUCCESS, COMM_RX_CORRUPT, Protocol1PacketHandler, Protocol2PacketHandler
+from dynamixel_sdk.robotis_def import DXL_LOBYTE, DXL_HIBYTE
+from dynamixel_sdk.status_packet_parser import StatusPacketParser
+
+
+def status1(dxl_id, params=b'', error=0):
+    body = bytes([dxl_id, len(params) + 2, error]) + params
+    return b'\xFF\xFF' + body + bytes([~sum(body) & 0xFF])
+
+
+def status2(dxl_id, params=b'', error=0):
+    ph = Protocol2PacketHandler()
+    length = len(params) + 4
+    packet = bytearray(b'\xFF\xFF\xFD\x00' + bytes([dxl_id, DXL_LOBYTE(length), DXL_HIBYTE(length), 0x55, error]) +
+                       params + b'\x00\x00')
+    ph.addStuffing(packet)
+    total = packet[5] + (packet[6] << 8) + 7
+    crc = ph.updateCRC(0, packet, total - 2)
+    packet[total - 2: total] = bytes([DXL_LOBYTE(crc), DXL_HIBYTE(crc)])
+    return bytes(packet[0: total])
+
+
+def feed_bytewise(parser, stream):
+    packets = []
+    for byte in stream:
+        packets += [(dxl_id, result, error, None if data is None else bytes(data))
+                    for dxl_id, result, error, data in parser.feed(bytes([byte]))]
+    return packets
+
+
+def test_protocol1_resync_on_garbage():
+    parser = StatusPacketParser(Protocol1PacketHandler())
+    # noise, a lone header byte and a header with an impossible ID come before the packets.
+    stream = b'\x00\x13\xFF' + b'\xFF\xFF\xFE\x02' + status1(1, b'\x10\x20') + b'\xAA\xFF' + status1(2, b'', 0x04)
+
+    assert feed_bytewise(parser, stream) == [(1, COMM_SUCCESS, 0, b'\x10\x20'), (2, COMM_SUCCESS, 4, b'')]
+    assert parser.buffer == bytearray()
+
+
+def test_protocol1_corrupt_packet_is_reported_and_skipped():
+    parser = StatusPacketParser(Protocol1PacketHandler())
+    corrupt = bytearray(status1(1, b'\x10\x20'))
+    corrupt[-1] ^= 0xFF
+
+    packets = list(parser.feed(bytes(corrupt) + status1(2, b'\x30')))
+    assert packets[0][0: 2] == (1, COMM_RX_CORRUPT)
+    assert [(dxl_id, result, bytes(data)) for dxl_id, result, _, data in packets[1:]] == [(2, COMM_SUCCESS, b'\x30')]
+
+
+def test_protocol2_resync_on_garbage():
+    parser = StatusPacketParser(Protocol2PacketHandler())
+    # a packet whose body holds the header, so it arrives stuffed.
+    stuffed = b'\xFF\xFF\xFD\x07'
+    stream = b'\xFD\xFF\xFF' + b'\xFF\xFF\xFD\x01' + status2(3, stuffed) + b'\xFF\xFF\xFD' + status2(4, b'\x01\x02')
+
+    assert feed_bytewise(parser, stream) == [(3, COMM_SUCCESS, 0, stuffed), (4, COMM_SUCCESS, 0, b'\x01\x02')]
+    assert parser.buffer == bytearray()
+
+
+def test_protocol2_corrupt_packet_is_reported_and_skipped():
+    parser = StatusPacketParser(Protocol2PacketHandler())
+    corrupt = bytearray(status2(1, b'\x10\x20'))
+    corrupt[9] ^= 0x01
+
+    packets = list(parser.feed(bytes(corrupt) + status2(2, b'\x30')))
+    assert packets[0][0: 2] == (1, COMM_RX_CORRUPT)
+    assert [(dxl_id, result, bytes(data)) for dxl_id, result, _, data in packets[1:]] == [(2, COMM_SUCCESS, b'\x30')]
+
+
+def test_incomplete_packet_is_kept_until_the_next_feed():
+    parser = StatusPacketParser(Protocol2PacketHandler())
+    packet = status2(5, b'\x01\x02\x03')
+
+    assert list(parser.feed(packet[0: 9])) == []
+    assert [(dxl_id, bytes(data)) for dxl_id, _, _, data in parser.feed(packet[9:])] == [(5, b'\x01\x02\x03')]
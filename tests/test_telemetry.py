@@ -0,0 +1,67 @@
+################################################################################
+# Copyright 2020 University of Georgia Bio-Sensing and Instrumentation Lab
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+import math
+from dynio.dynamixel_controller import DynamixelIO
+from dynio.telemetry import TelemetryPoller
+from dynio.virtual_bus import VirtualMotor, VirtualPortHandler
+from dynio.DynamixelJSON import model_path
+
+
+def make_poller(rates):
+    virtual = VirtualMotor(1, model_path("MX28.json"))
+    virtual.set("Present_Position", 1234)
+    dxl_io = DynamixelIO(port_handler=VirtualPortHandler([virtual], realtime=False), baud_rate=1000000)
+    motor = dxl_io.new_mx28(1)
+    return TelemetryPoller(dxl_io, [motor], rates), motor
+
+
+def test_first_poll_waits_a_whole_period():
+    for rate in (10, 2):
+        poller, motor = make_poller({"Present_Position": rate})
+        period = 1.0 / rate
+
+        assert math.isclose(poller.poll(now=100.0), 100.0 + period)
+        # a poll shortly after the first one must not read again.
+        assert math.isclose(poller.poll(now=100.017), 100.0 + period)
+        assert len(poller.samples(motor, "Present_Position")) == 1
+
+        poller.poll(now=100.0 + period)
+        assert len(poller.samples(motor, "Present_Position")) == 2
+
+
+def test_late_poll_skips_missed_periods():
+    poller, motor = make_poller({"Present_Position": 10})
+    poller.poll(now=100.0)
+
+    # 2.5 periods late: one read, then the next one a whole period later.
+    assert math.isclose(poller.poll(now=100.35), 100.45)
+    assert math.isclose(poller.poll(now=100.36), 100.45)
+    assert len(poller.samples(motor, "Present_Position")) == 2
+
+    # on time: the schedule keeps its phase.
+    assert math.isclose(poller.poll(now=100.45), 100.55)
+    assert poller.samples(motor, "Present_Position").tolist() == [1234.0] * 3
+
+
+def test_groups_keep_their_own_rates():
+    poller, motor = make_poller({"Present_Position": 10, "Present_Temperature": 2})
+    now = 100.0
+    while now < 101.0 - 1e-9:
+        poller.poll(now=now)
+        now += 0.05
+    assert len(poller.samples(motor, "Present_Position")) == 10
+    assert len(poller.samples(motor, "Present_Temperature")) == 2